@@ -3,24 +3,35 @@ Flask backend for F1-Score Grand Prix ML Competition Platform
 """
 
 import os
+import time
 from pathlib import Path
 
 from flask import Flask
+from flask_migrate import upgrade
 
 from config import Config
-from extensions import db, jwt, cors
+from extensions import db, jwt, cors, migrate
+from database.session import configure_engine
+import monitoring
+
+
+MIGRATIONS_DIR = str(Path(__file__).parent / "migrations")
 
 
 def create_app(config_class=Config):
     """Create and configure the Flask application."""
     app = Flask(__name__)
     app.config.from_object(config_class)
+    if app.config.get("PROXY_FIX_X_FOR"):
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
     
     # Ensure directories exist
     Path(app.config.get("SUBMISSIONS_DIR", "submissions")).mkdir(exist_ok=True)
     
     # Initialize extensions
     db.init_app(app)
+    migrate.init_app(app, db, directory=MIGRATIONS_DIR, render_as_batch=True)
     jwt.init_app(app)
     cors.init_app(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
     
@@ -29,19 +40,115 @@ def create_app(config_class=Config):
     from routes.tasks import tasks_bp
     from routes.submissions import submissions_bp
     from routes.leaderboard import leaderboard_bp
+    from routes.events import events_bp
+    from routes.metrics import metrics_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(tasks_bp)
     app.register_blueprint(submissions_bp)
     app.register_blueprint(leaderboard_bp)
+    app.register_blueprint(events_bp)
+    if app.config.get("METRICS_ENABLED"):
+        app.register_blueprint(metrics_bp)
     
-    # Create database tables
+    # Bring the schema up to date (otherwise run `flask db upgrade` on deploy)
     with app.app_context():
-        db.create_all()
+        configure_engine(app)
+        if app.config.get("METRICS_ENABLED"):
+            monitoring.init_app(app, db.engine)
+        if app.config.get("DB_AUTO_UPGRADE"):
+            upgrade(directory=MIGRATIONS_DIR)
+        
+        # Skipped until the schema exists, e.g. when this import serves `flask db upgrade`
+        if _schema_ready():
+            from caching import LEADERBOARD_VERSION, ensure_counters
+            from standings import backfill_leaderboard
+            ensure_counters(LEADERBOARD_VERSION)
+            backfill_leaderboard()
+    
+    # Hashes in the request thread until start_workers() starts its processes
+    from passwords import PasswordHasher
+    app.extensions["password_hasher"] = PasswordHasher(
+        workers=app.config.get("PASSWORD_HASH_WORKERS", 2),
+        rounds=app.config.get("PASSWORD_HASH_ROUNDS", 29000),
+        queue_size=app.config.get("PASSWORD_HASH_QUEUE", 64),
+        queue_timeout=app.config.get("PASSWORD_HASH_QUEUE_TIMEOUT", 10),
+        per_client=app.config.get("PASSWORD_HASH_PER_CLIENT", 4),
+    )
+    
+    app.cli.command("workers")(_workers_command)
     
     return app
 
 
+def _schema_ready():
+    """True once migrations have created the tables (requires an app context)."""
+    return db.inspect(db.engine).has_table("change_counters")
+
+
+def start_workers(app, hashing=True, evaluation=True):
+    """
+    Start the background processes of a serving process.
+    
+    Creating the app starts nothing, so CLI commands, rescore.py and the
+    benchmarks stay single-process. Call this once in the process that
+    should own the pools, before it starts serving.
+    
+    Args:
+        app (Flask): Application from create_app
+        hashing (bool): Start the password hashing processes
+        evaluation (bool): Start the evaluation queue workers
+            (EVALUATION_WORKERS of them; skipped until the schema exists)
+    """
+    if hashing:
+        app.extensions["password_hasher"].start()
+    
+    if not evaluation or app.config.get("EVALUATION_WORKERS", 0) <= 0:
+        return
+    
+    from jobs import EvaluationWorkerPool, requeue_stale_jobs
+    
+    node_id = app.config.get("EVALUATION_NODE_ID")
+    lease_seconds = app.config.get("EVALUATION_LEASE_SECONDS", 120)
+    with app.app_context():
+        if not _schema_ready():
+            app.logger.warning("Database schema missing; evaluation workers not started (run `flask db upgrade`)")
+            return
+        # Jobs of a pool that ran on this node before, or whose lease expired
+        requeue_stale_jobs(lease_seconds, node_id=node_id)
+    
+    pool = EvaluationWorkerPool(
+        app,
+        num_workers=app.config["EVALUATION_WORKERS"],
+        poll_interval=app.config.get("EVALUATION_POLL_INTERVAL", 0.5),
+        batch_size=app.config.get("EVALUATION_BATCH_SIZE", 32),
+        batch_window=app.config.get("EVALUATION_BATCH_WINDOW", 0.05),
+        node_id=node_id,
+        lease_seconds=lease_seconds,
+    )
+    pool.start()
+    app.extensions["evaluation_pool"] = pool
+
+
+def _workers_command():
+    """Run the evaluation queue workers until interrupted."""
+    from flask import current_app
+    
+    app = current_app._get_current_object()
+    start_workers(app, hashing=False)
+    pool = app.extensions.get("evaluation_pool")
+    if pool is None:
+        print("No evaluation workers started (EVALUATION_WORKERS=0 or no schema)")
+        return
+    
+    print(f"Running {pool.num_workers} evaluation workers; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pool.stop()
+
+
 # Create the app instance
 app = create_app()
 
@@ -50,4 +157,7 @@ if __name__ == "__main__":
     import os
     debug_mode = os.getenv("FLASK_DEBUG", "false").lower() in ("true", "1", "yes")
     print("Starting F1-Score Grand Prix backend on http://localhost:8000")
+    # With the reloader, only the process it spawns serves requests
+    if not debug_mode or os.getenv("WERKZEUG_RUN_MAIN") == "true":
+        start_workers(app)
     app.run(host="0.0.0.0", port=8000, debug=debug_mode)
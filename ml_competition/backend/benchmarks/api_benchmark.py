@@ -0,0 +1,403 @@
+"""
+API load test for F1-Score Grand Prix
+Seeds a throwaway database, serves the app locally and drives it with concurrent clients.
+
+Usage (from the backend directory):
+    python -m benchmarks.api_benchmark                       # default scenarios
+    python -m benchmarks.api_benchmark --submissions 20000 --clients 32 --requests 2000
+    python -m benchmarks.api_benchmark --json before.json    # save results
+    python -m benchmarks.api_benchmark --compare before.json # diff against a saved run
+
+Each scenario reports throughput and p50/p90/p99/max latency. Runs with the
+same arguments are comparable; --seed fixes the synthetic data.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = BACKEND_DIR / "templates"
+
+# Scenario name -> (method, description); see _make_request for the requests
+SCENARIOS = {
+    "leaderboard": ("GET", "GET /leaderboard (full body)"),
+    "leaderboard-304": ("GET", "GET /leaderboard with a current ETag"),
+    "submissions": ("GET", "GET /submissions?task_id=2 (first page)"),
+    "sample-data": ("GET", "GET /sample-data/2"),
+    "upload": ("POST", "POST /upload/2 with a template-based file"),
+    "evaluate": ("POST", "POST /evaluate + poll until scored (end to end)"),
+}
+DEFAULT_SCENARIOS = ["leaderboard", "leaderboard-304", "submissions", "sample-data", "upload", "evaluate"]
+
+
+def _use_workspace(workspace, database_url=None, evaluation_workers=0):
+    """Point the app's environment-driven settings at the workspace (before importing app)."""
+    os.environ["DATABASE_URL"] = database_url or f"sqlite:///{Path(workspace) / 'bench.sqlite3'}"
+    os.environ["EVALUATION_WORKERS"] = str(evaluation_workers)
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-jwt-secret-key-0123456789abcdef")
+    sys.path.insert(0, str(BACKEND_DIR))
+
+
+def _bench_config(workspace, evaluation_workers=0):
+    from config import Config
+
+    class BenchConfig(Config):
+        SUBMISSIONS_DIR = Path(workspace) / "submissions"
+        SUBMISSION_LIMIT_PER_TASK = 10 ** 9
+        EVALUATION_WORKERS = evaluation_workers
+        DB_AUTO_UPGRADE = True
+
+    return BenchConfig
+
+
+def _template_variant(task_id, index):
+    """A distinct but equivalent submission file, so the result cache never answers."""
+    code = (TEMPLATES_DIR / f"task{task_id}_template.py").read_bytes()
+    return code + f"\n# benchmark variant {index}\n".encode()
+
+
+def seed(workspace, users=200, submissions=5000, evaluations=50, clients=8, rng_seed=0):
+    """
+    Fill the workspace database with synthetic users, teams and submissions.
+
+    Args:
+        workspace (Path): Directory for the database and submission files
+        users (int): Users (each with a same-named team)
+        submissions (int): Scored submission rows, spread over tasks 0-3
+        evaluations (int): Uploaded, unscored task 2 submissions for the evaluate scenario
+        clients (int): Access tokens to issue (one per client)
+        rng_seed (int): Seed for the synthetic data
+
+    Returns:
+        dict: {tokens, evaluate_ids}
+    """
+    from app import create_app
+    from extensions import db
+    from database.models import User, Team, Submission
+    from flask_jwt_extended import create_access_token
+    from standings import rebuild_leaderboard
+    from storage import store_code
+
+    rng = random.Random(rng_seed)
+    app = create_app(_bench_config(workspace))
+    submissions_dir = Path(workspace) / "submissions"
+
+    with app.app_context():
+        # One hash for everyone: seeding should not spend minutes in pbkdf2
+        password_hash = app.extensions["password_hasher"].hash("benchmark")
+        user_rows, team_rows = [], []
+        for i in range(users):
+            name = f"bench-user-{i:05d}"
+            user_rows.append({"id": str(uuid.uuid4()), "username": name, "hashed_password": password_hash})
+            team_rows.append({"id": str(uuid.uuid4()), "name": name})
+        db.session.execute(db.insert(User), user_rows)
+        db.session.execute(db.insert(Team), team_rows)
+
+        # A few dozen distinct files per task, shared by many rows like real resubmissions
+        files = {}
+        for task_id in range(4):
+            files[task_id] = [store_code(_template_variant(task_id, i), submissions_dir) for i in range(32)]
+
+        start = datetime.utcnow() - timedelta(days=30)
+        rows = []
+        for i in range(submissions):
+            task_id = i % 4
+            owner = rng.randrange(users)
+            code_hash, path = rng.choice(files[task_id])
+            submission_id = uuid.uuid4().hex[:8]
+            rows.append({
+                "id": submission_id,
+                "user_id": user_rows[owner]["id"],
+                "team_id": team_rows[owner]["id"],
+                "team_name": team_rows[owner]["name"],
+                "task_id": task_id,
+                "filename": f"task{task_id}_{submission_id}.py",
+                "storage_path": str(path),
+                "code_hash": code_hash,
+                "status": "success",
+                "score": round(rng.uniform(0, 30 if task_id == 0 else 1), 4),
+                "details": {"metric_name": "benchmark"},
+                "created_at": start + timedelta(seconds=i * 30),
+            })
+
+        evaluate_ids = []
+        for i in range(evaluations):
+            code_hash, path = store_code(_template_variant(2, 1000 + i), submissions_dir)
+            submission_id = uuid.uuid4().hex[:8]
+            evaluate_ids.append(submission_id)
+            rows.append({
+                "id": submission_id,
+                "user_id": user_rows[i % users]["id"],
+                "team_id": team_rows[i % users]["id"],
+                "team_name": team_rows[i % users]["name"],
+                "task_id": 2,
+                "filename": f"task2_{submission_id}.py",
+                "storage_path": str(path),
+                "code_hash": code_hash,
+                "status": "uploaded",
+                "created_at": datetime.utcnow(),
+            })
+
+        for offset in range(0, len(rows), 1000):
+            db.session.execute(db.insert(Submission), rows[offset:offset + 1000])
+        db.session.commit()
+        rebuild_leaderboard()
+
+        tokens = [create_access_token(identity=user_rows[i % users]["id"]) for i in range(clients)]
+
+    return {"tokens": tokens, "evaluate_ids": evaluate_ids}
+
+
+def serve(workspace, port, evaluation_workers, database_url=None):
+    """Run the app on a threaded local server until terminated (server subprocess)."""
+    _use_workspace(workspace, database_url)
+    from werkzeug.serving import make_server
+    from app import create_app, start_workers
+
+    app = create_app(_bench_config(workspace, evaluation_workers))
+    start_workers(app)
+    make_server("127.0.0.1", port, app, threaded=True).serve_forever()
+
+
+def _start_server(args, workspace):
+    command = [
+        sys.executable, "-m", "benchmarks.api_benchmark", "--serve",
+        "--workspace", str(workspace), "--port", str(args.port),
+        "--evaluation-workers", str(args.evaluation_workers),
+    ]
+    if args.database_url:
+        command += ["--database-url", args.database_url]
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Benchmark server exited during startup")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", args.port, timeout=2)
+            connection.request("GET", "/tasks")
+            if connection.getresponse().status == 200:
+                connection.close()
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Benchmark server did not start within 60s")
+
+
+def _multipart(filename, content):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: text/x-python\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+class _Client:
+    """One keep-alive connection driving requests for a scenario."""
+
+    def __init__(self, port, token):
+        self.port = port
+        self.token = token
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            # Server closed the keep-alive connection: reconnect once
+            self.connection.close()
+            self.connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=300)
+            self.connection.request(method, path, body=body, headers=headers)
+            response = self.connection.getresponse()
+        return response.status, response.getheader("ETag"), response.read()
+
+
+def _make_request(scenario, client, index, state):
+    """Perform request number index of a scenario; returns True on the expected outcome."""
+    if scenario == "leaderboard":
+        return client.request("GET", "/leaderboard")[0] == 200
+    if scenario == "leaderboard-304":
+        return client.request("GET", "/leaderboard", headers={"If-None-Match": state["etag"]})[0] == 304
+    if scenario == "submissions":
+        return client.request("GET", "/submissions?task_id=2&limit=50")[0] == 200
+    if scenario == "sample-data":
+        return client.request("GET", "/sample-data/2")[0] == 200
+    if scenario == "upload":
+        body, content_type = _multipart("bench.py", _template_variant(2, 100000 + index))
+        return client.request("POST", "/upload/2", body, {"Content-Type": content_type})[0] == 200
+    if scenario == "evaluate":
+        submission_id = state["evaluate_ids"][index]
+        status, _, body = client.request("POST", f"/evaluate/{submission_id}?task_id=2")
+        job = json.loads(body)
+        while status in (200, 202) and job.get("status") in ("queued", "running"):
+            time.sleep(0.02)
+            status, _, body = client.request("GET", f"/evaluate/{submission_id}")
+            job = json.loads(body)
+        return status == 200 and job.get("status") == "success"
+    raise ValueError(f"Unknown scenario: {scenario}")
+
+
+def run_scenario(scenario, port, tokens, clients, requests, state):
+    """
+    Drive one scenario with concurrent clients.
+
+    Returns:
+        dict: {requests, errors, clients, seconds, throughput_rps, p50_ms, p90_ms, p99_ms, max_ms}
+    """
+    latencies = []
+    errors = [0]
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def worker(client_index):
+        client = _Client(port, tokens[client_index % len(tokens)])
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            start = time.perf_counter()
+            try:
+                ok = _make_request(scenario, client, index, state)
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+
+    values = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(values, [50, 90, 99]) if len(values) else (0, 0, 0)
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "clients": clients,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(latencies) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(float(p50), 2),
+        "p90_ms": round(float(p90), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(values.max()), 2) if len(values) else 0.0,
+    }
+
+
+def print_report(results, baseline=None):
+    """Print results as a table, with the change against baseline results if given."""
+    header = f"{'scenario':<17}{'reqs':>7}{'errs':>6}{'req/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    if baseline:
+        header += f"{'Δ req/s':>10}{'Δ p50':>9}{'Δ p99':>9}"
+    print(header)
+    for scenario, r in results.items():
+        line = (
+            f"{scenario:<17}{r['requests']:>7}{r['errors']:>6}{r['throughput_rps']:>10.1f}"
+            f"{r['p50_ms']:>10.2f}{r['p90_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['max_ms']:>10.2f}"
+        )
+        before = (baseline or {}).get(scenario)
+        if before:
+            def change(key):
+                return f"{(r[key] - before[key]) / before[key] * 100:+.0f}%" if before[key] else "n/a"
+            line += f"{change('throughput_rps'):>10}{change('p50_ms'):>9}{change('p99_ms'):>9}"
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the F1-Score Grand Prix API.")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="scenario to run (repeatable; default: all)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent clients")
+    parser.add_argument("--requests", type=int, default=500, help="requests per scenario")
+    parser.add_argument("--users", type=int, default=200, help="synthetic users/teams")
+    parser.add_argument("--submissions", type=int, default=5000, help="synthetic scored submissions")
+    parser.add_argument("--evaluations", type=int, default=50, help="submissions for the evaluate scenario")
+    parser.add_argument("--evaluation-workers", type=int, default=2, help="evaluation workers in the server")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic data")
+    parser.add_argument("--port", type=int, default=8799, help="local server port")
+    parser.add_argument("--database-url", help="database to seed and serve (default: SQLite in the workspace)")
+    parser.add_argument("--workspace", help="directory for the database and files (default: temporary)")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="results file from an earlier run to compare against")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.workspace, args.port, args.evaluation_workers, args.database_url)
+        return
+
+    workspace = Path(args.workspace or tempfile.mkdtemp(prefix="f1gp-bench-"))
+    workspace.mkdir(parents=True, exist_ok=True)
+    _use_workspace(workspace, args.database_url)
+
+    print(f"Seeding {args.users} users, {args.submissions} submissions in {workspace} ...")
+    started = time.perf_counter()
+    state = seed(workspace, args.users, args.submissions, args.evaluations, args.clients, args.seed)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+    server = _start_server(args, workspace)
+    results = {}
+    try:
+        probe = _Client(args.port, None)
+        state["etag"] = probe.request("GET", "/leaderboard")[1]
+        for scenario in args.scenario or DEFAULT_SCENARIOS:
+            requests = args.requests
+            if scenario == "evaluate":
+                requests = min(requests, len(state["evaluate_ids"]))
+            print(f"Running {scenario}: {SCENARIOS[scenario][1]} x {requests} ...")
+            results[scenario] = run_scenario(scenario, args.port, state["tokens"], args.clients, requests, state)
+    finally:
+        server.terminate()
+        server.wait(10)
+        if not args.workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+    print()
+    print_report(results, baseline)
+
+    if args.json:
+        meta = {
+            "date": datetime.utcnow().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            **{key: getattr(args, key) for key in (
+                "clients", "requests", "users", "submissions", "evaluations", "evaluation_workers", "seed",
+            )},
+        }
+        Path(args.json).write_text(json.dumps({"meta": meta, "results": results}, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Metric engine benchmark for F1-Score Grand Prix
+Compares the vectorized metrics in metrics.py against per-call sklearn.
+
+Usage (from the backend directory):
+    python -m benchmarks.metrics_benchmark --rows 1000000 --batch 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metrics import r2, classification_scores  # noqa: E402
+
+
+def _best_of(repeats, func):
+    """Return the fastest wall time of repeats calls to func."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows, batch, classes, repeats, seed=0):
+    """
+    Time sklearn (one call per metric per prediction vector) against the
+    metric engine (one batched call) and check both agree.
+
+    Returns:
+        list: (case, sklearn seconds, engine seconds, max abs difference)
+    """
+    from sklearn.metrics import r2_score, accuracy_score, f1_score, confusion_matrix
+
+    rng = np.random.default_rng(seed)
+    y_reg = rng.normal(size=rows)
+    pred_reg = y_reg + rng.normal(scale=0.5, size=(batch, rows))
+    y_cls = rng.integers(0, classes, size=rows)
+    flip = rng.random((batch, rows)) < 0.3
+    pred_cls = np.where(flip, rng.integers(0, classes, size=(batch, rows)), y_cls)
+
+    def sklearn_regression():
+        return np.array([r2_score(y_reg, p) for p in pred_reg])
+
+    def sklearn_classification():
+        return np.array([
+            (accuracy_score(y_cls, p), f1_score(y_cls, p, average="macro", zero_division=0),
+             confusion_matrix(y_cls, p)[0, 0])
+            for p in pred_cls
+        ])
+
+    def engine_classification():
+        scores = classification_scores(y_cls, pred_cls)
+        return np.column_stack([scores["accuracy"], scores["f1_macro"], scores["confusion_matrix"][:, 0, 0]])
+
+    results = []
+    for case, reference, engine in (
+        ("R² (task 1)", sklearn_regression, lambda: r2(y_reg, pred_reg)),
+        ("accuracy + macro-F1 + confusion (tasks 2-3)", sklearn_classification, engine_classification),
+    ):
+        difference = float(np.max(np.abs(reference() - engine())))
+        results.append((case, _best_of(repeats, reference), _best_of(repeats, engine), difference))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="test set size")
+    parser.add_argument("--batch", type=int, default=20, help="prediction vectors scored together")
+    parser.add_argument("--classes", type=int, default=5, help="number of classes")
+    parser.add_argument("--repeats", type=int, default=3, help="timing repeats (best is reported)")
+    args = parser.parse_args(argv)
+
+    print(f"{args.batch} prediction vectors x {args.rows:,} rows, {args.classes} classes")
+    print(f"{'case':<46}{'sklearn':>10}{'engine':>10}{'speedup':>9}{'max diff':>11}")
+    for case, reference, engine, difference in run(args.rows, args.batch, args.classes, args.repeats):
+        print(f"{case:<46}{reference:>9.3f}s{engine:>9.3f}s{reference / engine:>8.1f}x{difference:>11.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Password hashing benchmark for F1-Score Grand Prix
+Login (verify) throughput of the hashing pool against its worker count.
+
+Usage (from the backend directory):
+    python -m benchmarks.password_benchmark --workers 0 1 2 4 --clients 32 --logins 400
+
+Workers 0 is the old behaviour (hashing in the request threads). The probe
+column is the p99 latency of a small pure-Python task run alongside the
+logins: it shows how much hashing stalls everything else in the process.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from passwords import DEFAULT_ROUNDS, PasswordHasher, make_context  # noqa: E402
+
+
+def _probe(stop, latencies):
+    """Stand-in for other requests: time a few milliseconds of Python work."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        sum(i * i for i in range(20000))
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.005)
+
+
+def run(workers, clients, logins, rounds):
+    """
+    Verify logins passwords from clients concurrent threads.
+
+    Returns:
+        tuple: (logins per second, p50 ms, p99 ms, probe p99 ms)
+    """
+    stored = make_context(rounds).hash("correct horse battery staple")
+    hasher = PasswordHasher(workers=workers, rounds=rounds, queue_size=clients, queue_timeout=60, per_client=clients)
+    hasher.start()
+    # Warm the workers up
+    hasher.verify_and_update("correct horse battery staple", stored)
+
+    latencies, probe_latencies = [], []
+    counter = iter(range(logins))
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client(index):
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    return
+            start = time.perf_counter()
+            ok, _ = hasher.verify_and_update("correct horse battery staple", stored, client=f"10.0.0.{index}")
+            elapsed = time.perf_counter() - start
+            assert ok
+            with lock:
+                latencies.append(elapsed)
+
+    probe = threading.Thread(target=_probe, args=(stop, probe_latencies))
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.perf_counter()
+    probe.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    stop.set()
+    probe.join()
+    hasher.stop()
+
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    probe_p99 = np.percentile(np.array(probe_latencies) * 1000, 99) if probe_latencies else 0.0
+    return logins / seconds, p50, p99, probe_p99
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4, os.cpu_count() or 1], help="worker counts to compare")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent login threads")
+    parser.add_argument("--logins", type=int, default=400, help="logins per worker count")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS, help="pbkdf2 rounds")
+    args = parser.parse_args(argv)
+
+    print(f"{args.logins} logins from {args.clients} clients, pbkdf2_sha256 with {args.rounds} rounds, {os.cpu_count()} CPUs")
+    print(f"{'workers':>11}{'logins/s':>11}{'p50 ms':>10}{'p99 ms':>10}{'probe p99 ms':>14}")
+    for workers in sorted(set(args.workers)):
+        throughput, p50, p99, probe_p99 = run(workers, args.clients, args.logins, args.rounds)
+        label = f"{workers}" if workers else "0 (inline)"
+        print(f"{label:>11}{throughput:>11.1f}{p50:>10.1f}{p99:>10.1f}{probe_p99:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
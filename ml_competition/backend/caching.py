@@ -0,0 +1,168 @@
+"""
+Response caching for F1-Score Grand Prix
+Version counters for ETags, conditional GET and a small in-process TTL cache.
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+
+import numpy as np
+from flask import current_app, request
+from sqlalchemy import update
+
+from extensions import db
+from database.models import ChangeCounter
+from monitoring import cache_requests
+
+# orjson is optional: it encodes NumPy arrays natively (NaN/inf as null)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Counter bumped on every evaluation commit
+LEADERBOARD_VERSION = "leaderboard"
+
+
+def ensure_counters(*names):
+    """Create missing counter rows (run once at startup)."""
+    for name in names:
+        if db.session.get(ChangeCounter, name) is None:
+            db.session.add(ChangeCounter(name=name, value=0))
+    db.session.commit()
+
+
+def bump_version(name):
+    """Increment a counter in the caller's transaction; the caller commits."""
+    db.session.execute(
+        update(ChangeCounter)
+        .where(ChangeCounter.name == name)
+        .values(value=ChangeCounter.value + 1)
+    )
+
+
+def get_version(name):
+    """Return the current value of a counter."""
+    value = db.session.query(ChangeCounter.value).filter(ChangeCounter.name == name).scalar()
+    return value or 0
+
+
+class TTLCache:
+    """Thread-safe key/value cache with per-entry expiry and a size bound."""
+
+    def __init__(self, ttl=30, maxsize=256, name="ttl"):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.name = name
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key, factory, ttl=None):
+        """Return the cached value for key, computing it with factory() on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > now:
+                cache_requests.inc(cache=self.name, result="hit")
+                return entry[1]
+
+        cache_requests.inc(cache=self.name, result="miss")
+        value = factory()
+        expires = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if len(self._data) >= self.maxsize:
+                self._evict(now)
+            self._data[key] = (expires, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self, now):
+        """Drop expired entries, then the oldest ones if still full."""
+        for key in [k for k, (expires, _) in self._data.items() if expires <= now]:
+            del self._data[key]
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+
+
+response_cache = TTLCache(name="response")
+
+
+def to_json_list(values):
+    """Convert a NumPy array to a list, with None for NaN and +/-inf."""
+    result = values.tolist()
+    if values.dtype.kind == "f":
+        for i in np.flatnonzero(~np.isfinite(values)):
+            result[i] = None
+    return result
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return to_json_list(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+        return None if isinstance(value, float) and not math.isfinite(value) else value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def encode_json(payload):
+    """
+    Encode a payload as compact JSON bytes, keeping key order.
+    
+    NumPy arrays and scalars are accepted anywhere in the payload; non-finite
+    floats inside them are written as null. Uses orjson when installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload, default=_json_default, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def cached_json_response(key, build, etag=None, ttl=None, encode=None):
+    """
+    Serve a JSON payload with ETag / If-None-Match support.
+    
+    The encoded body is cached under key, so the key must change whenever the
+    payload does (include a version or file marker in it).
+    
+    Args:
+        key (tuple): Cache key for the encoded body
+        build (callable): Returns the payload to encode on a cache miss
+        etag (str): Entity tag; derived from the body when omitted
+        ttl (float): Cache lifetime in seconds (default: RESPONSE_CACHE_TTL)
+        encode (callable): Payload -> bytes (default: the app's JSON provider)
+    
+    Returns:
+        Response: 200 with the body, or 304 if the client's copy is current
+    """
+    # Known tag: answer a matching poll without touching the payload at all
+    if etag is not None and request.if_none_match.contains(etag):
+        cache_requests.inc(cache="etag", result="hit")
+        return _not_modified(etag)
+    
+    if ttl is None:
+        ttl = current_app.config.get("RESPONSE_CACHE_TTL", 30)
+    if encode is None:
+        encode = lambda payload: current_app.json.dumps(payload).encode("utf-8")  # noqa: E731
+    body = response_cache.get_or_set(key, lambda: encode(build()), ttl)
+    if etag is None:
+        etag = hashlib.sha1(body).hexdigest()[:20]
+    
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    response = response.make_conditional(request)
+    cache_requests.inc(cache="etag", result="hit" if response.status_code == 304 else "miss")
+    return response
+
+
+def _not_modified(etag):
+    response = current_app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
@@ -3,6 +3,8 @@ Flask configuration for F1-Score Grand Prix ML Competition Platform
 """
 
 import os
+import re
+import socket
 import warnings
 from pathlib import Path
 from datetime import timedelta
@@ -28,16 +30,110 @@ class Config:
     JWT_HEADER_NAME = "Authorization"
     JWT_HEADER_TYPE = "Bearer"
     
-    # Database
+    # Database (SQLite by default; set DATABASE_URL for PostgreSQL)
     BACKEND_DIR = Path(__file__).parent
     DB_PATH = (BACKEND_DIR / "database" / "db.sqlite3").as_posix()
-    SQLALCHEMY_DATABASE_URI = f"sqlite:///{DB_PATH}"
+    # Bare postgres:// URLs (as issued by most hosts) are pinned to psycopg2
+    SQLALCHEMY_DATABASE_URI = re.sub(
+        r"^postgres(ql)?://", "postgresql+psycopg2://",
+        os.getenv("DATABASE_URL", f"sqlite:///{DB_PATH}"),
+    )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+    }
+    
+    # Apply migrations at startup. On by default for a local SQLite file; with a
+    # shared database run `flask db upgrade` once per deploy instead.
+    DB_AUTO_UPGRADE = os.getenv(
+        "DB_AUTO_UPGRADE", str(SQLALCHEMY_DATABASE_URI.startswith("sqlite"))
+    ).lower() in ("true", "1", "yes")
+    
+    # Applied to every SQLite connection (see database.session.configure_engine)
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 30000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    }
     
     # Paths
     DATA_DIR = BACKEND_DIR / "data"
     SUBMISSIONS_DIR = BACKEND_DIR / "submissions"
     TEMPLATES_DIR = BACKEND_DIR / "templates"
     
+    # Lifetime of cached response bodies (/tasks, /template, /sample-data, /leaderboard)
+    RESPONSE_CACHE_TTL = 30
+    
+    # Live event stream (/events)
+    EVENTS_POLL_INTERVAL = 0.5
+    EVENTS_KEEPALIVE_SECONDS = 15
+    EVENTS_RETENTION_SECONDS = 3600
+    EVENTS_SUBSCRIBER_QUEUE = 1000
+    # Events replayed to a reconnecting client before it is told to resync
+    EVENTS_BACKLOG_LIMIT = 500
+    # Seconds to wait for a skipped event id to commit (out-of-order commits)
+    EVENTS_REORDER_SECONDS = 10
+    
+    # Prometheus metrics at /metrics (request latency, DB timings, caches, queue)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("true", "1", "yes")
+    
+    # Password hashing (pbkdf2_sha256) in PASSWORD_HASH_WORKERS processes (0 hashes
+    # in the request thread). Up to PASSWORD_HASH_QUEUE requests wait for a worker,
+    # for at most PASSWORD_HASH_QUEUE_TIMEOUT seconds (then 503), and one client
+    # address may have PASSWORD_HASH_PER_CLIENT in flight (then 429; 0 disables
+    # the cap). Stored hashes with other rounds are replaced on the next
+    # successful login.
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+    PASSWORD_HASH_QUEUE = 64
+    PASSWORD_HASH_QUEUE_TIMEOUT = 10
+    PASSWORD_HASH_PER_CLIENT = int(os.getenv("PASSWORD_HASH_PER_CLIENT", "4"))
+    
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted, so
+    # request.remote_addr (and the per-client cap) sees the real client address
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", "0"))
+    
     # Submission limits
     SUBMISSION_LIMIT_PER_TASK = 3
+    
+    # Evaluation queue (set EVALUATION_WORKERS=0 to disable local workers)
+    EVALUATION_WORKERS = int(os.getenv("EVALUATION_WORKERS", "2"))
+    EVALUATION_POLL_INTERVAL = 0.5
+    
+    # Running jobs are leased to the pool that claimed them, which renews the
+    # lease while it works. Other pools requeue a job once its lease expires; a
+    # starting pool also requeues what its own node had claimed, so every pool
+    # sharing a database needs its own EVALUATION_NODE_ID.
+    EVALUATION_NODE_ID = os.getenv("EVALUATION_NODE_ID", socket.gethostname())
+    EVALUATION_LEASE_SECONDS = 120
+    
+    # Results from the workers are written back in grouped transactions
+    EVALUATION_BATCH_SIZE = 32
+    EVALUATION_BATCH_WINDOW = 0.05
+    
+    # Run each evaluation in a sandboxed child process with the limits below
+    EVALUATION_ISOLATION = os.getenv("EVALUATION_ISOLATION", "true").lower() in ("true", "1", "yes")
+    
+    # Sandbox limits per task: memory budget (MB), CPU time (s), wall-clock timeout (s)
+    DEFAULT_TASK_LIMITS = {"memory_mb": 500, "cpu_seconds": 120, "timeout": 240}
+    TASK_LIMITS = {
+        0: {"memory_mb": 500, "cpu_seconds": 60, "timeout": 120},
+        1: {"memory_mb": 500, "cpu_seconds": 120, "timeout": 240},
+        2: {"memory_mb": 500, "cpu_seconds": 120, "timeout": 240},
+        3: {"memory_mb": 500, "cpu_seconds": 120, "timeout": 240},
+    }
+    
+    # Scoring for Tasks 1-3: "holdout" (the submission's evaluate_model on the
+    # fixed split), "kfold" or "seeds" (model.predict scored server-side over
+    # SCORING_ROUNDS folds/seeds, reporting mean and variance). Folds run in
+    # parallel processes, each with the task's memory and CPU limits, and the
+    # wall-clock timeout grows to cover ceil(rounds / jobs) folds one after
+    # another; SCORING_JOBS=0 shares the machine's cores between the
+    # evaluation workers.
+    SCORING_MODE = os.getenv("SCORING_MODE", "holdout")
+    SCORING_ROUNDS = int(os.getenv("SCORING_ROUNDS", "5"))
+    SCORING_JOBS = int(os.getenv("SCORING_JOBS", "0"))
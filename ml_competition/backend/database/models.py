@@ -6,13 +6,19 @@ Using Flask-SQLAlchemy
 import uuid
 from datetime import datetime
 
+from sqlalchemy.dialects import postgresql
+
 from extensions import db
 
+# Portable column types: native UUID / JSONB on PostgreSQL, plain columns elsewhere
+UUIDString = db.String().with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+JSONDocument = db.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
 
 class User(db.Model):
     __tablename__ = "users"
 
-    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDString, primary_key=True, default=lambda: str(uuid.uuid4()))
     username = db.Column(db.String, unique=True, nullable=False, index=True)
     email = db.Column(db.String, unique=True, nullable=True, index=True)
     hashed_password = db.Column(db.String, nullable=False)
@@ -24,7 +30,7 @@ class User(db.Model):
 class Team(db.Model):
     __tablename__ = "teams"
 
-    id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDString, primary_key=True, default=lambda: str(uuid.uuid4()))
     name = db.Column(db.String, unique=True, nullable=False, index=True)
     contact_email = db.Column(db.String, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -36,16 +42,114 @@ class Submission(db.Model):
     __tablename__ = "submissions"
 
     id = db.Column(db.String, primary_key=True, default=lambda: str(uuid.uuid4())[:8])
-    user_id = db.Column(db.String, db.ForeignKey("users.id"), nullable=True)
-    team_id = db.Column(db.String, db.ForeignKey("teams.id"), nullable=True)
+    user_id = db.Column(UUIDString, db.ForeignKey("users.id"), nullable=True)
+    team_id = db.Column(UUIDString, db.ForeignKey("teams.id"), nullable=True)
     team_name = db.Column(db.String, nullable=True)
     task_id = db.Column(db.Integer, nullable=False, index=True)
     filename = db.Column(db.String, nullable=False)
     storage_path = db.Column(db.String, nullable=False)
+    code_hash = db.Column(db.String(64), nullable=True, index=True)
     status = db.Column(db.String, default="uploaded", nullable=False)
     score = db.Column(db.Float, nullable=True)
-    details = db.Column(db.JSON, nullable=True)
+    details = db.Column(JSONDocument, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # Lease on a running job: the pool that claimed it and when it last renewed it
+    claimed_by = db.Column(db.String, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
 
     user = db.relationship("User", back_populates="submissions")
     team = db.relationship("Team", back_populates="submissions")
+
+
+# Composite indexes matching the listing order (score DESC, created_at, id),
+# the queue scan and the per-team submission limit check
+db.Index(
+    "ix_submissions_task_rank",
+    Submission.task_id, Submission.score.desc(), Submission.created_at, Submission.id,
+)
+db.Index(
+    "ix_submissions_task_status_rank",
+    Submission.task_id, Submission.status, Submission.score.desc(), Submission.created_at, Submission.id,
+)
+db.Index(
+    "ix_submissions_status_created",
+    Submission.status, Submission.created_at, Submission.id,
+)
+db.Index(
+    "ix_submissions_team_name_created",
+    Submission.team_name, Submission.created_at, Submission.id,
+)
+db.Index("ix_submissions_team_task", Submission.team_id, Submission.task_id)
+
+
+class LeaderboardEntry(db.Model):
+    """Best successful submission per team per task, maintained incrementally."""
+
+    __tablename__ = "leaderboard"
+    __table_args__ = (
+        db.UniqueConstraint("task_id", "team_key", name="uq_leaderboard_task_team"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    team_key = db.Column(db.String, nullable=False)
+    team_name = db.Column(db.String, nullable=True)
+    submission_id = db.Column(db.String, db.ForeignKey("submissions.id"), nullable=False, index=True)
+    filename = db.Column(db.String, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    submitted_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+# Serves "top k for a task" straight from the index
+db.Index(
+    "ix_leaderboard_rank",
+    LeaderboardEntry.task_id,
+    LeaderboardEntry.score.desc(),
+    LeaderboardEntry.submitted_at,
+)
+
+
+class EvaluationResult(db.Model):
+    """Score of a successful evaluation, reused when identical code is evaluated again."""
+
+    __tablename__ = "evaluation_results"
+    __table_args__ = (
+        db.UniqueConstraint(
+            "code_hash", "task_id", "dataset_version", "evaluator_version",
+            name="uq_evaluation_results_key",
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    code_hash = db.Column(db.String(64), nullable=False)
+    task_id = db.Column(db.Integer, nullable=False)
+    dataset_version = db.Column(db.String, nullable=False)
+    evaluator_version = db.Column(db.String, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+    details = db.Column(JSONDocument, nullable=True)
+    hits = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class ChangeCounter(db.Model):
+    """Named counters bumped on writes; their values version cached responses (ETags)."""
+
+    __tablename__ = "change_counters"
+
+    name = db.Column(db.String, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+class Event(db.Model):
+    """Append-only change feed (submission status, leaderboard) streamed over /events."""
+
+    __tablename__ = "events"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String, nullable=False)
+    submission_id = db.Column(db.String, nullable=True, index=True)
+    task_id = db.Column(db.Integer, nullable=True)
+    payload = db.Column(JSONDocument, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
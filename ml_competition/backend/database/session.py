@@ -3,7 +3,31 @@ Database session utilities for F1-Score Grand Prix
 Compatible with Flask-SQLAlchemy patterns
 """
 
+from sqlalchemy import event
+
 from extensions import db
 
 # Re-export db for compatibility
 Base = db.Model
+
+
+def configure_engine(app):
+    """
+    Apply the engine profile from the app config.
+    
+    For SQLite, every new connection gets the SQLITE_PRAGMAS (WAL journaling,
+    synchronous=NORMAL, busy timeout, mmap). Must run before the first
+    connection is opened. Requires an app context.
+    """
+    engine = db.engine
+    if engine.dialect.name != "sqlite":
+        return
+    
+    pragmas = app.config.get("SQLITE_PRAGMAS", {})
+    
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
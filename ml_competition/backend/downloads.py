@@ -0,0 +1,111 @@
+"""
+Dataset downloads for F1-Score Grand Prix
+Precompressed (zstd/gzip) variants of the download files, cached on disk next to them.
+"""
+
+import gzip
+import os
+import shutil
+import threading
+from pathlib import Path
+
+# zstd is optional: without the zstandard package only gzip is offered
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = {"zstd": ".zst", "gzip": ".gz"}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 10
+CHUNK_SIZE = 1024 * 1024
+
+_build_locks = {}
+_build_locks_lock = threading.Lock()
+
+
+def available_encodings():
+    """Return the encodings this process can produce, most preferred first."""
+    return [name for name in ENCODINGS if name != "zstd" or zstandard is not None]
+
+
+def negotiate_encoding(accept_encodings):
+    """
+    Pick the content encoding for a download.
+
+    Args:
+        accept_encodings: werkzeug Accept object (request.accept_encodings)
+
+    Returns:
+        str: 'zstd', 'gzip' or None for the uncompressed file
+    """
+    for name in available_encodings():
+        if accept_encodings.quality(name) > 0:
+            return name
+    return None
+
+
+def variant_path(path, encoding):
+    """Return where the compressed variant of path is cached."""
+    path = Path(path)
+    return path.with_name(path.name + ENCODINGS[encoding])
+
+
+def _is_current(source, variant):
+    # Variants carry their source's mtime, so any rewrite of the source invalidates them
+    try:
+        return variant.stat().st_mtime_ns == source.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def _compress(source, target, encoding):
+    """Stream source into target with the given encoding, chunk by chunk."""
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        if encoding == "gzip":
+            # mtime=0 keeps the output identical for identical input
+            with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=GZIP_LEVEL, mtime=0) as out:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+        else:
+            zstandard.ZstdCompressor(level=ZSTD_LEVEL).copy_stream(
+                src, dst, size=os.fstat(src.fileno()).st_size,
+                read_size=CHUNK_SIZE, write_size=CHUNK_SIZE,
+            )
+
+
+def get_compressed(path, encoding):
+    """
+    Return the compressed variant of path, building it first if it is
+    missing or older than path.
+
+    Concurrent requests for the same variant wait for one build; the file is
+    written under a temporary name and renamed into place when complete.
+
+    Returns:
+        Path: The variant file
+    """
+    source = Path(path)
+    variant = variant_path(source, encoding)
+    if _is_current(source, variant):
+        return variant
+
+    with _build_locks_lock:
+        lock = _build_locks.setdefault(variant, threading.Lock())
+    with lock:
+        if _is_current(source, variant):
+            return variant
+        source_mtime = source.stat().st_mtime_ns
+        tmp_path = variant.with_name(f"{variant.name}.{os.getpid()}.tmp")
+        try:
+            _compress(source, tmp_path, encoding)
+            os.utime(tmp_path, ns=(source_mtime, source_mtime))
+            os.replace(tmp_path, variant)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+    return variant
+
+
+def precompress(path):
+    """Build every available compressed variant of path (e.g. right after writing it)."""
+    return [get_compressed(path, encoding) for encoding in available_encodings()]
@@ -3,64 +3,381 @@ Submission evaluator for F1-Score Grand Prix
 Runs submissions safely and computes metrics.
 """
 
+import os
 import sys
+import json
+import math
+import time
+import select
+import signal
+import struct
+import importlib
 import importlib.util
-import pickle
+from contextlib import contextmanager
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
-from utils import safe_run_submission, load_task_data, compute_metrics, validate_preprocessing
+from utils import (
+    safe_run_submission,
+    load_task_data,
+    load_task_split,
+    compute_metrics,
+    validate_preprocessing,
+    get_peak_rss_mb,
+    get_rss_mb,
+    reset_peak_rss,
+    maxrss_to_mb,
+    get_cpu_seconds,
+    _is_number_dtype,
+    _set_resource_limits,
+)
 
+# Bump whenever scoring changes; cached results from other versions are ignored
+EVALUATOR_VERSION = "1"
 
-def evaluate_submission(submission_path, task_id):
+# Scoring modes for Tasks 1-3: "holdout" trusts the submission's evaluate_model
+# on the fixed split; "kfold" and "seeds" score model.predict server-side over
+# k folds or k reshuffled splits of all labelled data
+SCORING_MODES = ("holdout", "kfold", "seeds")
+
+# Modules imported up front by warm workers so forked children skip the import cost
+PRELOAD_MODULES = [
+    "sklearn.linear_model",
+    "sklearn.ensemble",
+    "sklearn.tree",
+    "sklearn.svm",
+    "sklearn.neighbors",
+    "sklearn.preprocessing",
+    "sklearn.model_selection",
+    "sklearn.metrics",
+]
+
+
+def preload():
+    """
+    Warm up the current process for evaluation.
+    
+    Imports the scientific stack and fills the dataset cache once, so
+    children forked from this process inherit both copy-on-write.
+    """
+    for module_name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            pass
+    
+    try:
+        load_task_data(0, "train", copy=False)
+    except FileNotFoundError:
+        pass
+    for task_id in (1, 2, 3):
+        try:
+            load_task_split(task_id)
+        except FileNotFoundError:
+            continue
+
+
+def evaluator_version(task_id, scoring=None):
+    """
+    Return the version string that identifies a task's results under a
+    scoring configuration (Task 0 ignores the scoring mode).
+    """
+    scoring = scoring or {}
+    mode = scoring.get("mode", "holdout")
+    if mode == "holdout" or task_id == 0:
+        return EVALUATOR_VERSION
+    return f"{EVALUATOR_VERSION}+{mode}{scoring.get('rounds', 5)}"
+
+
+def evaluate_submission(submission_path, task_id, scoring=None):
     """
     Evaluate a submitted Python file.
     
     Args:
         submission_path (Path): Path to submitted Python file
         task_id (int): Task ID (0-3)
+        scoring (dict): {mode, rounds, jobs} for Tasks 1-3 (default: holdout)
     
     Returns:
-        dict: {score, status, details}
+        dict: {score, status, details | error, profile}; profile holds the
+        wall/CPU seconds, the peak RSS growth over the process at the start
+        (peak_rss_mb) and the time spent in each phase
     """
     submission_path = Path(submission_path)
     
     if not submission_path.exists():
         return {"score": 0, "status": "error", "error": "Submission file not found"}
     
+    profile = {}
+    # In a child forked from a warm worker the peak already counts the
+    # worker's resident pages: report the growth over them
+    reset_peak_rss()
+    rss_start = get_rss_mb()
+    start = time.perf_counter()
+    cpu_start = get_cpu_seconds()
     try:
         if task_id == 0:
-            return _evaluate_task0(submission_path)
+            result = _evaluate_task0(submission_path, profile)
         elif task_id in [1, 2, 3]:
-            return _evaluate_task_ml(submission_path, task_id)
+            scoring = scoring or {}
+            if scoring.get("mode", "holdout") == "holdout":
+                result = _evaluate_task_ml(submission_path, task_id, profile)
+            else:
+                result = _evaluate_task_robust(submission_path, task_id, profile=profile, **scoring)
         else:
-            return {"score": 0, "status": "error", "error": f"Unknown task_id: {task_id}"}
+            result = {"score": 0, "status": "error", "error": f"Unknown task_id: {task_id}"}
     
     except Exception as e:
-        return {"score": 0, "status": "error", "error": str(e)}
+        result = {"score": 0, "status": "error", "error": _error_message(e)}
+    
+    profile["wall_seconds"] = time.perf_counter() - start
+    if result.get("status") == "success":
+        result["score"] = _clamp_score(task_id, result.get("score"))
+    profile["cpu_seconds"] = get_cpu_seconds() - cpu_start
+    peak = max(get_peak_rss_mb(), profile.pop("child_peak_rss_mb", 0.0))
+    result["profile"] = {name: round(value, 4) for name, value in profile.items()}
+    result["profile"]["peak_rss_mb"] = round(max(peak - rss_start, 0.0), 1)
+    return result
+
 
+@contextmanager
+def _phase(profile, name):
+    """Add the wall time spent in the block to profile[name + "_seconds"]."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        key = f"{name}_seconds"
+        profile[key] = profile.get(key, 0.0) + time.perf_counter() - start
+
+
+def _error_message(e):
+    """Describe an exception, naming it when it carries no message (e.g. MemoryError)."""
+    return str(e) or type(e).__name__
 
-def _evaluate_task0(submission_path):
+
+def evaluate_in_child(submission_path, task_id, memory_mb=500, cpu_seconds=120, timeout=None, scoring=None):
+    """
+    Evaluate a submission in a sandboxed, forked child process.
+    
+    The child inherits the parent's imports and preloaded data, so it starts
+    almost instantly, but nothing the submission does can leak back into the
+    parent. Before running any user code the child applies the same rlimit
+    sandbox as safe_run_submission, on top of the memory the warm parent
+    already maps. The submission code itself runs in grandchildren without
+    access to the result pipe (see _fork_map); the child scores their raw
+    output and sends the result back as a single binary frame.
+    Falls back to in-process evaluation where fork is unavailable (Windows).
+    
+    Args:
+        submission_path (Path): Path to submitted Python file
+        task_id (int): Task ID (0-3)
+        memory_mb (int): Memory budget for the child in MB
+        cpu_seconds (int): CPU time limit in seconds
+        timeout (float): Wall-clock limit in seconds (default: 2x cpu_seconds)
+        scoring (dict): Scoring options passed to evaluate_submission
+    
+    Returns:
+        dict: {score, status, details | error, profile}
+    """
+    if not hasattr(os, "fork"):
+        return evaluate_submission(submission_path, task_id, scoring)
+    
+    if timeout is None:
+        timeout = 2 * cpu_seconds
+    
+    start = time.perf_counter()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    
+    if pid == 0:
+        # Child: sandbox, evaluate, report and exit without running parent cleanup
+        try:
+            os.close(read_fd)
+            # Own process group, so a timeout also kills any fold processes
+            os.setpgid(0, 0)
+            _set_resource_limits(memory_mb, cpu_seconds, relative=True)
+            _run_child(write_fd, submission_path, task_id, scoring)
+        finally:
+            os._exit(0)
+    
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    os.close(write_fd)
+    try:
+        frame, timed_out = _read_frame(read_fd, pid, timeout)
+    finally:
+        os.close(read_fd)
+    _, exit_status = os.waitpid(pid, 0)
+    # The child never reported: all that is known is how long it ran
+    profile = {"wall_seconds": round(time.perf_counter() - start, 4)}
+    
+    if timed_out:
+        error = f"Submission exceeded time limit ({timeout}s)"
+        return {"score": 0, "status": "error", "error": error, "profile": profile}
+    
+    if not frame:
+        if os.WIFSIGNALED(exit_status) and os.WTERMSIG(exit_status) == signal.SIGXCPU:
+            error = f"Submission exceeded CPU time limit ({cpu_seconds}s)"
+        else:
+            error = f"Evaluation process exited unexpectedly (status {exit_status})"
+        return {"score": 0, "status": "error", "error": error, "profile": profile}
+    
+    try:
+        result = _unpack_result(frame, task_id)
+    except _MALFORMED_FRAME_ERRORS:
+        return {"score": 0, "status": "error", "error": "Malformed result from evaluation process", "profile": profile}
+    # Results the child reports carry their own profile; fill in what is missing
+    for name, value in profile.items():
+        result["profile"].setdefault(name, value)
+    return result
+
+
+# Result frame written by the sandboxed child: a fixed header
+# (status, score, model type length, tail length) followed by the UTF-8
+# model type and a JSON tail holding the profile plus the remaining details
+# on success or the error message on failure.
+_RESULT_HEADER = struct.Struct("!BdHI")
+_STATUS_CODES = {"success": 0, "error": 1}
+# Raised by _unpack_result for truncated or forged frames
+_MALFORMED_FRAME_ERRORS = (struct.error, ValueError, TypeError, AttributeError)
+
+
+def _run_child(write_fd, submission_path, task_id, scoring=None):
+    """
+    Evaluate inside the sandboxed child and write the result frame.
+    
+    This process runs no submission code: evaluate_submission runs it in
+    forked grandchildren that close every inherited descriptor, so nothing
+    they write can reach write_fd, and only their raw output (a processed
+    frame, predictions or an evaluate_model score) comes back to be scored
+    here.
+    """
+    try:
+        result = evaluate_submission(submission_path, task_id, scoring)
+    except BaseException as e:
+        result = {"score": 0, "status": "error", "error": _error_message(e)}
+    
+    _write_all(write_fd, _pack_result(result))
+    os.close(write_fd)
+
+
+def _close_inherited_fds(keep_fd):
+    """Close every descriptor above stdio except keep_fd (call right after fork)."""
+    try:
+        max_fd = os.sysconf("SC_OPEN_MAX")
+    except (AttributeError, ValueError, OSError):
+        max_fd = 4096
+    os.closerange(3, keep_fd)
+    os.closerange(keep_fd + 1, max(max_fd, keep_fd + 1))
+
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _pack_result(result):
+    """Encode an evaluation result as a binary frame."""
+    status = _STATUS_CODES.get(result.get("status"), 1)
+    details = dict(result.get("details") or {})
+    model_type = str(details.pop("model_type", "")).encode("utf-8")[:0xFFFF]
+    tail = {"profile": result.get("profile") or {}}
+    if status == 0:
+        tail["details"] = details
+    else:
+        tail["error"] = result.get("error", "Evaluation failed")
+    tail = json.dumps(tail, default=str).encode("utf-8")
+    
+    header = _RESULT_HEADER.pack(status, float(result.get("score") or 0), len(model_type), len(tail))
+    return header + model_type + tail
+
+
+def _unpack_result(frame, task_id):
+    """
+    Decode a binary frame produced by _pack_result.
+    
+    Raises ValueError for an unknown status; scores are clamped to the
+    range of task_id.
+    """
+    status, score, type_len, tail_len = _RESULT_HEADER.unpack_from(frame)
+    if status not in _STATUS_CODES.values():
+        raise ValueError(f"Unknown result status {status}")
+    offset = _RESULT_HEADER.size
+    model_type = frame[offset:offset + type_len].decode("utf-8")
+    offset += type_len
+    tail = json.loads(frame[offset:offset + tail_len].decode("utf-8"))
+    
+    if status == 0:
+        details = {"model_type": model_type} if model_type else {}
+        details.update(tail.get("details") or {})
+        result = {"score": _clamp_score(task_id, score), "status": "success", "details": details}
+    else:
+        result = {"score": 0, "status": "error", "error": str(tail.get("error"))}
+    
+    result["profile"] = tail.get("profile") or {}
+    return result
+
+
+def _read_frame(read_fd, pid, timeout):
+    """
+    Read the child's result frame, killing the child if it runs past the timeout.
+    
+    Returns:
+        tuple: (frame bytes, timed_out flag)
+    """
+    chunks = []
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                os.kill(pid, signal.SIGKILL)
+            return b"", True
+        
+        ready, _, _ = select.select([read_fd], [], [], remaining)
+        if not ready:
+            continue
+        chunk = os.read(read_fd, 65536)
+        if not chunk:
+            return b"".join(chunks), False
+        chunks.append(chunk)
+
+
+def _evaluate_task0(submission_path, profile):
     """
     Evaluate Task 0 (EDA/Preprocessing).
     
-    Runs preprocess_data(df) and validates output.
+    Runs preprocess_data(df) in a forked process, which sends back only the
+    processed frame's columns as raw arrays, and validates them here.
     """
     try:
         # Load training data
-        df_train = load_task_data(0, "train")
+        with _phase(profile, "data_load"):
+            df_train = load_task_data(0, "train", copy=False)
         
-        # Import and run preprocessing function
-        spec = importlib.util.spec_from_file_location("submission", submission_path)
-        submission_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(submission_module)
+        # Import the submission and call preprocess_data
+        def _preprocess(_):
+            timings = {}
+            with _phase(timings, "import"):
+                submission_module = _import_submission(submission_path)
+            with _phase(timings, "preprocess"):
+                df_processed = submission_module.preprocess_data(df_train.copy())
+            return _pack_frame(df_processed, timings)
         
-        # Call preprocess_data
-        df_processed = submission_module.preprocess_data(df_train.copy())
+        timings, df_processed = _unpack_frame(_run_submission(_preprocess, profile))
+        profile.update(timings)
         
         # Validate preprocessing
-        score, details = validate_preprocessing(df_train, df_processed)
+        with _phase(profile, "validate"):
+            score, details = validate_preprocessing(df_train, df_processed)
         
         return {
             "score": score,
@@ -72,48 +389,147 @@ def _evaluate_task0(submission_path):
         return {
             "score": 0,
             "status": "error",
-            "error": f"Task 0 evaluation failed: {str(e)}"
+            "error": f"Task 0 evaluation failed: {_error_message(e)}"
         }
 
 
-def _evaluate_task_ml(submission_path, task_id):
+def _evaluate_task_ml(submission_path, task_id, profile):
     """
     Evaluate Tasks 1-3 (ML tasks).
     
-    Runs train_model() and evaluate_model() functions.
+    Runs train_model() and evaluate_model() in a forked process, which sends
+    back only the model type and the score evaluate_model returned.
     """
     try:
-        # Load training and test data
-        df_train = load_task_data(task_id, "train")
-        df_test = load_task_data(task_id, "test")
+        # Load cached, read-only features and target (column 'target')
+        with _phase(profile, "data_load"):
+            X_train, y_train, X_test, y_test = load_task_split(task_id)
         
-        # Split features and target (assume last column is 'target')
-        X_train = df_train.drop(columns=["target"])
-        y_train = df_train["target"]
-        X_test = df_test.drop(columns=["target"])
-        y_test = df_test["target"]
+        # Import the submission, train and evaluate the model
+        def _train_and_evaluate(_):
+            timings = {}
+            with _phase(timings, "import"):
+                submission_module = _import_submission(submission_path)
+            with _phase(timings, "train"):
+                model = submission_module.train_model(X_train, y_train)
+            with _phase(timings, "evaluate"):
+                score = float(submission_module.evaluate_model(model, X_test, y_test))
+            return _pack_output({"timings": timings, "model_type": type(model).__name__, "score": score})
+        
+        header, _ = _unpack_output(_run_submission(_train_and_evaluate, profile))
+        profile.update(_read_timings(header))
+        score = header.get("score")
+        if isinstance(score, bool) or not isinstance(score, (int, float)):
+            raise ValueError("evaluate_model must return a number")
+        
+        return {
+            # Ensure score is a float between 0-1
+            "score": round(_clamp_score(task_id, score), 4),
+            "status": "success",
+            "details": {
+                "model_type": str(header.get("model_type", "")),
+                "metric_name": _get_metric_name(task_id)
+            }
+        }
+    
+    except Exception as e:
+        return {
+            "score": 0,
+            "status": "error",
+            "error": f"Task {task_id} evaluation failed: {_error_message(e)}"
+        }
+
+
+# Highest score of each task: Task 0 awards up to 30 points, the ML metrics 1
+_MAX_SCORES = {0: 30, 1: 1, 2: 1, 3: 1}
+
+
+def _clamp_score(task_id, score):
+    """Clamp a score to its task's range; NaN and infinities score 0."""
+    if score is None or not math.isfinite(float(score)):
+        return 0
+    return min(max(score, 0), _MAX_SCORES.get(task_id, 1))
+
+
+def _run_submission(func, profile):
+    """
+    Run func, which calls submission code and returns bytes, in a forked
+    process (see _fork_map) and return those bytes.
+    """
+    peaks = []
+    payload = _fork_map(func, [None], peaks=peaks)[0]
+    profile["child_peak_rss_mb"] = max(peaks, default=0.0)
+    return payload
+
+
+def _evaluate_task_robust(submission_path, task_id, mode="kfold", rounds=5, jobs=1, profile=None):
+    """
+    Score Tasks 1-3 server-side over several folds or seeds.
+    
+    Each split runs in its own forked process, which imports the submission
+    and calls train_model() and model.predict(), then sends back nothing but
+    the raw prediction array. This process never runs submission code: it
+    checks each array's length and dtype and scores it with compute_metrics.
+    The submission's own evaluate_model is ignored.
+    
+    Args:
+        submission_path (Path): Path to submitted Python file
+        task_id (int): Task ID (1-3)
+        mode (str): "kfold" (k-fold over all labelled data) or "seeds"
+            (k shuffled splits with the original test fraction)
+        rounds (int): Number of folds or seeds
+        jobs (int): Maximum number of splits evaluated at once
+        profile (dict): Receives phase timings, with import, train and
+            predict summed over all splits, and the largest peak RSS of a
+            split process (child_peak_rss_mb)
+    """
+    profile = {} if profile is None else profile
+    try:
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {mode}")
         
-        # Import and run model functions
-        spec = importlib.util.spec_from_file_location("submission", submission_path)
-        submission_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(submission_module)
+        with _phase(profile, "data_load"):
+            X_train, y_train, X_test, y_test = load_task_split(task_id)
+            X = pd.concat([X_train, X_test], ignore_index=True)
+            y = pd.concat([y_train, y_test], ignore_index=True)
+            splits = _make_splits(task_id, y, mode, rounds, len(X_test) / len(X))
         
-        # Train model
-        model = submission_module.train_model(X_train, y_train)
+        def _predict_split(split):
+            train_idx, test_idx = split
+            timings = {}
+            with _phase(timings, "import"):
+                submission_module = _import_submission(submission_path)
+            with _phase(timings, "train"):
+                model = submission_module.train_model(X.iloc[train_idx], y.iloc[train_idx])
+            with _phase(timings, "predict"):
+                y_pred = model.predict(X.iloc[test_idx])
+            return _pack_predictions(type(model).__name__, timings, y_pred)
         
-        # Evaluate model
-        score = submission_module.evaluate_model(model, X_test, y_test)
+        peaks = []
+        payloads = _fork_map(_predict_split, splits, jobs, peaks=peaks)
+        profile["child_peak_rss_mb"] = max(peaks, default=0.0)
         
-        # Ensure score is a float between 0-1
-        score = float(score)
-        score = max(0, min(1, score))
+        scores = []
+        model_type = ""
+        for (_, test_idx), payload in zip(splits, payloads):
+            model_type, timings, y_pred = _unpack_predictions(payload, len(test_idx))
+            for name, seconds in timings.items():
+                profile[name] = profile.get(name, 0.0) + seconds
+            scores.append(compute_metrics(task_id, y.iloc[test_idx].to_numpy(), y_pred))
+        fold_scores = np.array(scores, dtype=float)
+        mean = float(fold_scores.mean())
         
         return {
-            "score": round(score, 4),
+            "score": round(max(0, min(1, mean)), 4),
             "status": "success",
             "details": {
-                "model_type": type(model).__name__,
-                "metric_name": _get_metric_name(task_id)
+                "model_type": model_type,
+                "metric_name": _get_metric_name(task_id),
+                "scoring_mode": mode,
+                "fold_scores": [round(float(score), 4) for score in fold_scores],
+                "score_mean": round(mean, 4),
+                "score_variance": round(float(fold_scores.var()), 6),
+                "score_std": round(float(fold_scores.std()), 4),
             }
         }
     
@@ -121,10 +537,286 @@ def _evaluate_task_ml(submission_path, task_id):
         return {
             "score": 0,
             "status": "error",
-            "error": f"Task {task_id} evaluation failed: {str(e)}"
+            "error": f"Task {task_id} evaluation failed: {_error_message(e)}"
         }
 
 
+def _import_submission(submission_path):
+    spec = importlib.util.spec_from_file_location("submission", submission_path)
+    submission_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(submission_module)
+    return submission_module
+
+
+# Raw output sent back by a process that ran submission code: header
+# length, a JSON header and the raw bytes of any arrays it describes
+_OUTPUT_HEADER = struct.Struct("!I")
+# Timings such a process may report
+_SUBMISSION_TIMINGS = ("import_seconds", "preprocess_seconds", "train_seconds", "predict_seconds", "evaluate_seconds")
+# Array kinds accepted as raw bytes: bool, integers, floats, complex, datetimes
+_RAW_KINDS = "biufcmM"
+# Nullable extension dtypes rebuilt from float64 values
+_NULLABLE_NUMERIC = (
+    "Int8", "Int16", "Int32", "Int64", "UInt8", "UInt16", "UInt32", "UInt64", "Float32", "Float64",
+)
+
+
+def _pack_output(header, *buffers):
+    """Encode a JSON-serializable header followed by raw array bytes."""
+    header = json.dumps(header).encode("utf-8")
+    return _OUTPUT_HEADER.pack(len(header)) + header + b"".join(buffers)
+
+
+def _unpack_output(payload):
+    """
+    Split a payload from _pack_output into its header dict and raw bytes.
+    
+    The payload comes from a process that ran submission code, so it is
+    only ever parsed as JSON and raw numbers.
+    """
+    try:
+        (header_len,) = _OUTPUT_HEADER.unpack_from(payload)
+        offset = _OUTPUT_HEADER.size + header_len
+        header = json.loads(payload[_OUTPUT_HEADER.size:offset].decode("utf-8"))
+    except (struct.error, ValueError):
+        raise ValueError("Malformed output from submission process") from None
+    if not isinstance(header, dict) or offset > len(payload):
+        raise ValueError("Malformed output from submission process")
+    return header, payload[offset:]
+
+
+def _read_timings(header):
+    timings = header.get("timings")
+    if not isinstance(timings, dict):
+        return {}
+    return {
+        name: float(seconds) for name, seconds in timings.items()
+        if name in _SUBMISSION_TIMINGS and isinstance(seconds, (int, float))
+    }
+
+
+def _raw_dtype(name):
+    """Parse an array dtype sent by a submission process, allowing plain numbers only."""
+    try:
+        dtype = np.dtype(str(name))
+    except TypeError:
+        raise ValueError("Malformed output from submission process") from None
+    if dtype.kind not in _RAW_KINDS or dtype.fields is not None:
+        raise ValueError(f"Unsupported array dtype {dtype}")
+    return dtype
+
+
+def _pack_predictions(model_type, timings, y_pred):
+    """Encode a split's predictions as a numeric array and its metadata."""
+    y_pred = np.asarray(y_pred)
+    if y_pred.dtype.kind not in "biuf":
+        y_pred = y_pred.astype(np.float64)
+    y_pred = np.ascontiguousarray(y_pred)
+    header = {"model_type": model_type, "timings": timings, "dtype": y_pred.dtype.str, "shape": list(y_pred.shape)}
+    return _pack_output(header, y_pred.tobytes())
+
+
+def _unpack_predictions(payload, rows):
+    """
+    Decode and check a split's predictions.
+    
+    Returns:
+        tuple: (model type name, timings dict, 1-D prediction array)
+    """
+    header, data = _unpack_output(payload)
+    try:
+        dtype = np.dtype(str(header["dtype"]))
+        shape = [int(n) for n in header["shape"]]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("Malformed predictions from fold process") from None
+    
+    if dtype.kind not in "biuf" or dtype.fields is not None:
+        raise ValueError(f"model.predict must return numbers, got dtype {dtype}")
+    if int(np.prod(shape)) != rows or (len(shape) > 1 and max(shape) != rows):
+        raise ValueError(f"model.predict returned shape {tuple(shape)} for {rows} rows")
+    if len(data) != rows * dtype.itemsize:
+        raise ValueError("Malformed predictions from fold process")
+    return str(header.get("model_type", "")), _read_timings(header), np.frombuffer(data, dtype=dtype)
+
+
+def _pack_frame(df, timings):
+    """
+    Encode a processed frame as one raw array per column (see _unpack_frame).
+    
+    Plain NumPy columns are sent as they are, other numeric columns as
+    float64 with NaN for missing values, and any other column only as its
+    null mask: that is all validate_preprocessing looks at.
+    """
+    if not isinstance(df, pd.DataFrame):
+        raise TypeError("preprocess_data must return a pandas DataFrame")
+    columns, buffers = [], []
+    for i in range(df.shape[1]):
+        series = df.iloc[:, i]
+        dtype = series.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in _RAW_KINDS:
+            layout, values = "raw", series.to_numpy()
+        elif _is_number_dtype(dtype):
+            layout, values = "float", series.to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            layout, values = "nulls", series.isna().to_numpy(dtype=bool)
+        values = np.ascontiguousarray(values)
+        columns.append({"name": str(df.columns[i]), "dtype": str(dtype), "layout": layout, "array": values.dtype.str})
+        buffers.append(values.tobytes())
+    return _pack_output({"timings": timings, "rows": len(df), "columns": columns}, *buffers)
+
+
+def _unpack_frame(payload):
+    """
+    Rebuild a frame encoded by _pack_frame.
+    
+    Returns:
+        tuple: (timings dict, DataFrame with the same column names, null
+        positions and numeric values, and dtypes as close as the encoding
+        allows)
+    """
+    header, data = _unpack_output(payload)
+    try:
+        rows = int(header["rows"])
+        specs = [dict(spec) for spec in header["columns"]]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Malformed output from submission process") from None
+    
+    names, columns, offset = [], [], 0
+    for spec in specs:
+        layout = spec.get("layout")
+        dtype = _raw_dtype(spec.get("array"))
+        if layout not in ("raw", "float", "nulls") or (layout == "float" and dtype != np.float64) \
+                or (layout == "nulls" and dtype.kind != "b") or rows < 0:
+            raise ValueError("Malformed output from submission process")
+        size = rows * dtype.itemsize
+        if offset + size > len(data):
+            raise ValueError("Malformed output from submission process")
+        values = np.frombuffer(data, dtype=dtype, count=rows, offset=offset)
+        offset += size
+        names.append(str(spec.get("name")))
+        columns.append(_rebuild_column(layout, str(spec.get("dtype")), values))
+    if offset != len(data):
+        raise ValueError("Malformed output from submission process")
+    
+    if not columns:
+        return _read_timings(header), pd.DataFrame(index=pd.RangeIndex(rows))
+    df = pd.concat(columns, axis=1, ignore_index=True)
+    df.columns = names
+    return _read_timings(header), df
+
+
+def _rebuild_column(layout, dtype_name, values):
+    if layout == "raw":
+        return pd.Series(values)
+    if layout == "float":
+        series = pd.Series(values)
+        if dtype_name in _NULLABLE_NUMERIC:
+            try:
+                return series.astype(dtype_name)
+            except (TypeError, ValueError):
+                pass
+        return series
+    # Only the null mask is known: placeholder values of a similar dtype
+    if dtype_name == "category":
+        return pd.Series(pd.Categorical.from_codes(np.where(values, -1, 0), categories=["value"]))
+    if dtype_name == "boolean":
+        return pd.Series(np.where(values, None, True).astype(object), dtype="boolean")
+    placeholders = np.where(values, None, "value").astype(object)
+    if dtype_name == "string":
+        return pd.Series(placeholders, dtype="string")
+    # Other dtypes (tz-aware datetimes, periods, ...) are reported as object
+    return pd.Series(placeholders, dtype=object)
+
+
+def _make_splits(task_id, y, mode, rounds, test_size):
+    """Return (train_idx, test_idx) pairs; classification tasks are stratified."""
+    from sklearn.model_selection import KFold, StratifiedKFold, ShuffleSplit, StratifiedShuffleSplit
+    
+    classification = task_id in (2, 3)
+    if mode == "kfold":
+        splitter = (StratifiedKFold if classification else KFold)(n_splits=rounds, shuffle=True, random_state=0)
+    else:
+        splitter = (StratifiedShuffleSplit if classification else ShuffleSplit)(
+            n_splits=rounds, test_size=test_size, random_state=0
+        )
+    return list(splitter.split(np.zeros(len(y)), y if classification else None))
+
+
+def _fork_map(func, items, max_workers=1, peaks=None):
+    """
+    Map func over items, each call in its own forked process.
+    
+    Children inherit everything already loaded (data, imported modules) but
+    close every other inherited descriptor, and func must return bytes:
+    only those bytes cross the pipe, and nothing from a child is unpickled.
+    Up to max_workers children run at once. Runs serially in this process
+    where fork is unavailable. Raises RuntimeError if any call fails.
+    
+    peaks, if given, receives the peak RSS (MB) of each finished child.
+    """
+    if not hasattr(os, "fork"):
+        return [bytes(func(item)) for item in items]
+    
+    results = [None] * len(items)
+    pending = list(enumerate(items))
+    running = {}
+    try:
+        _drain_forks(func, pending, running, results, max(max_workers, 1), peaks)
+    finally:
+        # On failure, stop the splits still in flight
+        for pid, (_, read_fd) in running.items():
+            os.close(read_fd)
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except OSError:
+                pass
+    return results
+
+
+# Status byte that starts a _fork_map child's reply
+_FORK_OK, _FORK_FAILED = b"\x00", b"\x01"
+
+
+def _drain_forks(func, pending, running, results, max_workers, peaks=None):
+    """Scheduling loop of _fork_map: keep max_workers children busy until pending is empty."""
+    while pending or running:
+        while pending and len(running) < max_workers:
+            index, item = pending.pop(0)
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    _close_inherited_fds(keep_fd=write_fd)
+                    try:
+                        payload = _FORK_OK + bytes(func(item))
+                    except BaseException as e:
+                        payload = _FORK_FAILED + _error_message(e).encode("utf-8", "replace")
+                    _write_all(write_fd, payload)
+                finally:
+                    os._exit(0)
+            os.close(write_fd)
+            running[pid] = (index, read_fd)
+        
+        # Wait for any child to finish writing, then reap exactly that child
+        by_fd = {read_fd: pid for pid, (_, read_fd) in running.items()}
+        ready, _, _ = select.select(list(by_fd), [], [])
+        pid = by_fd[ready[0]]
+        index, read_fd = running.pop(pid)
+        with os.fdopen(read_fd, "rb") as f:
+            payload = f.read()
+        _, exit_status, usage = os.wait4(pid, 0)
+        if peaks is not None:
+            peaks.append(maxrss_to_mb(usage.ru_maxrss))
+        if not payload:
+            if os.WIFSIGNALED(exit_status) and os.WTERMSIG(exit_status) == signal.SIGXCPU:
+                raise RuntimeError("Submission process exceeded its CPU time limit")
+            raise RuntimeError(f"Submission process exited unexpectedly (status {exit_status})")
+        if payload[:1] != _FORK_OK:
+            raise RuntimeError(payload[1:1000].decode("utf-8", "replace"))
+        results[index] = payload[1:]
+
+
 def _get_metric_name(task_id):
     """Get metric name for a given task ID"""
     metrics = {
@@ -0,0 +1,251 @@
+"""
+Live event feed for F1-Score Grand Prix
+Status and leaderboard changes are appended to the events table in the same
+transaction as the change itself; one broadcaster thread per web process
+tails the table and fans new events out to Server-Sent Events subscribers.
+Writers also delete expired events, so the table stays bounded whether or
+not anyone is subscribed.
+
+Ids are handed out when a row is inserted, not when it commits, so on
+PostgreSQL an event can become visible after a later id has already been
+streamed. The broadcaster keeps the ids it skipped over and re-reads them for
+EVENTS_REORDER_SECONDS before giving up on them as rolled back.
+"""
+
+import json
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+
+from extensions import db
+from database.models import Event
+
+# Event kinds
+SUBMISSION_STATUS = "submission"
+LEADERBOARD_UPDATE = "leaderboard"
+# Sent instead of a replay the server cannot give in full; clients reload
+RESYNC = "resync"
+
+# Most skipped ids one broadcaster waits for at a time
+MAX_PENDING_GAPS = 256
+
+# Minimum seconds between two prunes of expired events by one process
+PRUNE_INTERVAL = 60
+
+_last_prune = None
+_prune_lock = threading.Lock()
+
+
+def prune_events():
+    """
+    Delete events older than EVENTS_RETENTION_SECONDS (caller commits).
+    
+    Runs at most once per PRUNE_INTERVAL per process; emit_status and
+    emit_leaderboard call it on every write.
+    """
+    global _last_prune
+    now = time.monotonic()
+    with _prune_lock:
+        if _last_prune is not None and now - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = now
+    retention = current_app.config.get("EVENTS_RETENTION_SECONDS", 3600)
+    cutoff = datetime.utcnow() - timedelta(seconds=retention)
+    Event.query.filter(Event.created_at < cutoff).delete(synchronize_session=False)
+
+
+def emit_status(submission):
+    """Record a submission status transition (caller commits)."""
+    db.session.add(Event(
+        kind=SUBMISSION_STATUS,
+        submission_id=submission.id,
+        task_id=submission.task_id,
+        payload={
+            "submission_id": submission.id,
+            "task_id": submission.task_id,
+            "team_name": submission.team_name,
+            "status": submission.status,
+            "score": submission.score,
+        },
+    ))
+    prune_events()
+
+
+def emit_leaderboard(task_id, team_name, entry):
+    """
+    Record a leaderboard change for one team (caller commits).
+    
+    Args:
+        task_id (int): Task ID (0-3)
+        team_name (str): Team whose entry changed
+        entry (dict | None): New entry, or None if the team left the board
+    """
+    db.session.add(Event(
+        kind=LEADERBOARD_UPDATE,
+        submission_id=entry["submission_id"] if entry else None,
+        task_id=task_id,
+        payload={"task_id": task_id, "team_name": team_name, "entry": entry},
+    ))
+    prune_events()
+
+
+def event_to_dict(event):
+    return {
+        "id": event.id,
+        "kind": event.kind,
+        "submission_id": event.submission_id,
+        "task_id": event.task_id,
+        "data": event.payload,
+    }
+
+
+def resync_event(cursor):
+    """Event telling a client to reload; resuming after it starts at cursor."""
+    return {"id": cursor, "kind": RESYNC, "submission_id": None, "task_id": None, "data": {}}
+
+
+def format_sse(event):
+    """
+    Encode an event dict as a Server-Sent Events message.
+    
+    Late events (committed after a higher id was streamed) carry no id line,
+    so the client's Last-Event-ID stays at the highest id it has seen.
+    """
+    data = json.dumps(event["data"], separators=(",", ":"))
+    id_line = "" if event.get("late") else f"id: {event['id']}\n"
+    return f"{id_line}event: {event['kind']}\ndata: {data}\n\n"
+
+
+def fetch_events(after_id, up_to_id=None, limit=500, also_ids=()):
+    """
+    Return stored events with after_id < id <= up_to_id, oldest first.
+    
+    Args:
+        also_ids: Ids at or below after_id to include as well (skipped ids
+            the caller is still waiting on)
+    """
+    condition = Event.id > after_id
+    if also_ids:
+        condition = db.or_(condition, Event.id.in_(list(also_ids)))
+    query = Event.query.filter(condition)
+    if up_to_id is not None:
+        query = query.filter(Event.id <= up_to_id)
+    return [event_to_dict(e) for e in query.order_by(Event.id.asc()).limit(limit)]
+
+
+def fetch_backlog(after_id, up_to_id, limit=500):
+    """
+    Return the events a reconnecting client missed, or None if there are more
+    than limit of them and the client has to resync instead.
+    """
+    events = fetch_events(after_id, up_to_id=up_to_id, limit=limit + 1)
+    return events if len(events) <= limit else None
+
+
+class Subscription:
+    """A client's queue of pending events."""
+
+    def __init__(self, maxsize):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = False
+
+
+class EventBroadcaster:
+    """Tails the events table and fans new rows out to in-process subscribers."""
+
+    def __init__(self, app):
+        self.app = app
+        self.poll_interval = app.config.get("EVENTS_POLL_INTERVAL", 0.5)
+        self.queue_size = app.config.get("EVENTS_SUBSCRIBER_QUEUE", 1000)
+        self.reorder_seconds = app.config.get("EVENTS_REORDER_SECONDS", 10)
+        self.subscribers = set()
+        self.cursor = None
+        # Skipped ids below the cursor that may still commit -> give-up time
+        self._gaps = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self):
+        """
+        Register a subscriber.
+        
+        Returns:
+            tuple: (Subscription, cursor) - the subscription receives every
+            event with id > cursor
+        """
+        with self._lock:
+            if self._thread is None:
+                self.cursor = db.session.query(db.func.max(Event.id)).scalar() or 0
+                self._thread = threading.Thread(target=self._run, name="event-broadcaster", daemon=True)
+                self._thread.start()
+            subscription = Subscription(self.queue_size)
+            self.subscribers.add(subscription)
+            return subscription, self.cursor
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self.subscribers.discard(subscription)
+
+    def _run(self):
+        with self.app.app_context():
+            while True:
+                try:
+                    now = time.monotonic()
+                    self._gaps = {i: t for i, t in self._gaps.items() if t > now}
+                    events = fetch_events(self.cursor, also_ids=self._gaps.keys())
+                    # End the read transaction so the next poll sees new commits
+                    db.session.rollback()
+                except Exception:
+                    db.session.rollback()
+                    events = []
+
+                if events:
+                    self._publish(events)
+                else:
+                    time.sleep(self.poll_interval)
+
+    def _track(self, events):
+        """Advance the cursor past events; return the ones not yet published."""
+        deadline = time.monotonic() + self.reorder_seconds
+        fresh = []
+        last = self.cursor
+        for event in events:
+            event_id = event["id"]
+            if event_id > last:
+                # Ids skipped on the way may belong to transactions still open
+                for missing in range(max(last + 1, event_id - MAX_PENDING_GAPS), event_id):
+                    self._gaps[missing] = deadline
+                last = event_id
+                fresh.append(event)
+            elif self._gaps.pop(event_id, None) is not None:
+                fresh.append(dict(event, late=True))
+        if len(self._gaps) > MAX_PENDING_GAPS:
+            for missing in sorted(self._gaps)[:-MAX_PENDING_GAPS]:
+                del self._gaps[missing]
+        return fresh, last
+
+    def _publish(self, events):
+        events, cursor = self._track(events)
+        with self._lock:
+            self.cursor = cursor
+            subscribers = list(self.subscribers)
+        for subscription in subscribers:
+            try:
+                for event in events:
+                    subscription.queue.put_nowait(event)
+            except queue.Full:
+                # Too slow to keep up; drop it and let the client reconnect
+                subscription.dropped = True
+                self.unsubscribe(subscription)
+
+
+def get_broadcaster():
+    """Return this process's broadcaster, creating it on first use."""
+    app = current_app._get_current_object()
+    broadcaster = app.extensions.get("event_broadcaster")
+    if broadcaster is None:
+        broadcaster = app.extensions.setdefault("event_broadcaster", EventBroadcaster(app))
+    return broadcaster
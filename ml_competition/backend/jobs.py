@@ -0,0 +1,578 @@
+"""
+Evaluation job queue for F1-Score Grand Prix
+Jobs are persisted in the submissions table and drained by local worker processes.
+
+Only the pool's coordinator thread writes to the database: it claims queued
+jobs, hands each to an idle worker over that worker's own queue and stores
+the results in grouped transactions. A claim is a lease the coordinator
+renews while the job runs, so pools sharing one database only take back
+jobs whose pool has stopped renewing them.
+"""
+
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import or_, update
+
+from extensions import db
+from database.models import Submission
+from evaluator import evaluate_submission, evaluate_in_child, evaluator_version, preload
+from standings import record_evaluation
+from events import emit_status
+from monitoring import evaluation_duration, evaluation_queue, evaluation_workers, evaluations, register_collector
+from storage import cache_result, ensure_code_hash, get_cached_result
+from utils import get_dataset_version
+
+# Submission.status values owned by the queue
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+
+def enqueue_evaluation(submission, task_id):
+    """
+    Queue a submission for evaluation.
+
+    The submission row itself is the job: its status moves from
+    "queued" to "running" to "success"/"error". Code that was already
+    evaluated against the same data is scored from the result cache
+    straight away.
+
+    Args:
+        submission (Submission): Submission to evaluate
+        task_id (int): Task ID (0-3) to evaluate against
+
+    Returns:
+        bool: True if queued or scored from cache, False if already queued or running
+    """
+    if submission.status in ACTIVE_STATUSES:
+        return False
+
+    submission.task_id = task_id
+    cached = get_cached_result(
+        ensure_code_hash(submission), task_id,
+        evaluator_version=evaluator_version(task_id, get_scoring_options(current_app.config)),
+    )
+    if cached is not None:
+        apply_result(submission, cached)
+        db.session.commit()
+        return True
+
+    submission.status = STATUS_QUEUED
+    submission.score = None
+    submission.details = None
+    emit_status(submission)
+    db.session.commit()
+    return True
+
+
+def claim_jobs(limit, node_id=None):
+    """
+    Atomically claim up to limit of the oldest queued submissions.
+    
+    All claims happen in one transaction; a conditional UPDATE per row makes
+    sure no other process claims the same submission.
+    
+    Args:
+        limit (int): Most submissions to claim
+        node_id (str): Pool taking the lease (EVALUATION_NODE_ID)
+    
+    Returns:
+        list: Claimed submissions (now "running"), oldest first
+    """
+    candidates = [
+        row.id for row in
+        db.session.query(Submission.id)
+        .filter(Submission.status == STATUS_QUEUED)
+        .order_by(Submission.created_at.asc())
+        .limit(limit)
+    ]
+    
+    claimed = []
+    for submission_id in candidates:
+        won = db.session.execute(
+            update(Submission)
+            .where(Submission.id == submission_id, Submission.status == STATUS_QUEUED)
+            .values(status=STATUS_RUNNING, claimed_by=node_id, heartbeat_at=datetime.utcnow())
+        ).rowcount
+        if won:
+            submission = db.session.get(Submission, submission_id, populate_existing=True)
+            emit_status(submission)
+            claimed.append(submission)
+    
+    db.session.commit()
+    return claimed
+
+
+def apply_result(submission, result):
+    """
+    Copy an evaluation result onto its submission, fold it into the
+    leaderboard and the result cache (caller commits).
+    
+    Args:
+        submission (Submission): Evaluated submission
+        result (dict): {score, status, details | error, profile} from the
+            evaluator, plus the dataset_version it was scored against
+    """
+    if submission.code_hash and result.get("dataset_version"):
+        cache_result(
+            submission.code_hash, submission.task_id,
+            result["dataset_version"], result["evaluator_version"], result,
+        )
+    
+    submission.score = result.get("score", 0)
+    submission.status = result.get("status", "error")
+    details = dict(result.get("details") or {})
+    if submission.status == "error":
+        details = {"error": result.get("error", "Evaluation failed")}
+    if result.get("profile"):
+        details["profile"] = result["profile"]
+    submission.details = details or None
+    
+    evaluations.inc(
+        task_id=submission.task_id, status=submission.status,
+        source="cache" if result.get("cached") else "run",
+    )
+    wall_seconds = (result.get("profile") or {}).get("wall_seconds")
+    if wall_seconds is not None:
+        evaluation_duration.observe(wall_seconds, task_id=submission.task_id, status=submission.status)
+    emit_status(submission)
+    record_evaluation(submission)
+
+
+def store_results(results):
+    """
+    Write a batch of evaluation results in one transaction.
+    
+    Falls back to one transaction per result if the batch fails, so one bad
+    row cannot lose the others.
+    
+    Args:
+        results (list): (submission_id, result) pairs
+    """
+    try:
+        for submission_id, result in results:
+            submission = db.session.get(Submission, submission_id)
+            if submission is not None:
+                apply_result(submission, result)
+        db.session.commit()
+        return
+    except Exception:
+        db.session.rollback()
+        if len(results) == 1:
+            raise
+    
+    for item in results:
+        try:
+            store_results([item])
+        except Exception:
+            db.session.rollback()
+
+
+def get_task_limits(config, task_id, scoring=None):
+    """
+    Resolve the sandbox limits for a task from the app config.
+    
+    Each fold or seed gets the task's CPU limit, but only scoring["jobs"] of
+    them run at once, so for Tasks 1-3 outside holdout mode the wall-clock
+    timeout covers ceil(rounds / jobs) consecutive rounds.
+    
+    Args:
+        config: Flask config mapping
+        task_id (int): Task ID (0-3)
+        scoring (dict): {mode, rounds, jobs} (default: holdout)
+    
+    Returns:
+        dict: {memory_mb, cpu_seconds, timeout}
+    """
+    limits = dict(config.get("DEFAULT_TASK_LIMITS", {}))
+    limits.update(config.get("TASK_LIMITS", {}).get(task_id, {}))
+    scoring = scoring or {}
+    if task_id != 0 and scoring.get("mode", "holdout") != "holdout" and limits.get("timeout"):
+        waves = math.ceil(scoring.get("rounds", 5) / max(1, scoring.get("jobs", 1)))
+        limits["timeout"] *= waves
+    return limits
+
+
+def get_scoring_options(config):
+    """
+    Resolve the scoring mode for Tasks 1-3 from the app config.
+    
+    Returns:
+        dict: {mode, rounds, jobs}; jobs=0 in the config becomes an even
+        share of the CPUs per evaluation worker
+    """
+    jobs = config.get("SCORING_JOBS", 0)
+    if jobs <= 0:
+        jobs = max(1, (os.cpu_count() or 1) // max(1, config.get("EVALUATION_WORKERS", 1)))
+    return {
+        "mode": config.get("SCORING_MODE", "holdout"),
+        "rounds": config.get("SCORING_ROUNDS", 5),
+        "jobs": jobs,
+    }
+
+
+def requeue_jobs(submission_ids):
+    """
+    Put claimed jobs that never started back in the queue.
+    
+    Only rows still "running" are touched, so a job that finished meanwhile
+    keeps its result.
+    
+    Returns:
+        int: Number of requeued submissions
+    """
+    requeued = 0
+    for submission_id in submission_ids:
+        won = db.session.execute(
+            update(Submission)
+            .where(Submission.id == submission_id, Submission.status == STATUS_RUNNING)
+            .values(status=STATUS_QUEUED)
+        ).rowcount
+        if won:
+            emit_status(db.session.get(Submission, submission_id, populate_existing=True))
+            requeued += 1
+    db.session.commit()
+    return requeued
+
+
+def renew_leases(node_id, submission_ids):
+    """Extend this pool's leases on the jobs it is running."""
+    if not submission_ids:
+        return
+    db.session.execute(
+        update(Submission)
+        .where(
+            Submission.id.in_(list(submission_ids)),
+            Submission.status == STATUS_RUNNING,
+            Submission.claimed_by == node_id,
+        )
+        .values(heartbeat_at=datetime.utcnow())
+    )
+    db.session.commit()
+
+
+def requeue_stale_jobs(lease_seconds, node_id=None):
+    """
+    Put running jobs whose pool is gone back in the queue.
+    
+    Args:
+        lease_seconds (float): Jobs not renewed for this long are requeued
+        node_id (str): Also requeue every job this node claimed (a pool
+            starting on it cannot be running them yet)
+    
+    Returns:
+        int: Number of requeued submissions
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=lease_seconds)
+    # Jobs claimed before leases existed have no heartbeat
+    stale = or_(Submission.heartbeat_at.is_(None), Submission.heartbeat_at < cutoff)
+    if node_id is not None:
+        stale = or_(stale, Submission.claimed_by == node_id)
+    candidates = [
+        row.id for row in
+        db.session.query(Submission.id).filter(Submission.status == STATUS_RUNNING, stale)
+    ]
+    
+    requeued = 0
+    for submission_id in candidates:
+        # Re-check the lease in the UPDATE; its pool may have renewed it since
+        won = db.session.execute(
+            update(Submission)
+            .where(Submission.id == submission_id, Submission.status == STATUS_RUNNING, stale)
+            .values(status=STATUS_QUEUED)
+        ).rowcount
+        if won:
+            emit_status(db.session.get(Submission, submission_id, populate_existing=True))
+            requeued += 1
+    db.session.commit()
+    return requeued
+
+
+@register_collector
+def collect_queue_metrics():
+    """Refresh the queue depth and worker gauges (runs at each /metrics scrape)."""
+    counts = dict(
+        db.session.query(Submission.status, db.func.count())
+        .filter(Submission.status.in_(ACTIVE_STATUSES))
+        .group_by(Submission.status)
+        .all()
+    )
+    for status in ACTIVE_STATUSES:
+        evaluation_queue.set(counts.get(status, 0), status=status)
+    
+    pool = current_app.extensions.get("evaluation_pool")
+    if pool is not None:
+        evaluation_workers.set(sum(p.is_alive() for p in pool.processes), state="alive")
+        evaluation_workers.set(len(pool._assigned), state="busy")
+
+
+def job_to_dict(submission):
+    """Convert a submission to its job status payload."""
+    payload = {
+        "submission_id": submission.id,
+        "job_id": submission.id,
+        "task_id": submission.task_id,
+        "status": submission.status,
+        "score": submission.score if submission.score is not None else 0,
+        "details": submission.details,
+    }
+    if submission.status == "error" and submission.details:
+        payload["error"] = submission.details.get("error")
+    return payload
+
+
+def run_job(job):
+    """
+    Evaluate one job dict as built by EvaluationWorkerPool._dispatch.
+    
+    Args:
+        job (dict): {storage_path, task_id, isolation, limits, scoring}
+    
+    Returns:
+        dict: Evaluation result tagged with the dataset and evaluator
+        versions it was scored against
+    """
+    dataset_version = get_dataset_version(job["task_id"])
+    try:
+        if job["isolation"]:
+            result = evaluate_in_child(
+                job["storage_path"], job["task_id"], scoring=job["scoring"], **job["limits"]
+            )
+        else:
+            result = evaluate_submission(job["storage_path"], job["task_id"], job["scoring"])
+    except Exception as e:
+        result = {"score": 0, "status": "error", "error": str(e)}
+    result["dataset_version"] = dataset_version
+    result["evaluator_version"] = evaluator_version(job["task_id"], job["scoring"])
+    return result
+
+
+def build_job(submission, config, scoring=None):
+    """Describe the evaluation of a submission as a picklable job dict."""
+    scoring = scoring or get_scoring_options(config)
+    return {
+        "submission_id": submission.id,
+        "storage_path": submission.storage_path,
+        "task_id": submission.task_id,
+        "isolation": config.get("EVALUATION_ISOLATION", True),
+        "limits": get_task_limits(config, submission.task_id, scoring),
+        "scoring": scoring,
+    }
+
+
+def _worker_main(job_queue, result_queue):
+    """Worker process entry point: warm up, then evaluate jobs until told to stop."""
+    # Import the scientific stack and task data once; each job forks from here
+    preload()
+    pid = os.getpid()
+    
+    while True:
+        job = job_queue.get()
+        if job is None:
+            return
+        
+        result_queue.put(("started", pid, job["submission_id"], None))
+        result_queue.put(("done", pid, job["submission_id"], run_job(job)))
+
+
+class EvaluationWorkerPool:
+    """
+    Pool of pre-started, warm processes that drain the evaluation queue.
+    
+    Each worker preloads pandas/sklearn and the task data, then forks a
+    fresh child per submission. Workers never touch the database: a
+    coordinator thread in this process claims jobs for them and writes their
+    results back in batches.
+    """
+
+    def __init__(self, app, num_workers=2, poll_interval=0.5, batch_size=32, batch_window=0.05,
+                 node_id=None, lease_seconds=120):
+        self.app = app
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.node_id = node_id or socket.gethostname()
+        self.lease_seconds = lease_seconds
+        self._next_renewal = 0
+        self.processes = []
+        # Worker pid -> its job queue, and -> the submission dispatched to it
+        self._queues = {}
+        self._assigned = {}
+        # Dispatched submissions whose worker reported "started"
+        self._started = set()
+        self._stopping = threading.Event()
+        self._coordinator = None
+        
+        # fork is cheapest where available; Windows only supports spawn
+        method = "spawn" if platform.system() == "Windows" else "fork"
+        self._ctx = multiprocessing.get_context(method)
+        self._results = self._ctx.Queue()
+
+    def start(self):
+        """Start the worker processes and the coordinator thread."""
+        for _ in range(self.num_workers):
+            self._start_worker()
+        
+        self._coordinator = threading.Thread(target=self._coordinate, name="evaluation-coordinator", daemon=True)
+        self._coordinator.start()
+
+    def stop(self, timeout=5):
+        """Stop the coordinator and terminate the worker processes."""
+        self._stopping.set()
+        if self._coordinator is not None:
+            self._coordinator.join(timeout)
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.join(timeout)
+        self.processes = []
+
+    def _start_worker(self):
+        jobs = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(jobs, self._results),
+            name=f"evaluation-worker-{len(self.processes)}",
+            daemon=True,
+        )
+        process.start()
+        self.processes.append(process)
+        self._queues[process.pid] = jobs
+
+    def _coordinate(self):
+        with self.app.app_context():
+            while not self._stopping.is_set():
+                try:
+                    results = self._dispatch()
+                    results += self._collect()
+                    if results:
+                        store_results(results)
+                    self._reap_dead_workers()
+                    self._renew()
+                except Exception:
+                    db.session.rollback()
+                    time.sleep(self.poll_interval)
+                finally:
+                    db.session.remove()
+
+    def _dispatch(self):
+        """
+        Claim as many jobs as there are idle workers and give one to each.
+        
+        Returns:
+            list: (submission_id, result) pairs answered from the result
+            cache, e.g. identical code that finished while this job waited
+        """
+        idle = [p.pid for p in self.processes if p.pid not in self._assigned]
+        if not idle:
+            return []
+        
+        config = self.app.config
+        scoring = get_scoring_options(config)
+        cached = []
+        for submission in claim_jobs(len(idle), self.node_id):
+            if submission.code_hash:
+                result = get_cached_result(
+                    submission.code_hash, submission.task_id,
+                    evaluator_version=evaluator_version(submission.task_id, scoring),
+                )
+                if result is not None:
+                    cached.append((submission.id, result))
+                    continue
+            pid = idle.pop()
+            self._assigned[pid] = submission.id
+            self._queues[pid].put(build_job(submission, config, scoring))
+        return cached
+
+    def _collect(self, wait=None):
+        """
+        Gather finished results: block up to wait (default poll_interval)
+        for the first, then keep collecting for batch_window or until the
+        batch is full.
+        """
+        results = []
+        deadline = None
+        while len(results) < self.batch_size:
+            if deadline is None:
+                timeout = self.poll_interval if wait is None else wait
+            else:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+            try:
+                kind, pid, submission_id, result = self._results.get(timeout=timeout)
+            except queue.Empty:
+                break
+            
+            if self._assigned.get(pid) != submission_id:
+                # Its worker was already reaped and the job failed or requeued
+                continue
+            if kind == "started":
+                self._started.add(submission_id)
+                continue
+            
+            del self._assigned[pid]
+            self._started.discard(submission_id)
+            results.append((submission_id, result))
+            if deadline is None:
+                deadline = time.monotonic() + self.batch_window
+        return results
+
+    def _renew(self):
+        """
+        Every quarter lease: renew the leases on this pool's jobs and requeue
+        jobs whose pool stopped renewing theirs.
+        """
+        now = time.monotonic()
+        if now < self._next_renewal:
+            return
+        self._next_renewal = now + self.lease_seconds / 4
+        renew_leases(self.node_id, self._assigned.values())
+        requeue_stale_jobs(self.lease_seconds)
+
+    def _reap_dead_workers(self):
+        """
+        Replace crashed workers. The job each one was running fails; a job
+        it was given but had not started goes back in the queue.
+        """
+        if all(process.is_alive() for process in self.processes):
+            return
+        # Read what the dead workers sent before they died
+        results = self._collect(wait=0)
+        unstarted = []
+        alive = []
+        for process in self.processes:
+            if process.is_alive():
+                alive.append(process)
+                continue
+            self._queues.pop(process.pid).close()
+            submission_id = self._assigned.pop(process.pid, None)
+            if submission_id is None:
+                continue
+            if submission_id not in self._started:
+                unstarted.append(submission_id)
+            else:
+                self._started.discard(submission_id)
+                results.append((submission_id, {
+                    "score": 0,
+                    "status": "error",
+                    "error": f"Evaluation worker crashed (exit code {process.exitcode})",
+                }))
+        
+        self.processes = alive
+        while len(self.processes) < self.num_workers:
+            self._start_worker()
+        if results:
+            store_results(results)
+        if unstarted:
+            requeue_jobs(unstarted)
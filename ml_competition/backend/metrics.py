@@ -0,0 +1,190 @@
+"""
+Metric engine for F1-Score Grand Prix
+Vectorized NumPy implementations of the competition metrics.
+
+Every function accepts a single prediction vector of shape (n,) or a batch
+of shape (b, n), scored against y_true of shape (n,) (shared by the whole
+batch, e.g. many submissions) or (b, n) (one row per prediction vector, e.g.
+equal-sized folds). Results match sklearn's r2_score, accuracy_score and
+f1_score(average="macro", zero_division=0).
+"""
+
+import numpy as np
+
+
+def _as_batch(y_true, y_pred):
+    """Return (y_true, y_pred, batched) with y_pred as a 2-D (b, n) array."""
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    batched = y_pred.ndim == 2
+    if y_pred.ndim == 1:
+        y_pred = y_pred[np.newaxis, :]
+    if y_pred.ndim != 2 or y_true.ndim not in (1, 2):
+        raise ValueError("y_pred must have shape (n,) or (b, n)")
+    if y_true.shape[-1] != y_pred.shape[-1] or (y_true.ndim == 2 and y_true.shape[0] != y_pred.shape[0]):
+        raise ValueError(
+            f"Found input variables with inconsistent numbers of samples: {y_true.shape}, {y_pred.shape}"
+        )
+    if y_pred.shape[-1] == 0:
+        raise ValueError("Cannot score an empty prediction vector")
+    return y_true, y_pred, batched
+
+
+def _unbatch(values, batched):
+    return values if batched else values[0]
+
+
+def r2(y_true, y_pred):
+    """
+    Coefficient of determination for one or many prediction vectors.
+
+    Returns:
+        float or np.ndarray: R² per prediction vector
+    """
+    y_true, y_pred, batched = _as_batch(y_true, y_pred)
+    y_true = y_true.astype(np.float64, copy=False)
+    y_pred = y_pred.astype(np.float64, copy=False)
+
+    # Row-wise dot products keep this to one (b, n) temporary
+    diff = y_pred - y_true
+    residual = np.einsum("ij,ij->i", diff, diff)
+    centered = y_true - y_true.mean(axis=-1, keepdims=True)
+    total = np.broadcast_to(np.einsum("...i,...i->...", centered, centered), residual.shape)
+    # NaN/inf anywhere in the inputs surfaces in these sums
+    if not (np.isfinite(residual).all() and np.isfinite(total).all()):
+        raise ValueError("Input contains NaN or infinity")
+
+    # Same convention as sklearn for a constant target: 1 if perfect, else 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.where(total > 0, 1.0 - residual / np.where(total > 0, total, 1.0), 0.0)
+    scores = np.where((total == 0) & (residual == 0), 1.0, scores)
+    return _unbatch(scores, batched)
+
+
+def confusion_matrices(y_true, y_pred, labels=None):
+    """
+    Confusion matrices for one or many prediction vectors in one bincount.
+
+    Args:
+        y_true: Ground truth labels, shape (n,) or (b, n)
+        y_pred: Predicted labels, shape (n,) or (b, n)
+        labels: Sorted class labels (default: union of y_true and y_pred)
+
+    Returns:
+        tuple: (matrices of shape (k, k) or (b, k, k), labels); rows are
+        true classes, columns predicted classes
+    """
+    y_true, y_pred, batched = _as_batch(y_true, y_pred)
+    codes = None if labels is not None else _integer_codes(y_true, y_pred)
+    if codes is None:
+        if labels is None:
+            labels = np.unique(np.concatenate([y_true.ravel(), y_pred.ravel()]))
+        labels = np.asarray(labels)
+        true_codes = np.searchsorted(labels, y_true)
+        pred_codes = np.searchsorted(labels, y_pred)
+    else:
+        labels, true_codes, pred_codes = codes
+    k = len(labels)
+    true_codes = np.broadcast_to(true_codes, pred_codes.shape)
+
+    batch_size = pred_codes.shape[0]
+    offsets = np.arange(batch_size)[:, np.newaxis] * (k * k)
+    flat = (offsets + true_codes * k + pred_codes).ravel()
+    matrices = np.bincount(flat, minlength=batch_size * k * k).reshape(batch_size, k, k)
+
+    if codes is not None:
+        # Drop values inside the integer range that never occur
+        seen = (matrices.sum(axis=(0, 2)) + matrices.sum(axis=(0, 1))) > 0
+        if not seen.all():
+            labels = labels[seen]
+            matrices = matrices[:, seen][:, :, seen]
+    return _unbatch(matrices, batched), labels
+
+
+# Integer labels spanning at most this many values are coded by offset, not sorted
+_MAX_DIRECT_RANGE = 1024
+
+
+def _integer_codes(y_true, y_pred):
+    """
+    Code small-range integer labels as value - min without sorting.
+
+    Returns:
+        tuple: (labels, true codes, predicted codes), or None if the labels
+        are not integers in a small range
+    """
+    if not (np.issubdtype(y_true.dtype, np.integer) and np.issubdtype(y_pred.dtype, np.integer)):
+        return None
+    low = min(y_true.min(), y_pred.min())
+    high = max(y_true.max(), y_pred.max())
+    if int(high) - int(low) >= _MAX_DIRECT_RANGE:
+        return None
+    labels = np.arange(low, high + 1, dtype=np.result_type(y_true, y_pred))
+    return labels, (y_true - low).astype(np.intp), (y_pred - low).astype(np.intp)
+
+
+def classification_scores(y_true, y_pred):
+    """
+    Accuracy, macro-F1 and the confusion matrix from a single pass.
+
+    Returns:
+        dict: {accuracy, f1_macro, confusion_matrix, labels}; scores are
+        floats for one prediction vector or arrays of length b for a batch
+    """
+    y_true, y_pred, batched = _as_batch(y_true, y_pred)
+    matrices, labels = confusion_matrices(y_true, y_pred)
+
+    tp = np.diagonal(matrices, axis1=1, axis2=2).astype(np.float64)
+    actual = matrices.sum(axis=2)
+    predicted = matrices.sum(axis=1)
+    n = y_pred.shape[-1]
+
+    # F1 = 2TP / (2TP + FP + FN), averaged over the classes present in each
+    # vector's y_true or y_pred (labels unique to other rows of a batch are skipped)
+    denominator = actual + predicted
+    present = denominator > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f1 = np.where(present, 2 * tp / np.where(present, denominator, 1), 0.0)
+
+    return {
+        "accuracy": _unbatch(tp.sum(axis=1) / n, batched),
+        "f1_macro": _unbatch(f1.sum(axis=1) / present.sum(axis=1), batched),
+        "confusion_matrix": _unbatch(matrices, batched),
+        "labels": labels,
+    }
+
+
+def accuracy(y_true, y_pred):
+    """Fraction of exact matches for one or many prediction vectors."""
+    y_true, y_pred, batched = _as_batch(y_true, y_pred)
+    return _unbatch((y_pred == y_true).mean(axis=-1), batched)
+
+
+def f1_macro(y_true, y_pred):
+    """Unweighted mean of per-class F1 for one or many prediction vectors."""
+    return classification_scores(y_true, y_pred)["f1_macro"]
+
+
+# Metric computed for each ML task
+TASK_METRICS = {
+    1: r2,
+    2: accuracy,
+    3: f1_macro,
+}
+
+
+def score_predictions(task_id, y_true, y_pred):
+    """
+    Score one or many prediction vectors with a task's metric.
+
+    Args:
+        task_id (int): Task ID (1-3)
+        y_true: Ground truth, shape (n,) or (b, n)
+        y_pred: Predictions, shape (n,) or (b, n)
+
+    Returns:
+        float or np.ndarray: Score per prediction vector
+    """
+    if task_id not in TASK_METRICS:
+        raise ValueError(f"Unknown task_id: {task_id}")
+    return TASK_METRICS[task_id](y_true, y_pred)
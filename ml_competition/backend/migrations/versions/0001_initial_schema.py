@@ -0,0 +1,142 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Creates every table and index. Databases created earlier by db.create_all()
+are adopted as-is: tables and indexes that already exist are skipped.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+UUIDString = sa.String().with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+JSONDocument = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing_tables = set(inspector.get_table_names())
+
+    def create_table(name, *columns, **kwargs):
+        if name not in existing_tables:
+            op.create_table(name, *columns, **kwargs)
+
+    def create_index(name, table, columns, **kwargs):
+        if table in existing_tables:
+            if name in {ix["name"] for ix in inspector.get_indexes(table)}:
+                return
+        op.create_index(name, table, columns, **kwargs)
+
+    create_table(
+        'users',
+        sa.Column('id', UUIDString, nullable=False),
+        sa.Column('username', sa.String(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    create_index('ix_users_username', 'users', ['username'], unique=True)
+    create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    create_table(
+        'teams',
+        sa.Column('id', UUIDString, nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('contact_email', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    create_index('ix_teams_name', 'teams', ['name'], unique=True)
+
+    create_table(
+        'submissions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', UUIDString, nullable=True),
+        sa.Column('team_id', UUIDString, nullable=True),
+        sa.Column('team_name', sa.String(), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('storage_path', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=True),
+        sa.Column('details', JSONDocument, nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    create_index('ix_submissions_task_id', 'submissions', ['task_id'])
+    create_index('ix_submissions_created_at', 'submissions', ['created_at'])
+    create_index(
+        'ix_submissions_task_rank', 'submissions',
+        ['task_id', sa.text('score DESC'), 'created_at', 'id'],
+    )
+    create_index(
+        'ix_submissions_task_status_rank', 'submissions',
+        ['task_id', 'status', sa.text('score DESC'), 'created_at', 'id'],
+    )
+    create_index('ix_submissions_status_created', 'submissions', ['status', 'created_at', 'id'])
+    create_index('ix_submissions_team_name_created', 'submissions', ['team_name', 'created_at', 'id'])
+    create_index('ix_submissions_team_task', 'submissions', ['team_id', 'task_id'])
+
+    create_table(
+        'leaderboard',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('team_key', sa.String(), nullable=False),
+        sa.Column('team_name', sa.String(), nullable=True),
+        sa.Column('submission_id', sa.String(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('submitted_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['submission_id'], ['submissions.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('task_id', 'team_key', name='uq_leaderboard_task_team'),
+    )
+    create_index('ix_leaderboard_submission_id', 'leaderboard', ['submission_id'])
+    create_index(
+        'ix_leaderboard_rank', 'leaderboard',
+        ['task_id', sa.text('score DESC'), 'submitted_at'],
+    )
+
+    create_table(
+        'change_counters',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+    create_table(
+        'events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('submission_id', sa.String(), nullable=True),
+        sa.Column('task_id', sa.Integer(), nullable=True),
+        sa.Column('payload', JSONDocument, nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True,
+    )
+    create_index('ix_events_submission_id', 'events', ['submission_id'])
+    create_index('ix_events_created_at', 'events', ['created_at'])
+
+
+def downgrade():
+    op.drop_table('events')
+    op.drop_table('change_counters')
+    op.drop_table('leaderboard')
+    op.drop_table('submissions')
+    op.drop_table('teams')
+    op.drop_table('users')
@@ -0,0 +1,50 @@
+"""Content-addressed submissions and evaluation result cache
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+JSONDocument = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade():
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.add_column(sa.Column('code_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_submissions_code_hash', ['code_hash'])
+
+    op.create_table(
+        'evaluation_results',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('code_hash', sa.String(length=64), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('dataset_version', sa.String(), nullable=False),
+        sa.Column('evaluator_version', sa.String(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('details', JSONDocument, nullable=True),
+        sa.Column('hits', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'code_hash', 'task_id', 'dataset_version', 'evaluator_version',
+            name='uq_evaluation_results_key',
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table('evaluation_results')
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_index('ix_submissions_code_hash')
+        batch_op.drop_column('code_hash')
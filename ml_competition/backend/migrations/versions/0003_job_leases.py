@@ -0,0 +1,28 @@
+"""Leases on running evaluation jobs
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.add_column(sa.Column('claimed_by', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('claimed_by')
@@ -0,0 +1,235 @@
+"""
+Monitoring for F1-Score Grand Prix
+In-process counters and histograms rendered in the Prometheus text format.
+
+Recording a sample is a dict lookup and an add under a lock, so the
+instrumentation stays on in production. Values are per process.
+"""
+
+import bisect
+import threading
+import time
+
+from flask import g, request
+
+# Latency buckets (seconds) for HTTP requests and DB queries
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# Buckets (seconds) for whole evaluations
+EVALUATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+_registry = []
+_collectors = []
+
+
+def _escape(value):
+    """Escape a label value for the text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_samples(items))
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_samples(self, items):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down; usually refreshed by a collector at scrape time."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts (+Inf last), sum, count]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_samples(self, items):
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def register_collector(func):
+    """Register func() to refresh gauges right before each scrape."""
+    _collectors.append(func)
+    return func
+
+
+def render_metrics():
+    """Run the collectors and render every metric in the Prometheus text format."""
+    for collector in _collectors:
+        try:
+            collector()
+        except Exception:
+            # A failing collector must not take the whole scrape down
+            collector_errors.inc(collector=collector.__name__)
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Metrics shared across modules
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status"),
+)
+db_query_duration = Histogram(
+    "db_query_duration_seconds", "Database statement latency by statement type.", ("operation",),
+)
+cache_requests = Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result"),
+)
+evaluations = Counter(
+    "evaluations_total", "Finished evaluations by task, status and source (run/cache).",
+    ("task_id", "status", "source"),
+)
+evaluation_duration = Histogram(
+    "evaluation_duration_seconds", "Wall time of evaluations that ran, by task and status.",
+    ("task_id", "status"), buckets=EVALUATION_BUCKETS,
+)
+evaluation_queue = Gauge(
+    "evaluation_queue_jobs", "Submissions in the evaluation queue by status.", ("status",),
+)
+evaluation_workers = Gauge(
+    "evaluation_workers", "Local evaluation worker processes by state (alive/busy).", ("state",),
+)
+collector_errors = Counter(
+    "metrics_collector_errors_total", "Collectors that failed during a scrape.", ("collector",),
+)
+
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+
+
+def _after_request(response):
+    start = g.pop("_metrics_start", None)
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        http_request_duration.observe(
+            time.perf_counter() - start,
+            method=request.method, route=route, status=response.status_code,
+        )
+    return response
+
+
+# Statement types reported as-is; anything else is counted as OTHER
+_OPERATIONS = frozenset((
+    "SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "BEGIN", "COMMIT", "ROLLBACK",
+    "SAVEPOINT", "RELEASE", "PRAGMA", "CREATE", "ALTER", "DROP",
+))
+
+
+def _operation(statement):
+    head = statement.lstrip().split(None, 1)
+    operation = head[0].upper() if head else ""
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("metrics_query_start")
+    if starts:
+        db_query_duration.observe(time.perf_counter() - starts.pop(), operation=_operation(statement))
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None:
+        starts = context.connection.info.get("metrics_query_start")
+        if starts:
+            starts.pop()
+
+
+def init_app(app, engine):
+    """Time every request of app and every statement run on engine."""
+    from sqlalchemy import event
+
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
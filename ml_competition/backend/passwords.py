@@ -0,0 +1,179 @@
+"""
+Password hashing for F1-Score Grand Prix
+Runs pbkdf2 hashing and verification in a bounded pool of worker processes.
+
+Hashing is deliberately slow CPU work; done in request threads, a burst of
+logins starves every other endpoint. Requests wait for a free worker in a
+bounded queue, and each client address may only have a few in flight.
+"""
+
+import multiprocessing
+import platform
+import threading
+
+from passlib.context import CryptContext
+
+from monitoring import Counter
+
+# passlib's default for pbkdf2_sha256
+DEFAULT_ROUNDS = 29000
+
+password_hashes = Counter(
+    "password_hash_requests_total", "Password hash/verify requests by operation and result.",
+    ("operation", "result"),
+)
+
+# Context of a pool worker process, set by _init_worker
+_context = None
+
+
+class HashingBusy(Exception):
+    """No hashing worker became free within the queue timeout."""
+
+
+class TooManyHashRequests(Exception):
+    """The client already has the maximum number of hash requests in flight."""
+
+
+def make_context(rounds=DEFAULT_ROUNDS):
+    """
+    Return a CryptContext hashing with the given pbkdf2 rounds.
+
+    Hashes made with any other round count are reported as needing an
+    update, so they are replaced on the next successful login.
+    """
+    return CryptContext(
+        schemes=["pbkdf2_sha256"],
+        deprecated="auto",
+        pbkdf2_sha256__default_rounds=rounds,
+        pbkdf2_sha256__min_rounds=rounds,
+        pbkdf2_sha256__max_rounds=rounds,
+    )
+
+
+def _init_worker(rounds):
+    global _context
+    _context = make_context(rounds)
+
+
+def _hash(password, context=None):
+    return (context or _context).hash(password)
+
+
+def _verify_and_update(password, hashed_password, context=None):
+    return (context or _context).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Hash and verify passwords in pre-started worker processes.
+
+    Args:
+        workers (int): Worker processes (0 hashes in the calling thread)
+        rounds (int): pbkdf2 rounds for new hashes
+        queue_size (int): Requests allowed to wait for a worker
+        queue_timeout (float): Seconds a request waits for a worker before
+            HashingBusy is raised
+        per_client (int): Requests one client address may have in flight
+            (queued or running) before TooManyHashRequests is raised
+            (0 disables the cap; calls without a client are never capped)
+    """
+
+    # Upper bound for one hash once it holds a queue slot
+    task_timeout = 30
+
+    def __init__(self, workers=2, rounds=DEFAULT_ROUNDS, queue_size=64, queue_timeout=10, per_client=4):
+        self.workers = workers
+        self.rounds = rounds
+        self.queue_timeout = queue_timeout
+        self.per_client = per_client
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_size)
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self._pool = None
+        self._context = make_context(rounds)
+
+    def start(self):
+        """Start the worker processes (call before serving requests)."""
+        if self.workers > 0 and self._pool is None:
+            # fork is cheapest where available; Windows only supports spawn
+            method = "spawn" if platform.system() == "Windows" else "fork"
+            ctx = multiprocessing.get_context(method)
+            self._pool = ctx.Pool(processes=self.workers, initializer=_init_worker, initargs=(self.rounds,))
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def _acquire(self, client, operation):
+        """Reserve a client slot and a queue slot for one request (undone by _release)."""
+        if self._limits(client):
+            with self._clients_lock:
+                in_flight = self._clients.get(client, 0)
+                if in_flight >= self.per_client:
+                    password_hashes.inc(operation=operation, result="client_limit")
+                    raise TooManyHashRequests(client)
+                self._clients[client] = in_flight + 1
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self._release_client(client)
+            password_hashes.inc(operation=operation, result="busy")
+            raise HashingBusy()
+
+    def _release(self, client):
+        self._slots.release()
+        self._release_client(client)
+
+    def _limits(self, client):
+        return bool(self.per_client) and client is not None
+
+    def _release_client(self, client):
+        if not self._limits(client):
+            return
+        with self._clients_lock:
+            remaining = self._clients[client] - 1
+            if remaining:
+                self._clients[client] = remaining
+            else:
+                del self._clients[client]
+
+    def _run(self, operation, func, args, client):
+        self._acquire(client, operation)
+        if self._pool is None:
+            try:
+                result = func(*args, context=self._context)
+            finally:
+                self._release(client)
+        else:
+            # The slots stay taken until a worker has finished the task, even
+            # when this request gives up waiting for it
+            def release(_):
+                self._release(client)
+            
+            try:
+                pending = self._pool.apply_async(func, args, callback=release, error_callback=release)
+            except BaseException:
+                self._release(client)
+                raise
+            try:
+                result = pending.get(timeout=self.task_timeout)
+            except multiprocessing.TimeoutError:
+                password_hashes.inc(operation=operation, result="timeout")
+                raise HashingBusy() from None
+        password_hashes.inc(operation=operation, result="done")
+        return result
+
+    def hash(self, password, client=None):
+        """Hash a new password."""
+        return self._run("hash", _hash, (password,), client)
+
+    def verify_and_update(self, password, hashed_password, client=None):
+        """
+        Check a password against its stored hash.
+
+        Returns:
+            tuple: (ok, new_hash); new_hash is set when the password is
+            correct but the stored hash uses outdated parameters
+        """
+        return self._run("verify", _verify_and_update, (password, hashed_password), client)
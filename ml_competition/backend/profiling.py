@@ -0,0 +1,101 @@
+"""
+Evaluation profiling for F1-Score Grand Prix
+Aggregates the per-submission resource profiles stored in Submission.details.
+"""
+
+import numpy as np
+
+from database.models import Submission
+from jobs import get_scoring_options, get_task_limits
+
+# Profile entries written by evaluator.evaluate_submission
+PROFILE_FIELDS = (
+    "wall_seconds",
+    "cpu_seconds",
+    "peak_rss_mb",
+    "data_load_seconds",
+    "import_seconds",
+    "train_seconds",
+    "predict_seconds",
+    "evaluate_seconds",
+    "preprocess_seconds",
+    "validate_seconds",
+)
+
+
+def summarize_profiles(profiles):
+    """
+    Summarize a list of profile dicts field by field.
+
+    Returns:
+        dict: field -> {count, mean, p50, p95, p99, max, total}; fields no
+        profile recorded are left out
+    """
+    summary = {}
+    for field in PROFILE_FIELDS:
+        values = np.array(
+            [p[field] for p in profiles if isinstance(p.get(field), (int, float))],
+            dtype=float,
+        )
+        if not len(values):
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        summary[field] = {
+            "count": int(len(values)),
+            "mean": round(float(values.mean()), 4),
+            "p50": round(float(p50), 4),
+            "p95": round(float(p95), 4),
+            "p99": round(float(p99), 4),
+            "max": round(float(values.max()), 4),
+            "total": round(float(values.sum()), 4),
+        }
+    return summary
+
+
+def get_evaluation_stats(config, task_ids=range(4), limit=1000):
+    """
+    Aggregate resource usage over each task's most recent evaluations.
+
+    Args:
+        config: Flask config mapping (for the configured sandbox limits)
+        task_ids: Tasks to include
+        limit (int): Evaluations per task to aggregate, newest first
+
+    Returns:
+        dict: task_id -> {evaluations, errors, time_limit_errors,
+        cached_or_unprofiled, limits, profile}
+    """
+    scoring = get_scoring_options(config)
+    stats = {}
+    for task_id in task_ids:
+        rows = (
+            Submission.query
+            .with_entities(Submission.status, Submission.details)
+            .filter(Submission.task_id == task_id, Submission.status.in_(("success", "error")))
+            .order_by(Submission.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+
+        profiles = []
+        errors = 0
+        time_limit_errors = 0
+        for status, details in rows:
+            details = details or {}
+            if status == "error":
+                errors += 1
+                if "time limit" in str(details.get("error", "")):
+                    time_limit_errors += 1
+            if details.get("profile"):
+                profiles.append(details["profile"])
+
+        stats[str(task_id)] = {
+            "evaluations": len(rows),
+            "errors": errors,
+            "time_limit_errors": time_limit_errors,
+            # Results served from the result cache (or killed before reporting) carry no profile
+            "cached_or_unprofiled": len(rows) - len(profiles),
+            "limits": get_task_limits(config, task_id, scoring),
+            "profile": summarize_profiles(profiles),
+        }
+    return stats
@@ -0,0 +1,219 @@
+"""
+Batch re-scoring for F1-Score Grand Prix
+Re-evaluates stored submissions on a process pool, e.g. after a dataset or metric fix.
+
+Usage (from the backend directory):
+    python rescore.py                      # every evaluated submission
+    python rescore.py --task-id 2 --task-id 3 --status success
+    python rescore.py --workers 8 --force  # ignore cached results
+
+Progress is checkpointed after every batch; running the same command again
+resumes where an interrupted run stopped.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app import app
+from database.models import Submission
+from evaluator import evaluator_version, preload
+from jobs import ACTIVE_STATUSES, build_job, get_scoring_options, run_job, store_results
+from storage import ensure_code_hash, forget_results, get_cached_result
+from utils import get_dataset_version
+
+DEFAULT_CHECKPOINT = Path(__file__).parent / "database" / "rescore.checkpoint.json"
+
+
+def select_submissions(task_ids=None, statuses=None, team_names=None, since=None):
+    """
+    Return the submissions to re-score, oldest first.
+
+    Submissions that were never evaluated ("uploaded") or that sit in the
+    live queue are skipped.
+    """
+    query = Submission.query.filter(
+        Submission.status.notin_(("uploaded",) + ACTIVE_STATUSES)
+    )
+    if task_ids:
+        query = query.filter(Submission.task_id.in_(task_ids))
+    if statuses:
+        query = query.filter(Submission.status.in_(statuses))
+    if team_names:
+        query = query.filter(Submission.team_name.in_(team_names))
+    if since:
+        query = query.filter(Submission.created_at >= since)
+    return query.order_by(Submission.created_at.asc(), Submission.id.asc()).all()
+
+
+def group_submissions(submissions):
+    """
+    Group submissions that are certain to score the same (identical code,
+    same task), so each group is evaluated once.
+
+    Returns:
+        dict: group key -> list of submissions
+    """
+    groups = {}
+    for submission in submissions:
+        try:
+            code = ensure_code_hash(submission)
+        except OSError:
+            # Missing file: evaluated alone so the error lands on this row
+            code = f"missing:{submission.id}"
+        groups.setdefault((code, submission.task_id), []).append(submission)
+    return groups
+
+
+def run_key(args, scoring, task_ids):
+    """Identify a run: a checkpoint only resumes the same filters, data and scoring."""
+    parts = {
+        "filters": [sorted(args.task_id or []), sorted(args.status or []), sorted(args.team_name or []), args.since],
+        "evaluator": {task_id: evaluator_version(task_id, scoring) for task_id in sorted(task_ids)},
+        "datasets": {task_id: get_dataset_version(task_id) for task_id in sorted(task_ids)},
+    }
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def load_checkpoint(path, key):
+    """Return the submission ids already re-scored by a previous run with this key."""
+    try:
+        checkpoint = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return set()
+    if checkpoint.get("run_key") != key:
+        print(f"Ignoring checkpoint {path}: it belongs to a different run")
+        return set()
+    return set(checkpoint.get("done", []))
+
+
+def save_checkpoint(path, key, done):
+    """Write the checkpoint atomically."""
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps({"run_key": key, "done": sorted(done)}))
+    os.replace(tmp_path, path)
+
+
+def _init_worker():
+    """Leave Ctrl-C to the parent, which stops the pool and saves progress."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _evaluate_group(item):
+    """Pool task: evaluate one representative job of a group."""
+    key, job = item
+    return key, run_job(job)
+
+
+def rescore(args):
+    """
+    Re-score the selected submissions and write the results back in batches.
+
+    Returns:
+        int: Number of submissions re-scored in this run
+    """
+    config = app.config
+    # Give each evaluation an even share of the cores, as the queue workers do
+    scoring = get_scoring_options({**config, "EVALUATION_WORKERS": args.workers})
+
+    submissions = select_submissions(args.task_id, args.status, args.team_name, args.since)
+    key = run_key(args, scoring, {s.task_id for s in submissions})
+    done = load_checkpoint(args.checkpoint, key)
+    pending = [s for s in submissions if s.id not in done]
+    groups = group_submissions(pending)
+    total = len(pending)
+    print(f"{len(submissions)} submissions selected, {len(done)} already done, "
+          f"{total} to re-score as {len(groups)} distinct evaluations")
+    if not pending:
+        return 0
+
+    batch = []
+    finished = 0
+    started = time.monotonic()
+
+    def add_results(group_key, result):
+        for submission in groups[group_key]:
+            batch.append((submission.id, dict(result)))
+
+    def flush():
+        nonlocal finished
+        if not batch:
+            return
+        store_results(batch)
+        done.update(submission_id for submission_id, _ in batch)
+        save_checkpoint(args.checkpoint, key, done)
+        finished += len(batch)
+        rate = finished / max(time.monotonic() - started, 1e-9)
+        print(f"[{finished}/{total}] written ({rate:.1f} submissions/s)")
+        batch.clear()
+
+    jobs = []
+    for group_key, members in groups.items():
+        representative = members[0]
+        version = evaluator_version(representative.task_id, scoring)
+        cached = None
+        if group_key[0].startswith("missing:"):
+            pass
+        elif args.force:
+            # Replace whatever the cache holds with the fresh result
+            forget_results(group_key[0], representative.task_id, evaluator_version=version)
+        else:
+            cached = get_cached_result(group_key[0], representative.task_id, evaluator_version=version)
+        if cached is not None:
+            add_results(group_key, cached)
+        else:
+            jobs.append((group_key, build_job(representative, config, scoring)))
+    flush()
+
+    if jobs:
+        # Load the scientific stack and data once; forked pool workers share it
+        preload()
+        ctx = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+        pool = ctx.Pool(processes=args.workers, initializer=_init_worker)
+        try:
+            for group_key, result in pool.imap_unordered(_evaluate_group, jobs):
+                add_results(group_key, result)
+                if len(batch) >= args.batch_size:
+                    flush()
+        except KeyboardInterrupt:
+            pool.terminate()
+            flush()
+            print(f"Interrupted; run the same command again to resume ({args.checkpoint})")
+            raise SystemExit(130)
+        else:
+            pool.close()
+        finally:
+            pool.join()
+    flush()
+
+    Path(args.checkpoint).unlink(missing_ok=True)
+    print(f"Re-scored {finished} submissions in {time.monotonic() - started:.1f}s")
+    return finished
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-evaluate stored submissions.")
+    parser.add_argument("--task-id", type=int, action="append", help="only this task (repeatable)")
+    parser.add_argument("--status", action="append", help="only submissions with this status (repeatable)")
+    parser.add_argument("--team-name", action="append", help="only this team (repeatable)")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="only submissions created at or after (ISO date)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="evaluation processes")
+    parser.add_argument("--batch-size", type=int, default=50, help="results written per transaction")
+    parser.add_argument("--checkpoint", default=str(DEFAULT_CHECKPOINT), help="progress file for resuming")
+    parser.add_argument("--force", action="store_true", help="re-evaluate even if a cached result exists")
+    args = parser.parse_args(argv)
+
+    with app.app_context():
+        rescore(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,24 +3,28 @@ Authentication routes for F1-Score Grand Prix
 Flask version matching FastAPI behavior
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from passlib.context import CryptContext
 
 from extensions import db
 from database.models import User
+from passwords import HashingBusy, TooManyHashRequests
 
 auth_bp = Blueprint("auth", __name__, url_prefix="/auth")
 
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
+@auth_bp.errorhandler(TooManyHashRequests)
+def _too_many_hash_requests(error):
+    response = jsonify({"detail": "Too many login attempts in progress from this address"})
+    response.headers["Retry-After"] = "1"
+    return response, 429
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
 
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+@auth_bp.errorhandler(HashingBusy)
+def _hashing_busy(error):
+    response = jsonify({"detail": "Authentication is busy, please retry shortly"})
+    response.headers["Retry-After"] = "2"
+    return response, 503
 
 
 @auth_bp.route("/register", methods=["POST"])
@@ -53,7 +57,7 @@ def register():
     db_user = User(
         username=username,
         email=email,
-        hashed_password=get_password_hash(password),
+        hashed_password=current_app.extensions["password_hasher"].hash(password, client=request.remote_addr),
     )
     db.session.add(db_user)
     db.session.commit()
@@ -84,8 +88,17 @@ def login():
         return jsonify({"detail": "Username and password are required"}), 400
     
     user = User.query.filter_by(username=username).first()
-    if not user or not verify_password(password, user.hashed_password):
+    if not user:
+        return jsonify({"detail": "Incorrect username or password"}), 401
+    
+    hasher = current_app.extensions["password_hasher"]
+    valid, new_hash = hasher.verify_and_update(password, user.hashed_password, client=request.remote_addr)
+    if not valid:
         return jsonify({"detail": "Incorrect username or password"}), 401
+    if new_hash:
+        # Hash parameters changed since this password was stored
+        user.hashed_password = new_hash
+        db.session.commit()
     
     access_token = create_access_token(identity=user.id)
     return jsonify({"access_token": access_token, "token_type": "bearer"})
@@ -0,0 +1,90 @@
+"""
+Event stream routes for F1-Score Grand Prix
+Server-Sent Events feed of submission status and leaderboard changes
+"""
+
+import queue
+
+from flask import Blueprint, Response, current_app, request
+
+from extensions import db
+from events import RESYNC, get_broadcaster, fetch_backlog, format_sse, resync_event
+
+events_bp = Blueprint("events", __name__)
+
+
+def _parse_last_event_id():
+    """Read the resume point from Last-Event-ID (or ?last_event_id=)."""
+    value = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@events_bp.route("/events", methods=["GET"])
+def stream_events():
+    """
+    Stream live changes as Server-Sent Events.
+    
+    Query parameters (all optional):
+        kind: 'submission' and/or 'leaderboard' (comma-separated)
+        task_id: only events for this task
+        submission_id: only events for this submission
+    
+    A client resuming from Last-Event-ID gets the events it missed, or a
+    single 'resync' event (always sent, whatever the filters) when there are
+    more than EVENTS_BACKLOG_LIMIT of them and it should reload instead.
+    """
+    kinds = request.args.get("kind")
+    kinds = set(kinds.split(",")) if kinds else None
+    task_id = request.args.get("task_id", type=int)
+    submission_id = request.args.get("submission_id")
+    last_event_id = _parse_last_event_id()
+    keepalive = current_app.config.get("EVENTS_KEEPALIVE_SECONDS", 15)
+    backlog_limit = current_app.config.get("EVENTS_BACKLOG_LIMIT", 500)
+
+    broadcaster = get_broadcaster()
+    subscription, cursor = broadcaster.subscribe()
+    backlog = []
+    if last_event_id is not None:
+        backlog = fetch_backlog(last_event_id, cursor, limit=backlog_limit)
+        if backlog is None:
+            backlog = [resync_event(cursor)]
+    # The stream itself never touches the database; give the connection back
+    db.session.close()
+
+    def _matches(event):
+        if event["kind"] == RESYNC:
+            return True
+        if kinds is not None and event["kind"] not in kinds:
+            return False
+        if task_id is not None and event["task_id"] != task_id:
+            return False
+        if submission_id is not None and event["submission_id"] != submission_id:
+            return False
+        return True
+
+    def _generate():
+        try:
+            yield "retry: 3000\n\n"
+            for event in backlog:
+                if _matches(event):
+                    yield format_sse(event)
+            while True:
+                try:
+                    event = subscription.queue.get(timeout=keepalive)
+                except queue.Empty:
+                    if subscription.dropped:
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                if _matches(event):
+                    yield format_sse(event)
+        finally:
+            broadcaster.unsubscribe(subscription)
+
+    response = Response(_generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
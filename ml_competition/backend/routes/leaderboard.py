@@ -3,43 +3,47 @@ Leaderboard routes for F1-Score Grand Prix
 Flask version matching FastAPI behavior
 """
 
-from flask import Blueprint, jsonify
+from flask import Blueprint
 
-from database.models import Submission
+from standings import get_top_entries, get_submission_counts, entry_to_dict
+from caching import LEADERBOARD_VERSION, get_version, cached_json_response
 
 leaderboard_bp = Blueprint("leaderboard", __name__)
 
 
-def _submission_to_dict(submission):
-    """Convert submission model to dict."""
-    return {
-        "submission_id": submission.id,
-        "task_id": submission.task_id,
-        "score": submission.score if submission.score is not None else 0,
-        "timestamp": submission.created_at.isoformat() if submission.created_at else None,
-        "status": submission.status,
-        "team_name": submission.team_name,
-        "filename": submission.filename,
-    }
-
-
 @leaderboard_bp.route("/leaderboard", methods=["GET"])
 def get_leaderboard():
-    """Return leaderboard backed by SQLite (top 20 per task)."""
-    submissions = Submission.query.all()
-
+    """
+    Return leaderboard: best submission per team, top 20 per task.
+    
+    Each entry also carries the team's submission count for that task
+    (task_submissions) and over all tasks (total_submissions).
+    """
+    version = get_version(LEADERBOARD_VERSION)
+    return cached_json_response(
+        ("leaderboard", version),
+        _build_leaderboard,
+        etag=f"leaderboard-{version}",
+    )
+
+
+def _build_leaderboard():
+    top = {task_id: get_top_entries(task_id, limit=20) for task_id in range(4)}
+    per_task, total = get_submission_counts([e for entries in top.values() for e in entries])
+    
     by_task = {}
-    for task_id in range(4):
-        task_subs = (
-            Submission.query
-            .filter(Submission.task_id == task_id, Submission.status == "success")
-            .order_by(Submission.score.desc(), Submission.created_at.asc())
-            .limit(20)
-            .all()
-        )
-        by_task[str(task_id)] = [_submission_to_dict(s) for s in task_subs]
-
-    return jsonify({
-        "submissions": [_submission_to_dict(s) for s in submissions],
+    submissions = []
+    for task_id, rows in top.items():
+        entries = []
+        for row in rows:
+            entry = entry_to_dict(row)
+            entry["task_submissions"] = per_task.get((row.team_key, task_id), 0)
+            entry["total_submissions"] = total.get(row.team_key, 0)
+            entries.append(entry)
+        by_task[str(task_id)] = entries
+        submissions.extend(entries)
+
+    return {
+        "submissions": submissions,
         "by_task": by_task,
-    })
+    }
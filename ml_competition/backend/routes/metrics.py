@@ -0,0 +1,21 @@
+"""
+Metrics routes for F1-Score Grand Prix
+Prometheus scrape endpoint
+"""
+
+from flask import Blueprint, current_app
+
+import jobs  # noqa: F401  (registers the queue collector)
+from monitoring import render_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Expose request, database, cache and evaluation metrics in the Prometheus text format."""
+    return current_app.response_class(
+        render_metrics(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+        headers={"Cache-Control": "no-store"},
+    )
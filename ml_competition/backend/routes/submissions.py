@@ -3,15 +3,25 @@ Submissions routes for F1-Score Grand Prix
 Flask version matching FastAPI behavior
 """
 
+import base64
+import json
+from datetime import datetime
 from pathlib import Path
 
 from flask import Blueprint, request, jsonify, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 
+from sqlalchemy import and_, or_
+
 from extensions import db
 from database.models import User, Team, Submission
+from standings import submission_to_dict
 from utils import generate_submission_id
-from evaluator import evaluate_submission
+from jobs import ACTIVE_STATUSES, enqueue_evaluation, job_to_dict
+from storage import store_code
+from caching import LEADERBOARD_VERSION, get_version, cached_json_response
+from profiling import get_evaluation_stats
+from events import emit_status
 
 submissions_bp = Blueprint("submissions", __name__)
 
@@ -82,17 +92,12 @@ def upload_submission(task_id):
                 "detail": f"Submission limit reached for this task (max {submission_limit}). You already submitted {existing_count} time(s)."
             }), 400
 
-    # Generate unique submission ID and save file
+    # Generate unique submission ID; the file itself is stored by content hash
     submission_id = generate_submission_id()
     safe_filename = f"task{task_id_int}_{submission_id}.py"
     
     submissions_dir = current_app.config.get("SUBMISSIONS_DIR") or Path(__file__).parent.parent / "submissions"
-    submissions_dir = Path(submissions_dir)
-    submissions_dir.mkdir(exist_ok=True)
-    submission_path = submissions_dir / safe_filename
-
-    # Save file to disk
-    file.save(submission_path)
+    code_hash, submission_path = store_code(file.read(), submissions_dir)
 
     submission = Submission(
         id=submission_id,
@@ -102,9 +107,11 @@ def upload_submission(task_id):
         task_id=task_id_int,
         filename=safe_filename,
         storage_path=str(submission_path),
+        code_hash=code_hash,
         status="uploaded",
     )
     db.session.add(submission)
+    emit_status(submission)
     db.session.commit()
 
     return jsonify({
@@ -116,9 +123,26 @@ def upload_submission(task_id):
     })
 
 
+def _resolve_submission_file(submission):
+    """Locate the stored file for a submission, falling back to the legacy naming pattern."""
+    submission_file = Path(submission.storage_path)
+    if submission_file.exists():
+        return submission_file
+    
+    submissions_dir = current_app.config.get("SUBMISSIONS_DIR") or Path(__file__).parent.parent / "submissions"
+    for file in Path(submissions_dir).glob(f"*_{submission.id}.py"):
+        return file
+    return None
+
+
 @submissions_bp.route("/evaluate/<submission_id>", methods=["POST"])
 def evaluate_submission_endpoint(submission_id):
-    """Evaluate a submitted solution and return score."""
+    """
+    Queue a submitted solution for evaluation and return a job handle.
+    
+    Answers 200 with the final result when identical code was already
+    scored against the same data, 202 while the job is pending.
+    """
     task_id = request.args.get("task_id")
     if task_id is None:
         return jsonify({"detail": "task_id query parameter is required"}), 400
@@ -132,35 +156,148 @@ def evaluate_submission_endpoint(submission_id):
     if not submission:
         return jsonify({"detail": "Submission not found"}), 404
 
-    submission_file = Path(submission.storage_path)
-    submissions_dir = current_app.config.get("SUBMISSIONS_DIR") or Path(__file__).parent.parent / "submissions"
+    submission_file = _resolve_submission_file(submission)
+    if submission_file is None:
+        return jsonify({"detail": "Submission file not found"}), 404
+    submission.storage_path = str(submission_file)
+
+    enqueue_evaluation(submission, task_id)
+
+    payload = job_to_dict(submission)
+    payload["status_url"] = f"/evaluate/{submission_id}"
+    return jsonify(payload), 202 if submission.status in ACTIVE_STATUSES else 200
+
+
+@submissions_bp.route("/evaluate/<submission_id>", methods=["GET"])
+def get_evaluation_status(submission_id):
+    """Return the evaluation job status (and score once finished)."""
+    submission = Submission.query.filter_by(id=submission_id).first()
+    if not submission:
+        return jsonify({"detail": "Submission not found"}), 404
     
-    if not submission_file.exists():
-        # fallback to legacy pattern if path missing
-        for file in Path(submissions_dir).glob(f"*_{submission_id}.py"):
-            submission_file = file
-            break
+    return jsonify(job_to_dict(submission))
+
+
+@submissions_bp.route("/evaluations/stats", methods=["GET"])
+def evaluation_stats():
+    """
+    Per-task resource usage of recent evaluations (wall/CPU time, peak
+    memory, data-load/train/predict time) for sizing workers and timeouts.
     
-    if not submission_file.exists():
-        return jsonify({"detail": "Submission file not found"}), 404
+    Query parameters (optional):
+        task_id: a single task
+        limit: evaluations per task to aggregate (default 1000, max 10000)
+    """
+    try:
+        limit = min(max(int(request.args.get("limit", 1000)), 1), 10000)
+        task_id = request.args.get("task_id")
+        task_ids = [int(task_id)] if task_id is not None else list(range(4))
+    except ValueError:
+        return jsonify({"detail": "Invalid limit or task_id"}), 400
+    
+    # Every evaluation bumps the leaderboard counter, so it versions this too
+    version = get_version(LEADERBOARD_VERSION)
+    return cached_json_response(
+        ("evaluation-stats", version, tuple(task_ids), limit),
+        lambda: {"by_task": get_evaluation_stats(current_app.config, task_ids, limit), "limit": limit},
+        etag=f"evaluation-stats-{version}-{'.'.join(map(str, task_ids))}-{limit}",
+    )
+
 
+def _encode_cursor(values):
+    """Encode a keyset position as an opaque URL-safe token."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(token):
+    """Decode a token from _encode_cursor; raises ValueError if malformed."""
+    padded = token + "=" * (-len(token) % 4)
     try:
-        result = evaluate_submission(submission_file, task_id)
-        submission.score = result.get("score", 0)
-        submission.status = result.get("status", "error")
-        submission.details = result.get("details")
-        submission.task_id = task_id
-        db.session.commit()
-        return jsonify(result)
-    except Exception as e:
-        submission.status = "error"
-        submission.score = 0
-        submission.details = {"error": str(e)}
-        db.session.commit()
-        return jsonify({
-            "submission_id": submission_id,
-            "task_id": task_id,
-            "score": 0,
-            "status": "error",
-            "error": str(e)
-        })
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _after_cursor(sort, cursor):
+    """Filter for rows strictly after the cursor in the given sort order."""
+    if sort == "score":
+        score, created_at, submission_id = cursor
+        created_at = datetime.fromisoformat(created_at)
+        # score DESC, created_at ASC, id ASC
+        return or_(
+            Submission.score < score,
+            and_(Submission.score == score, or_(
+                Submission.created_at > created_at,
+                and_(Submission.created_at == created_at, Submission.id > submission_id),
+            )),
+        )
+    created_at, submission_id = cursor
+    created_at = datetime.fromisoformat(created_at)
+    # created_at DESC, id DESC
+    return or_(
+        Submission.created_at < created_at,
+        and_(Submission.created_at == created_at, Submission.id < submission_id),
+    )
+
+
+@submissions_bp.route("/submissions", methods=["GET"])
+def list_submissions():
+    """
+    List submissions with keyset pagination.
+    
+    Query parameters (all optional):
+        task_id, team_name, status: filters
+        sort: 'score' (best first; scored rows only) or 'recent' (newest first)
+        limit: page size (default 50, max 200)
+        cursor: next_cursor from the previous page
+    """
+    sort = request.args.get("sort", "score")
+    if sort not in ("score", "recent"):
+        return jsonify({"detail": "sort must be 'score' or 'recent'"}), 400
+    
+    try:
+        limit = min(max(int(request.args.get("limit", 50)), 1), 200)
+        task_id = request.args.get("task_id")
+        task_id = int(task_id) if task_id is not None else None
+    except ValueError:
+        return jsonify({"detail": "Invalid limit or task_id"}), 400
+    
+    query = Submission.query
+    if task_id is not None:
+        query = query.filter(Submission.task_id == task_id)
+    if request.args.get("team_name"):
+        query = query.filter(Submission.team_name == request.args["team_name"])
+    if request.args.get("status"):
+        query = query.filter(Submission.status == request.args["status"])
+    
+    if sort == "score":
+        query = query.filter(Submission.score.isnot(None)).order_by(
+            Submission.score.desc(), Submission.created_at.asc(), Submission.id.asc()
+        )
+    else:
+        query = query.order_by(Submission.created_at.desc(), Submission.id.desc())
+    
+    if request.args.get("cursor"):
+        try:
+            query = query.filter(_after_cursor(sort, _decode_cursor(request.args["cursor"])))
+        except (ValueError, TypeError):
+            return jsonify({"detail": "Invalid cursor"}), 400
+    
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    page = rows[:limit]
+    
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        if sort == "score":
+            next_cursor = _encode_cursor([last.score, last.created_at.isoformat(), last.id])
+        else:
+            next_cursor = _encode_cursor([last.created_at.isoformat(), last.id])
+    
+    return jsonify({
+        "submissions": [submission_to_dict(s) for s in page],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    })
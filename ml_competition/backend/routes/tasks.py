@@ -3,28 +3,40 @@ Tasks routes for F1-Score Grand Prix
 Flask version matching FastAPI behavior
 """
 
-import math
+import hashlib
 from pathlib import Path
 
 import pandas as pd
 import numpy as np
-from flask import Blueprint, jsonify, send_file, current_app
+from flask import Blueprint, jsonify, send_file, current_app, request
 
-from utils import load_task_info
+from utils import load_task_info, load_task_data, get_data_profile, get_dataset_version
+from caching import cached_json_response, encode_json, to_json_list
+from downloads import get_compressed, negotiate_encoding
 
 tasks_bp = Blueprint("tasks", __name__)
 
+# Previews are keyed by data version, so they can live long
+PREVIEW_CACHE_TTL = 3600
+# Largest page served by /data
+MAX_PAGE_ROWS = 1000
+
 
 @tasks_bp.route("/tasks", methods=["GET"])
 def get_tasks():
     """Return list of all tasks with descriptions."""
-    tasks = load_task_info()
-    return jsonify(tasks)
+    return cached_json_response(("tasks",), load_task_info)
 
 
 @tasks_bp.route("/download/<task_id>", methods=["GET"])
 def download_training_data(task_id):
-    """Download training CSV for a given task."""
+    """
+    Download training CSV for a given task.
+
+    Served zstd- or gzip-compressed when the client accepts it, from
+    variants compressed once and cached on disk. The file is streamed, and
+    Range requests (on the selected encoding) allow resuming downloads.
+    """
     try:
         task_id_int = int(task_id)
     except ValueError:
@@ -38,13 +50,19 @@ def download_training_data(task_id):
     
     if not train_path.exists():
         return jsonify({"detail": "Training data not found"}), 404
-    
-    return send_file(
-        train_path,
+
+    encoding = negotiate_encoding(request.accept_encodings)
+    response = send_file(
+        get_compressed(train_path, encoding) if encoding else train_path,
         mimetype="text/csv",
         as_attachment=True,
-        download_name=f"task{task_id_int}_train.csv"
+        download_name=f"task{task_id_int}_train.csv",
+        conditional=True,
     )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
 
 
 @tasks_bp.route("/template/<task_id>", methods=["GET"])
@@ -64,18 +82,70 @@ def get_template(task_id):
     if not template_path.exists():
         return jsonify({"detail": "Template not found"}), 404
     
-    with open(template_path, "r") as f:
-        template_code = f.read()
+    def _build():
+        with open(template_path, "r") as f:
+            template_code = f.read()
+        return {
+            "task_id": task_id_int,
+            "code": template_code
+        }
+    
+    mtime = template_path.stat().st_mtime_ns
+    return cached_json_response(("template", task_id_int, mtime), _build)
+
+
+def _json_column(series):
+    """
+    Column values ready for encode_json.
     
-    return jsonify({
-        "task_id": task_id_int,
-        "code": template_code
-    })
+    Plain numeric columns stay NumPy arrays (encoded without a per-value
+    Python call); other columns become lists with None for missing values.
+    """
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+        return np.ascontiguousarray(series.to_numpy())
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.map(lambda v: v.isoformat(), na_action="ignore").astype(object).where(series.notna(), None).tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def build_preview(df, orient="records"):
+    """
+    Build the JSON-ready body of a data preview.
+    
+    Args:
+        df (pd.DataFrame): Rows to include
+        orient (str): 'records' (a list of row objects) or 'columns'
+            (column name -> list of values)
+    
+    Returns:
+        dict: {shape, columns, orient, data}
+    """
+    columns = [str(c) for c in df.columns]
+    values = [_json_column(df[c]) for c in df.columns]
+    if orient == "columns":
+        data = dict(zip(columns, values))
+    else:
+        values = [to_json_list(v) if isinstance(v, np.ndarray) else v for v in values]
+        data = [dict(zip(columns, row)) for row in zip(*values)]
+    return {
+        "shape": [int(len(df)), len(columns)],
+        "columns": columns,
+        "orient": orient,
+        "data": data,
+    }
 
 
 @tasks_bp.route("/sample-data/<task_id>", methods=["GET"])
 def get_sample_data(task_id):
-    """Fetch sample data preview (first 100 rows)."""
+    """
+    Fetch sample data preview (first 100 rows).
+    
+    Query parameters (optional):
+        orient: 'records' (default, one object per row) or 'columns'
+            (one array per column)
+    
+    The encoded body is cached per task, data version and orientation.
+    """
     try:
         task_id_int = int(task_id)
     except ValueError:
@@ -84,43 +154,126 @@ def get_sample_data(task_id):
     if task_id_int not in range(4):
         return jsonify({"detail": "Task not found"}), 404
     
+    orient = request.args.get("orient", "records")
+    if orient not in ("records", "columns"):
+        return jsonify({"detail": "orient must be 'records' or 'columns'"}), 400
+    
     data_dir = current_app.config.get("DATA_DIR") or Path(__file__).parent.parent / "data"
     train_path = data_dir / f"task{task_id_int}_train.csv"
     
     if not train_path.exists():
         return jsonify({"detail": "Training data not found"}), 404
     
-    # Load first 100 rows and sanitize values for JSON
-    df = pd.read_csv(train_path, nrows=100)
-    # Replace non-finite values with NaN for uniform handling
-    df = df.replace([np.inf, -np.inf], np.nan)
-
-    def _sanitize_value(v):
-        if v is None:
-            return None
-        # Map NaN to None
-        try:
-            if isinstance(v, float) and math.isnan(v):
-                return None
-        except Exception:
-            pass
-        # Convert numpy scalars to python types
-        if isinstance(v, (np.floating, np.integer)):
-            return v.item()
-        # Convert pandas timestamps
-        if isinstance(v, pd.Timestamp):
-            return v.isoformat()
-        return v
-
-    records = []
-    for row in df.head(100).to_dict(orient='records'):
-        clean_row = {k: _sanitize_value(v) for k, v in row.items()}
-        records.append(clean_row)
-
-    payload = {
-        "task_id": task_id_int,
-        "shape": [int(len(df)), int(len(df.columns))],
-        "columns": [str(c) for c in df.columns.tolist()],
-        "data": records,
-    }
-    return jsonify(payload)
+    def _build():
+        df = load_task_data(task_id_int, "train", copy=False).head(100)
+        return {"task_id": task_id_int, **build_preview(df, orient)}
+    
+    # The key changes with the data, so entries only expire to bound memory
+    version = get_dataset_version(task_id_int)
+    return cached_json_response(
+        ("sample-data", task_id_int, version, orient),
+        _build,
+        etag=f"sample-{task_id_int}-{version}-{orient}",
+        ttl=PREVIEW_CACHE_TTL,
+        encode=encode_json,
+    )
+
+
+@tasks_bp.route("/data/<task_id>", methods=["GET"])
+def browse_training_data(task_id):
+    """
+    Browse the training data page by page.
+    
+    Query parameters (optional):
+        offset: first row (default 0)
+        limit: rows per page (default 100, max MAX_PAGE_ROWS)
+        columns: comma-separated column names (default: all)
+        orient: 'records' (default) or 'columns'
+    
+    Pages are sliced from the cached, memory-mapped binary copy, so any
+    page costs the same as the first. next_offset is null on the last page.
+    """
+    try:
+        task_id_int = int(task_id)
+        offset = int(request.args.get("offset", 0))
+        limit = int(request.args.get("limit", 100))
+    except ValueError:
+        return jsonify({"detail": "Invalid task_id, offset or limit"}), 400
+    
+    if task_id_int not in range(4):
+        return jsonify({"detail": "Task not found"}), 404
+    if offset < 0 or not 1 <= limit <= MAX_PAGE_ROWS:
+        return jsonify({"detail": f"offset must be >= 0 and limit between 1 and {MAX_PAGE_ROWS}"}), 400
+    
+    orient = request.args.get("orient", "records")
+    if orient not in ("records", "columns"):
+        return jsonify({"detail": "orient must be 'records' or 'columns'"}), 400
+    
+    try:
+        df = load_task_data(task_id_int, "train", copy=False)
+    except FileNotFoundError:
+        return jsonify({"detail": "Training data not found"}), 404
+    
+    columns = [str(c) for c in df.columns]
+    if request.args.get("columns"):
+        requested = [c.strip() for c in request.args["columns"].split(",") if c.strip()]
+        unknown = [c for c in requested if c not in columns]
+        if unknown:
+            return jsonify({"detail": f"Unknown columns: {', '.join(unknown)}"}), 400
+        columns = list(dict.fromkeys(requested))
+    
+    total_rows = len(df)
+    
+    def _build():
+        page = df.iloc[offset:offset + limit][columns]
+        end = offset + len(page)
+        return {
+            "task_id": task_id_int,
+            "offset": offset,
+            "limit": limit,
+            "total_rows": total_rows,
+            "next_offset": end if end < total_rows else None,
+            **build_preview(page, orient),
+        }
+    
+    version = get_dataset_version(task_id_int)
+    selection = hashlib.sha1(",".join(columns).encode()).hexdigest()[:8]
+    return cached_json_response(
+        ("data", task_id_int, version, offset, limit, selection, orient),
+        _build,
+        etag=f"data-{task_id_int}-{version}-{offset}-{limit}-{selection}-{orient}",
+        ttl=PREVIEW_CACHE_TTL,
+        encode=encode_json,
+    )
+
+
+@tasks_bp.route("/profile/<task_id>", methods=["GET"])
+def get_data_profile_endpoint(task_id):
+    """
+    Per-column profile of the training data: dtype, null count, min/max/
+    mean/std, quantiles and histogram for numeric columns, distinct count
+    and top categories for the others.
+    
+    Computed once per dataset version, so EDA does not need the full download.
+    """
+    try:
+        task_id_int = int(task_id)
+    except ValueError:
+        return jsonify({"detail": "Invalid task_id"}), 400
+    
+    if task_id_int not in range(4):
+        return jsonify({"detail": "Task not found"}), 404
+    
+    try:
+        version = get_dataset_version(task_id_int)
+        profile = get_data_profile(task_id_int)
+    except FileNotFoundError:
+        return jsonify({"detail": "Training data not found"}), 404
+    
+    return cached_json_response(
+        ("profile", task_id_int, version),
+        lambda: {"task_id": task_id_int, "split": "train", **profile},
+        etag=f"profile-{task_id_int}-{version}",
+        ttl=PREVIEW_CACHE_TTL,
+        encode=encode_json,
+    )
@@ -0,0 +1,249 @@
+"""
+Leaderboard maintenance for F1-Score Grand Prix
+Keeps the leaderboard table (best score per team per task) in step with evaluations.
+"""
+
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from database.models import Submission, LeaderboardEntry
+from caching import LEADERBOARD_VERSION, bump_version
+from events import emit_leaderboard
+
+
+def team_key(submission):
+    """Return the leaderboard key for a submission's team (the submission itself if it has none)."""
+    return submission.team_id or f"submission:{submission.id}"
+
+
+def record_evaluation(submission):
+    """
+    Fold a just-evaluated submission into the leaderboard.
+    
+    Runs in the caller's transaction; the caller commits. Only the affected
+    (task, team) rows are touched, so the cost does not grow with the number
+    of submissions. Bumps the leaderboard version so cached responses and
+    client ETags go stale, and emits a leaderboard event for every entry
+    that changed.
+    
+    Args:
+        submission (Submission): Submission with its new status and score set
+    """
+    bump_version(LEADERBOARD_VERSION)
+    
+    key = team_key(submission)
+    # A re-evaluation under a different task must not leave the old entry behind
+    moved = LeaderboardEntry.query.filter(
+        LeaderboardEntry.submission_id == submission.id,
+        LeaderboardEntry.task_id != submission.task_id,
+    ).all()
+    affected = [(entry.task_id, entry.team_key) for entry in moved] + [(submission.task_id, key)]
+    before = {k: _entry_state(_get_entry(*k)) for k in affected}
+    
+    for entry in moved:
+        _refresh_entry(entry.task_id, entry.team_key)
+    _apply_evaluation(submission, key)
+    
+    for task_id, k in affected:
+        entry = _get_entry(task_id, k)
+        if _entry_state(entry) != before[(task_id, k)]:
+            emit_leaderboard(
+                task_id,
+                entry.team_name if entry else submission.team_name,
+                entry_to_dict(entry) if entry else None,
+            )
+
+
+def _apply_evaluation(submission, key):
+    """Update the submission's own (task, team) entry."""
+    entry = _get_entry(submission.task_id, key)
+    
+    if entry is not None and entry.submission_id == submission.id:
+        # The team's current best was re-evaluated; its score may have dropped
+        _refresh_entry(submission.task_id, key)
+        return
+    
+    if submission.status != "success" or submission.score is None:
+        return
+    
+    if entry is None:
+        try:
+            with db.session.begin_nested():
+                db.session.add(_new_entry(submission, key))
+            return
+        except IntegrityError:
+            # Another worker created the row first; fall through and compare
+            entry = _get_entry(submission.task_id, key)
+    
+    if _ranks_above(submission, entry):
+        _copy_submission(entry, submission)
+
+
+def get_top_entries(task_id, limit=20):
+    """
+    Return the best entries for a task.
+    
+    Args:
+        task_id (int): Task ID (0-3)
+        limit (int): Number of entries
+    
+    Returns:
+        list: LeaderboardEntry rows, best first
+    """
+    return (
+        LeaderboardEntry.query
+        .filter(LeaderboardEntry.task_id == task_id)
+        .order_by(LeaderboardEntry.score.desc(), LeaderboardEntry.submitted_at.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def get_submission_counts(entries):
+    """
+    Count the submissions behind leaderboard entries, whatever their status.
+    
+    Args:
+        entries (list): LeaderboardEntry rows
+    
+    Returns:
+        tuple: ({(team_key, task_id): count}, {team_key: count}) - per task
+        and across all tasks. A submission without a team counts only itself.
+    """
+    team_ids = {e.team_key for e in entries if not e.team_key.startswith("submission:")}
+    per_task, total = {}, {}
+    if team_ids:
+        rows = (
+            db.session.query(Submission.team_id, Submission.task_id, db.func.count(Submission.id))
+            .filter(Submission.team_id.in_(team_ids))
+            .group_by(Submission.team_id, Submission.task_id)
+        )
+        for team_id, task_id, count in rows:
+            key = str(team_id)
+            per_task[(key, task_id)] = count
+            total[key] = total.get(key, 0) + count
+    for entry in entries:
+        if entry.team_key.startswith("submission:"):
+            per_task[(entry.team_key, entry.task_id)] = 1
+            total[entry.team_key] = 1
+    return per_task, total
+
+
+def rebuild_leaderboard():
+    """
+    Recompute the whole leaderboard from the submissions table.
+    
+    Used to backfill existing databases; normal operation is incremental.
+    
+    Returns:
+        int: Number of leaderboard entries written
+    """
+    LeaderboardEntry.query.delete()
+    
+    best = {}
+    successes = (
+        Submission.query
+        .filter(Submission.status == "success", Submission.score.isnot(None))
+        .order_by(Submission.score.desc(), Submission.created_at.asc())
+    )
+    for submission in successes:
+        key = (submission.task_id, team_key(submission))
+        if key not in best:
+            best[key] = _new_entry(submission, key[1])
+    
+    db.session.add_all(best.values())
+    bump_version(LEADERBOARD_VERSION)
+    db.session.commit()
+    return len(best)
+
+
+def backfill_leaderboard():
+    """Build the leaderboard once for databases created before it existed."""
+    if LeaderboardEntry.query.first() is not None:
+        return 0
+    if Submission.query.filter(Submission.status == "success").first() is None:
+        return 0
+    return rebuild_leaderboard()
+
+
+def submission_to_dict(submission):
+    """Convert submission model to dict."""
+    return {
+        "submission_id": submission.id,
+        "task_id": submission.task_id,
+        "score": submission.score if submission.score is not None else 0,
+        "timestamp": submission.created_at.isoformat() if submission.created_at else None,
+        "status": submission.status,
+        "team_name": submission.team_name,
+        "filename": submission.filename,
+    }
+
+
+def entry_to_dict(entry):
+    """Convert a leaderboard entry to the leaderboard submission dict."""
+    return {
+        "submission_id": entry.submission_id,
+        "task_id": entry.task_id,
+        "score": entry.score,
+        "timestamp": entry.submitted_at.isoformat() if entry.submitted_at else None,
+        "status": "success",
+        "team_name": entry.team_name,
+        "filename": entry.filename,
+    }
+
+
+def _get_entry(task_id, key):
+    return LeaderboardEntry.query.filter_by(task_id=task_id, team_key=key).first()
+
+
+def _entry_state(entry):
+    """Comparable snapshot of an entry (None if absent)."""
+    if entry is None:
+        return None
+    return (entry.submission_id, entry.score, entry.submitted_at)
+
+
+def _new_entry(submission, key):
+    entry = LeaderboardEntry(task_id=submission.task_id, team_key=key)
+    _copy_submission(entry, submission)
+    return entry
+
+
+def _copy_submission(entry, submission):
+    entry.team_name = submission.team_name
+    entry.submission_id = submission.id
+    entry.filename = submission.filename
+    entry.score = submission.score
+    entry.submitted_at = submission.created_at
+
+
+def _ranks_above(submission, entry):
+    """Leaderboard order: higher score first, earlier submission breaks ties."""
+    if submission.score != entry.score:
+        return submission.score > entry.score
+    if submission.created_at is None or entry.submitted_at is None:
+        return False
+    return submission.created_at < entry.submitted_at
+
+
+def _refresh_entry(task_id, key):
+    """Recompute one (task, team) entry from that team's submissions."""
+    query = Submission.query.filter(
+        Submission.task_id == task_id,
+        Submission.status == "success",
+        Submission.score.isnot(None),
+    )
+    if key.startswith("submission:"):
+        query = query.filter(Submission.id == key.split(":", 1)[1])
+    else:
+        query = query.filter(Submission.team_id == key)
+    best = query.order_by(Submission.score.desc(), Submission.created_at.asc()).first()
+    
+    entry = _get_entry(task_id, key)
+    if best is None:
+        if entry is not None:
+            db.session.delete(entry)
+    elif entry is None:
+        db.session.add(_new_entry(best, key))
+    else:
+        _copy_submission(entry, best)
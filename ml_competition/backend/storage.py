@@ -0,0 +1,140 @@
+"""
+Submission storage for F1-Score Grand Prix
+Content-addressed submission files and the evaluation result cache.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from database.models import EvaluationResult
+from evaluator import EVALUATOR_VERSION
+from monitoring import cache_requests
+from utils import get_dataset_version
+
+# Blobs live under SUBMISSIONS_DIR/objects/<first two hex digits>/<sha256>.py
+OBJECTS_DIR = "objects"
+
+
+def hash_code(data):
+    """Return the SHA-256 hex digest of a submission's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def store_code(data, submissions_dir):
+    """
+    Store submission bytes by content hash; identical uploads share one file.
+
+    Args:
+        data (bytes): Uploaded file contents
+        submissions_dir (Path): Root submissions directory
+
+    Returns:
+        tuple: (code_hash, path of the stored file)
+    """
+    code_hash = hash_code(data)
+    directory = Path(submissions_dir) / OBJECTS_DIR / code_hash[:2]
+    path = directory / f"{code_hash}.py"
+    if path.exists():
+        return code_hash, path
+
+    directory.mkdir(parents=True, exist_ok=True)
+    # Write then rename so a concurrent reader never sees a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return code_hash, path
+
+
+def ensure_code_hash(submission):
+    """Fill in code_hash for submissions stored before content addressing."""
+    if submission.code_hash is None:
+        submission.code_hash = hash_code(Path(submission.storage_path).read_bytes())
+    return submission.code_hash
+
+
+def get_cached_result(code_hash, task_id, dataset_version=None, evaluator_version=EVALUATOR_VERSION):
+    """
+    Look up a previous successful evaluation of identical code.
+
+    Args:
+        code_hash (str): SHA-256 of the submission file
+        task_id (int): Task ID (0-3)
+        dataset_version (str): Defaults to the task's current data version
+        evaluator_version (str): Version of the scoring configuration
+
+    Returns:
+        dict: Evaluation result with "cached": True, or None on a miss
+    """
+    if dataset_version is None:
+        dataset_version = get_dataset_version(task_id)
+
+    entry = EvaluationResult.query.filter_by(
+        code_hash=code_hash,
+        task_id=task_id,
+        dataset_version=dataset_version,
+        evaluator_version=evaluator_version,
+    ).first()
+    if entry is None:
+        cache_requests.inc(cache="evaluation_result", result="miss")
+        return None
+
+    cache_requests.inc(cache="evaluation_result", result="hit")
+    entry.hits += 1
+    return {
+        "score": entry.score,
+        "status": "success",
+        "details": entry.details,
+        "cached": True,
+    }
+
+
+def cache_result(code_hash, task_id, dataset_version, evaluator_version, result):
+    """
+    Remember a successful evaluation (caller commits).
+
+    Errors are not cached: timeouts and resource limits depend on the host,
+    not only on the code.
+    """
+    if result.get("status") != "success" or result.get("cached"):
+        return
+
+    exists = EvaluationResult.query.filter_by(
+        code_hash=code_hash,
+        task_id=task_id,
+        dataset_version=dataset_version,
+        evaluator_version=evaluator_version,
+    ).first()
+    if exists is not None:
+        return
+
+    try:
+        with db.session.begin_nested():
+            db.session.add(EvaluationResult(
+                code_hash=code_hash,
+                task_id=task_id,
+                dataset_version=dataset_version,
+                evaluator_version=evaluator_version,
+                score=result.get("score", 0),
+                details=result.get("details"),
+            ))
+    except IntegrityError:
+        # Stored concurrently by another process; keep theirs
+        pass
+
+
+def forget_results(code_hash, task_id, evaluator_version=EVALUATOR_VERSION):
+    """Drop cached results for code on a task, for every dataset version (caller commits)."""
+    EvaluationResult.query.filter_by(
+        code_hash=code_hash, task_id=task_id, evaluator_version=evaluator_version,
+    ).delete(synchronize_session=False)
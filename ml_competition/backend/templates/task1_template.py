@@ -27,7 +27,7 @@ def train_model(X_train, y_train):
     Train a regression model.
     
     Args:
-        X_train: Training features
+        X_train: Training features (read-only; copy before modifying in place)
         y_train: Training target values
     
     Returns:
@@ -27,7 +27,7 @@ def train_model(X_train, y_train):
     Train a multi-class classification model.
     
     Args:
-        X_train: Training features
+        X_train: Training features (read-only; copy before modifying in place)
         y_train: Training multi-class labels (0, 1, 2, ...)
     
     Returns:
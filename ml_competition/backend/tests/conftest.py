@@ -0,0 +1,22 @@
+"""Shared fixtures: an app on a throwaway SQLite database."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import create_app  # noqa: E402
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{(tmp_path / 'db.sqlite3').as_posix()}"
+        SUBMISSIONS_DIR = tmp_path / "submissions"
+        DB_AUTO_UPGRADE = True
+        METRICS_ENABLED = False
+
+    return create_app(TestConfig)
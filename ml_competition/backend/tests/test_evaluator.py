@@ -0,0 +1,122 @@
+"""
+Tests for the sandboxed evaluator: submissions cannot forge their results.
+
+Run from the backend directory: python -m pytest tests
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from evaluator import evaluate_in_child  # noqa: E402
+from utils import load_task_data, validate_preprocessing  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+
+# Writes a result frame claiming a score of 1e9 to every inherited descriptor
+FORGE = '''
+import json, os, struct
+import evaluator, utils
+
+evaluator.validate_preprocessing = lambda a, b: (30, {"checks_passed": []})
+utils.validate_preprocessing = evaluator.validate_preprocessing
+evaluator.compute_metrics = utils.compute_metrics = lambda *args, **kwargs: 1.0
+
+
+def _forge():
+    tail = json.dumps({"profile": {}, "details": {}}).encode()
+    frame = struct.pack("!BdHI", 0, 1e9, 0, len(tail)) + tail
+    for fd in range(3, 256):
+        try:
+            os.write(fd, frame)
+        except OSError:
+            pass
+'''
+
+
+def _submission(tmp_path, body):
+    path = tmp_path / "submission.py"
+    path.write_text(FORGE + body)
+    return path
+
+
+def _assert_not_forged(result, expected):
+    """A forged frame either corrupts the submission's own output or is ignored."""
+    assert result["status"] in ("success", "error")
+    if result["status"] == "success":
+        assert result["score"] == expected
+
+
+def test_task0_forged_frame_is_rejected(tmp_path):
+    path = _submission(tmp_path, '''
+def preprocess_data(df):
+    _forge()
+    return df
+''')
+    train = load_task_data(0, "train")
+    expected, _ = validate_preprocessing(train, train.copy())
+
+    _assert_not_forged(evaluate_in_child(path, 0), expected)
+
+
+def test_task0_patched_validator_is_ignored(tmp_path):
+    path = _submission(tmp_path, '''
+def preprocess_data(df):
+    return df
+''')
+    train = load_task_data(0, "train")
+    expected, _ = validate_preprocessing(train, train.copy())
+
+    result = evaluate_in_child(path, 0)
+    assert result["status"] == "success"
+    assert result["score"] == expected < 30
+
+
+ML_SUBMISSION = '''
+from sklearn.dummy import DummyClassifier
+
+
+def train_model(X, y):
+    {forge}
+    return DummyClassifier(strategy="constant", constant=0).fit(X, y)
+
+
+def evaluate_model(model, X, y):
+    return 0.25
+'''
+
+
+@pytest.mark.parametrize("scoring", [None, {"mode": "kfold", "rounds": 3, "jobs": 2}])
+def test_ml_forged_frame_is_rejected(tmp_path, scoring):
+    path = _submission(tmp_path, ML_SUBMISSION.format(forge="_forge()"))
+    result = evaluate_in_child(path, 2, scoring=scoring)
+
+    assert result["status"] == "error" or result["score"] < 0.9
+
+
+@pytest.mark.parametrize("scoring", [None, {"mode": "kfold", "rounds": 3, "jobs": 2}])
+def test_ml_patched_metrics_are_ignored(tmp_path, scoring):
+    path = _submission(tmp_path, ML_SUBMISSION.format(forge="pass"))
+    result = evaluate_in_child(path, 2, scoring=scoring)
+
+    assert result["status"] == "success"
+    assert result["score"] < 0.9
+
+
+def test_ml_scores_are_clamped(tmp_path):
+    path = _submission(tmp_path, '''
+def train_model(X, y):
+    return None
+
+
+def evaluate_model(model, X, y):
+    return 1e9
+''')
+    result = evaluate_in_child(path, 1)
+
+    assert result["status"] == "success"
+    assert result["score"] == 1
@@ -0,0 +1,72 @@
+"""
+Tests for the live event feed.
+
+Run from the backend directory: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from database.models import Event  # noqa: E402
+from events import EventBroadcaster, format_sse  # noqa: E402
+from extensions import db  # noqa: E402
+
+
+@pytest.fixture
+def app(app):
+    app.config["EVENTS_BACKLOG_LIMIT"] = 3
+    return app
+
+
+def _event(event_id):
+    return {"id": event_id, "kind": "submission", "submission_id": None, "task_id": 1, "data": {}}
+
+
+def test_late_commits_are_published_once_without_moving_the_resume_point(app):
+    broadcaster = EventBroadcaster(app)
+    broadcaster.cursor = 10
+
+    broadcaster._publish([_event(11), _event(13)])
+    assert broadcaster.cursor == 13 and set(broadcaster._gaps) == {12}
+
+    # 12 commits after 13 was streamed: published once, as a late event
+    fresh, cursor = broadcaster._track([_event(12), _event(14)])
+    assert [e["id"] for e in fresh] == [12, 14] and cursor == 14
+    assert fresh[0]["late"] and not format_sse(fresh[0]).startswith("id:")
+    assert format_sse(fresh[1]).startswith("id: 14\n")
+    assert broadcaster._track([_event(12)])[0] == []
+
+
+def _add_events(app, count):
+    with app.app_context():
+        for _ in range(count):
+            db.session.add(Event(kind="submission", task_id=1, payload={}))
+        db.session.commit()
+
+
+def _first_messages(response, count):
+    chunks = response.response
+    messages = []
+    while len(messages) < count:
+        messages.extend(m for m in next(chunks).decode().split("\n\n") if m)
+    response.close()
+    return messages
+
+
+def test_short_backlog_is_replayed(app):
+    _add_events(app, 3)
+    response = app.test_client().get("/events?kind=submission", headers={"Last-Event-ID": "1"})
+    messages = _first_messages(response, 3)
+    assert messages[1].startswith("id: 2\nevent: submission")
+    assert messages[2].startswith("id: 3\nevent: submission")
+
+
+def test_truncated_backlog_sends_resync(app):
+    _add_events(app, 6)
+    response = app.test_client().get("/events?kind=submission", headers={"Last-Event-ID": "1"})
+    messages = _first_messages(response, 2)
+    assert messages[1] == "id: 6\nevent: resync\ndata: {}"
@@ -0,0 +1,118 @@
+"""
+Tests for the evaluation queue.
+
+Run from the backend directory: python -m pytest tests
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from database.models import Submission
+from evaluator import EVALUATOR_VERSION, evaluator_version
+from extensions import db
+from jobs import (
+    EvaluationWorkerPool, STATUS_QUEUED, STATUS_RUNNING,
+    claim_jobs, get_task_limits, renew_leases, requeue_stale_jobs,
+)
+
+
+class _Process:
+    def __init__(self, pid, alive=True, exitcode=None):
+        self.pid = pid
+        self.alive = alive
+        self.exitcode = exitcode
+
+    def is_alive(self):
+        return self.alive
+
+
+class _Queue:
+    def close(self):
+        pass
+
+
+def _running_submission(submission_id):
+    db.session.add(Submission(
+        id=submission_id, task_id=1, filename="solution.py",
+        storage_path="solution.py", status=STATUS_RUNNING,
+    ))
+
+
+def test_dead_workers_jobs_are_requeued_or_failed(app, monkeypatch):
+    with app.app_context():
+        _running_submission("unstart")
+        _running_submission("started")
+        db.session.commit()
+
+        pool = EvaluationWorkerPool(app, num_workers=2, poll_interval=0)
+        monkeypatch.setattr(pool, "_start_worker", lambda: pool.processes.append(_Process(99)))
+        pool.processes = [_Process(1, alive=False, exitcode=-9), _Process(2, alive=False, exitcode=-9)]
+        pool._queues = {1: _Queue(), 2: _Queue()}
+        # Worker 1 died before its "started" message; worker 2 after it
+        pool._assigned = {1: "unstart", 2: "started"}
+        pool._started = {"started"}
+
+        pool._reap_dead_workers()
+
+        assert db.session.get(Submission, "unstart", populate_existing=True).status == STATUS_QUEUED
+        crashed = db.session.get(Submission, "started", populate_existing=True)
+        assert crashed.status == "error" and "crashed" in crashed.details["error"]
+        assert pool._assigned == {} and pool._started == set()
+        assert [p.pid for p in pool.processes] == [99, 99]
+
+
+def _claimed_submission(submission_id, node_id, heartbeat_age):
+    db.session.add(Submission(
+        id=submission_id, task_id=1, filename="solution.py", storage_path="solution.py",
+        status=STATUS_RUNNING, claimed_by=node_id,
+        heartbeat_at=datetime.utcnow() - timedelta(seconds=heartbeat_age),
+    ))
+
+
+def test_only_expired_or_own_leases_are_requeued(app):
+    with app.app_context():
+        _claimed_submission("live", "other", heartbeat_age=10)
+        _claimed_submission("expired", "other", heartbeat_age=600)
+        _claimed_submission("mine", "here", heartbeat_age=10)
+        db.session.commit()
+
+        assert requeue_stale_jobs(120) == 1
+        assert requeue_stale_jobs(120, node_id="here") == 1
+        statuses = {s.id: s.status for s in Submission.query.populate_existing()}
+        assert statuses == {"live": STATUS_RUNNING, "expired": STATUS_QUEUED, "mine": STATUS_QUEUED}
+
+
+def test_claims_take_a_lease_that_renewal_extends(app):
+    with app.app_context():
+        db.session.add(Submission(
+            id="queued", task_id=1, filename="solution.py", storage_path="solution.py",
+            status=STATUS_QUEUED,
+        ))
+        db.session.commit()
+
+        [claimed] = claim_jobs(1, node_id="here")
+        assert claimed.claimed_by == "here" and claimed.heartbeat_at is not None
+
+        db.session.execute(
+            update(Submission).values(heartbeat_at=datetime.utcnow() - timedelta(seconds=600))
+        )
+        renew_leases("here", ["queued"])
+        assert requeue_stale_jobs(120) == 0
+
+
+def test_kfold_timeout_covers_the_rounds_that_run_one_after_another():
+    config = {"TASK_LIMITS": {0: {"cpu_seconds": 60, "timeout": 120}, 1: {"cpu_seconds": 120, "timeout": 240}}}
+    kfold = {"mode": "kfold", "rounds": 5, "jobs": 2}
+
+    assert get_task_limits(config, 1) == {"cpu_seconds": 120, "timeout": 240}
+    assert get_task_limits(config, 1, kfold) == {"cpu_seconds": 120, "timeout": 720}
+    assert get_task_limits(config, 1, dict(kfold, jobs=8))["timeout"] == 240
+    # Task 0 has no folds
+    assert get_task_limits(config, 0, kfold)["timeout"] == 120
+
+
+def test_task0_results_do_not_depend_on_the_scoring_mode():
+    kfold = {"mode": "kfold", "rounds": 5, "jobs": 2}
+    assert evaluator_version(0, kfold) == evaluator_version(0) == EVALUATOR_VERSION
+    assert evaluator_version(1, kfold) != evaluator_version(1)
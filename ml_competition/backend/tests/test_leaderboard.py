@@ -0,0 +1,46 @@
+"""
+Tests for the leaderboard response.
+
+Run from the backend directory: python -m pytest tests
+"""
+
+from database.models import Submission, Team
+from extensions import db
+from standings import rebuild_leaderboard
+
+
+def _submit(team, task_id, score, status="success"):
+    db.session.add(Submission(
+        team_id=team.id if team else None,
+        team_name=team.name if team else None,
+        task_id=task_id,
+        filename="solution.py",
+        storage_path="solution.py",
+        status=status,
+        score=score,
+    ))
+
+
+def test_entries_carry_the_teams_submission_counts(app):
+    with app.app_context():
+        red, blue = Team(name="red"), Team(name="blue")
+        db.session.add_all([red, blue])
+        db.session.flush()
+        _submit(red, 1, 0.5)
+        _submit(red, 1, 0.7)
+        _submit(red, 1, None, status="failed")
+        _submit(red, 2, 0.4)
+        _submit(blue, 1, 0.6)
+        _submit(None, 1, 0.3)
+        db.session.commit()
+        rebuild_leaderboard()
+
+    by_task = app.test_client().get("/leaderboard").get_json()["by_task"]
+    counts = {(e["team_name"], e["task_id"]): (e["task_submissions"], e["total_submissions"])
+              for e in by_task["1"] + by_task["2"]}
+    assert counts == {
+        ("red", 1): (3, 4),
+        ("red", 2): (1, 4),
+        ("blue", 1): (1, 1),
+        (None, 1): (1, 1),
+    }
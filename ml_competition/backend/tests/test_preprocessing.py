@@ -0,0 +1,75 @@
+"""
+Tests for the chunked Task 0 validator against the original whole-frame checks.
+
+Run from the backend directory: python -m pytest tests
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from evaluator import evaluate_in_child  # noqa: E402
+from utils import load_task_data, validate_preprocessing  # noqa: E402
+
+
+def baseline_score(df_processed):
+    """The whole-frame checks validate_preprocessing replaced."""
+    score = 30
+    if df_processed.isnull().sum().sum() > 0:
+        score -= 10
+    if df_processed.select_dtypes(exclude=[np.number]).shape[1] > 0:
+        score -= 10
+    numeric_df = df_processed.select_dtypes(include=[np.number])
+    if not (all(abs(numeric_df.mean()) < 0.5) and all(numeric_df.std() < 2)):
+        score -= 5
+    return max(0, score)
+
+
+def _frames():
+    rng = np.random.default_rng(0)
+    standard = rng.standard_normal((1000, 2))
+    yield pd.DataFrame(standard, columns=["a", "a"])
+    yield pd.DataFrame({"a": standard[:, 0], "b": standard[:, 1] * 10}).rename(columns={"b": "a"})
+    with_nulls = pd.DataFrame({"a": standard[:, 0], "b": standard[:, 1]})
+    with_nulls.loc[::7, "b"] = np.nan
+    yield with_nulls.rename(columns={"b": "a"})
+    yield pd.concat([pd.DataFrame({"a": standard[:, 0]}), pd.DataFrame({"a": ["x"] * 1000})], axis=1)
+    # Different labels that print the same
+    yield pd.DataFrame({1: standard[:, 0], "1": standard[:, 1] * 10})
+
+
+@pytest.mark.parametrize("frame", list(_frames()))
+def test_duplicate_columns_score_like_the_baseline(frame):
+    expected = baseline_score(frame)
+    for chunk_rows in (1000, 64):
+        score, details = validate_preprocessing(None, frame, chunk_rows=chunk_rows)
+        assert score == expected
+        assert len(details["columns"]) == frame.shape[1]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_submission_returning_duplicate_columns_is_scored(tmp_path):
+    path = tmp_path / "submission.py"
+    path.write_text('''
+import pandas as pd
+
+
+def preprocess_data(df):
+    numeric = df.select_dtypes("number").fillna(0)
+    numeric = (numeric - numeric.mean()) / numeric.std().replace(0, 1)
+    return pd.concat([numeric, numeric.iloc[:, :1] * 10], axis=1)
+''')
+    train = load_task_data(0, "train")
+    numeric = train.select_dtypes("number").fillna(0)
+    numeric = (numeric - numeric.mean()) / numeric.std().replace(0, 1)
+    expected = baseline_score(pd.concat([numeric, numeric.iloc[:, :1] * 10], axis=1))
+
+    result = evaluate_in_child(path, 0, memory_mb=2000, cpu_seconds=60)
+    assert result["status"] == "success", result.get("error")
+    assert result["score"] == expected == 25
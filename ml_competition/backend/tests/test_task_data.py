@@ -0,0 +1,62 @@
+"""
+Tests for the per-process task data cache.
+
+Run from the backend directory: python -m pytest tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import load_task_split  # noqa: E402
+
+
+def test_in_place_writes_to_features_raise():
+    X_train, y_train, _, _ = load_task_split(1)
+    original = X_train.iloc[0, 0]
+
+    with pytest.raises(ValueError):
+        X_train.iloc[0, 0] = original + 1.0
+    with pytest.raises(ValueError):
+        y_train.iloc[0] = 0
+
+    assert load_task_split(1)[0].iloc[0, 0] == original
+
+
+def test_frame_changes_do_not_reach_the_cache():
+    X_train, y_train, _, _ = load_task_split(1)
+    columns = list(X_train.columns)
+
+    X_train[columns[0]] = 0.0
+    X_train.drop(columns=columns[1], inplace=True)
+    y_train.name = "renamed"
+
+    X_again, y_again, _, _ = load_task_split(1)
+    assert list(X_again.columns) == columns
+    assert (X_again[columns[0]] != 0.0).any()
+    assert y_again.name == "target"
+
+
+def test_missing_binary_copy_is_built_and_memory_mapped(tmp_path, monkeypatch):
+    import shutil
+
+    import numpy as np
+    import pandas as pd
+
+    import utils
+
+    for split in ("train", "test"):
+        shutil.copy(utils.DATA_DIR / f"task1_{split}.csv", tmp_path)
+    monkeypatch.setattr(utils, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(utils, "_dataset_cache", {})
+
+    df = utils.load_task_data(1, "train", copy=False)
+
+    assert (tmp_path / "task1_train.cols" / utils.BINARY_MANIFEST).exists()
+    assert utils._data_source(1, "train")[0] == "binary"
+    assert all(isinstance(df[c].to_numpy().base, np.memmap) for c in df.columns)
+    pd.testing.assert_frame_equal(df, pd.read_csv(tmp_path / "task1_train.csv"))
+    assert not list(tmp_path.glob("*.tmp-*"))
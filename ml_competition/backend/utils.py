@@ -5,18 +5,33 @@ Utility functions for F1-Score Grand Prix
 import subprocess
 import os
 import uuid
+import json
+import hashlib
+import threading
+import time
 import pandas as pd
 import numpy as np
 import platform
+import shutil
 from pathlib import Path
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 
+from metrics import score_predictions
+from monitoring import cache_requests
+
 # ✅ Conditionally import 'resource' (Unix only)
 if platform.system() != "Windows":
     import resource
 else:
     resource = None
 
+DATA_DIR = Path(__file__).parent / "data"
+BINARY_MANIFEST = "manifest.json"
+
+# Process-wide cache of parsed task data: key -> (file version, value)
+_dataset_cache = {}
+_dataset_cache_lock = threading.Lock()
+
 
 def load_task_info():
     """Return task descriptions and metadata"""
@@ -61,7 +76,7 @@ def generate_submission_id():
     return str(uuid.uuid4())[:8]
 
 
-def safe_run_submission(script_path, args, timeout=120):
+def safe_run_submission(script_path, args, timeout=120, memory_mb=500, cpu_seconds=120):
     """
     Run a Python script in a subprocess with optional resource limits.
     
@@ -69,6 +84,8 @@ def safe_run_submission(script_path, args, timeout=120):
         script_path (Path): Path to submission script
         args (list): Arguments to pass to script
         timeout (int): Timeout in seconds
+        memory_mb (int): Address space limit in MB
+        cpu_seconds (int): CPU time limit in seconds
     
     Returns:
         CompletedProcess: Result of subprocess execution
@@ -83,7 +100,7 @@ def safe_run_submission(script_path, args, timeout=120):
         }
 
         if platform.system() != "Windows":
-            run_kwargs["preexec_fn"] = _set_resource_limits
+            run_kwargs["preexec_fn"] = lambda: _set_resource_limits(memory_mb, cpu_seconds)
 
         result = subprocess.run(**run_kwargs)
         return result
@@ -93,44 +110,487 @@ def safe_run_submission(script_path, args, timeout=120):
         raise RuntimeError(f"Failed to run submission: {str(e)}")
 
 
-def _set_resource_limits():
+def _set_resource_limits(memory_mb=500, cpu_seconds=120, relative=False):
     """
     Set resource limits for subprocess (Unix only).
-    - Memory: 500 MB
-    - CPU time: 120 seconds
+    
+    Args:
+        memory_mb (int): Address space limit in MB (default 500 MB)
+        cpu_seconds (int): CPU time limit in seconds (default 120 s)
+        relative (bool): Add the memory limit on top of the current address
+            space, for children forked from an already-warm process
     """
     if resource is None:
         # Windows does not support the resource module
         return
 
     try:
-        # Limit virtual memory to 500 MB
-        resource.setrlimit(resource.RLIMIT_AS, (500 * 1024 * 1024, 500 * 1024 * 1024))
-        # Limit CPU time to 120 seconds
-        resource.setrlimit(resource.RLIMIT_CPU, (120, 120))
+        memory_bytes = memory_mb * 1024 * 1024
+        if relative:
+            memory_bytes += _current_address_space()
+        # Limit virtual memory
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+        # Limit CPU time (SIGXCPU at the soft limit, SIGKILL one second later)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
     except Exception:
         # Resource limits may not be available on all systems
         pass
 
 
-def load_task_data(task_id, split="train"):
+def _current_address_space():
+    """Return the current process's virtual memory size in bytes (Linux only, else 0)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[0])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def get_peak_rss_mb(include_children=False):
+    """
+    Return the peak resident set size of the current process in MB.
+    
+    With include_children, the largest peak of any reaped child counts too.
+    A forked child's peak starts at its parent's resident size; compare it
+    with get_rss_mb() taken at the start of the work being measured.
+    """
+    if resource is None:
+        return 0.0
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if include_children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return maxrss_to_mb(peak)
+
+
+def maxrss_to_mb(maxrss):
+    """Convert an ru_maxrss value (bytes on macOS, kilobytes elsewhere) to MB."""
+    if platform.system() == "Darwin":
+        return maxrss / (1024 * 1024)
+    return maxrss / 1024
+
+
+def get_rss_mb():
+    """Return the current resident set size of this process in MB (Linux only, else 0)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def reset_peak_rss():
+    """Lower this process's peak RSS mark to its current RSS (Linux only, best effort)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def get_cpu_seconds():
+    """Return user + system CPU seconds used by this process and its reaped children."""
+    if resource is None:
+        return time.process_time()
+    
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+def _task_data_path(task_id, split):
+    """Return the CSV path for a task split."""
+    return DATA_DIR / f"task{task_id}_{split}.csv"
+
+
+def _binary_data_path(task_id, split):
+    """Return the binary columnar copy directory for a task split."""
+    return DATA_DIR / f"task{task_id}_{split}.cols"
+
+
+def _file_version(filepath):
+    """Return a cheap change marker for a file: (mtime_ns, size)."""
+    stat = filepath.stat()
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _data_source(task_id, split):
+    """
+    Pick the file to load a task split from.
+    
+    The binary copy wins when it exists and is not older than the CSV.
+    
+    Returns:
+        tuple: (kind 'binary' or 'csv', path, version marker)
+    """
+    manifest_path = _binary_data_path(task_id, split) / BINARY_MANIFEST
+    csv_path = _task_data_path(task_id, split)
+    
+    if manifest_path.exists():
+        manifest_version = _file_version(manifest_path)
+        if not csv_path.exists() or _file_version(csv_path)[0] <= manifest_version[0]:
+            return "binary", manifest_path, ("binary", manifest_version)
+    
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Data file not found: {csv_path}")
+    return "csv", csv_path, ("csv", _file_version(csv_path))
+
+
+def write_binary_copy(df, directory):
+    """
+    Write a dataframe as a binary columnar copy for memory-mapped loading.
+    
+    Each column is stored as its own .npy file. Non-numeric columns are
+    stored as int32 category codes (-1 for missing) with the categories in
+    the manifest. The manifest is written last, so a partial copy is never used.
+    
+    Args:
+        df (pd.DataFrame): Data to write
+        directory (Path): Output directory (e.g. data/task1_train.cols)
+    """
+    categories = {}
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            categories[col] = [str(c) for c in pd.factorize(df[col])[1]]
+
+    writer = BinaryCopyWriter(directory, len(df), categories)
+    writer.write(df)
+    writer.close()
+
+
+class BinaryCopyWriter:
+    """
+    Write a binary columnar copy chunk by chunk, for data that does not fit in memory.
+
+    Column files are preallocated for the final row count and filled through
+    memory maps; dtypes are taken from the first chunk. Non-numeric columns
+    need their categories up front so every chunk encodes them the same way.
+    The manifest is written by close(), after all rows.
+
+    Args:
+        directory (Path): Output directory (e.g. data/task1_train.cols)
+        rows (int): Total number of rows that will be written
+        categories (dict): Column name -> list of category values
+    """
+
+    def __init__(self, directory, rows, categories=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.rows = int(rows)
+        self.categories = categories or {}
+        self.offset = 0
+        self._columns = None
+        self._arrays = None
+
+    def _open(self, df):
+        self._columns, self._arrays = [], []
+        for i, col in enumerate(df.columns):
+            entry = {"name": str(col), "file": f"col{i}.npy"}
+            if col in self.categories:
+                entry["categories"] = [str(c) for c in self.categories[col]]
+                dtype = np.int32
+            elif pd.api.types.is_numeric_dtype(df[col]):
+                dtype = df[col].dtype
+            else:
+                raise ValueError(f"Column {col!r} is not numeric and has no categories")
+            self._arrays.append(np.lib.format.open_memmap(
+                self.directory / entry["file"], mode="w+", dtype=dtype, shape=(self.rows,)
+            ))
+            self._columns.append(entry)
+
+    def write(self, df):
+        """Append a chunk (same columns, in the same order, as the first chunk)."""
+        if self._arrays is None:
+            self._open(df)
+        end = self.offset + len(df)
+        if end > self.rows:
+            raise ValueError(f"More than the announced {self.rows} rows written")
+        for entry, array, col in zip(self._columns, self._arrays, df.columns):
+            if "categories" in entry:
+                labels = df[col].map(str, na_action="ignore")
+                values = pd.Categorical(labels, categories=entry["categories"]).codes
+            else:
+                values = df[col].to_numpy()
+            array[self.offset:end] = values
+        self.offset = end
+
+    def close(self):
+        """Flush the column files and publish the manifest."""
+        if self.offset != self.rows:
+            raise ValueError(f"Expected {self.rows} rows, got {self.offset}")
+        for array in self._arrays or ():
+            array.flush()
+
+        manifest = {"rows": self.rows, "columns": self._columns or []}
+        tmp_path = self.directory / (BINARY_MANIFEST + ".tmp")
+        tmp_path.write_text(json.dumps(manifest))
+        os.replace(tmp_path, self.directory / BINARY_MANIFEST)
+
+
+def _read_binary_copy(manifest_path):
+    """Load a binary columnar copy, memory-mapping numeric columns (read-only, zero-copy)."""
+    directory = manifest_path.parent
+    manifest = json.loads(manifest_path.read_text())
+    
+    columns = {}
+    for entry in manifest["columns"]:
+        values = np.load(directory / entry["file"], mmap_mode="r", allow_pickle=False)
+        if "categories" in entry:
+            # Decode category codes back to an object column, as read_csv would produce
+            categories = np.asarray(entry["categories"], dtype=object)
+            decoded = np.full(len(values), np.nan, dtype=object)
+            present = values >= 0
+            decoded[present] = categories[values[present]]
+            values = decoded
+        columns[entry["name"]] = values
+    
+    # copy=False keeps one block per column, backed by the memory maps
+    return pd.DataFrame(columns, copy=False)
+
+
+# (task_id, split, CSV version) whose binary copy could not be built
+_failed_binary_builds = set()
+
+
+def build_binary_copy(task_id, split):
+    """
+    Convert a task split's CSV into its binary columnar copy.
+    
+    The copy is written next to the CSV under a temporary name and swapped
+    in at the end, so readers never see a half-written copy. Concurrent
+    builders are harmless: whichever finishes first wins.
+    
+    Returns:
+        bool: True if a copy from this call is in place
+    """
+    csv_path = _task_data_path(task_id, split)
+    tmp_dir = csv_path.with_name(f"{csv_path.stem}.cols.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    try:
+        write_binary_copy(pd.read_csv(csv_path), tmp_dir)
+        return replace_directory(tmp_dir, _binary_data_path(task_id, split))
+    except (OSError, ValueError):
+        # Read-only data directory or an unsupported column: keep using the CSV
+        return False
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def replace_directory(source, target):
+    """
+    Move directory source to target, replacing any existing target.
+    
+    Returns:
+        bool: False if another process put a new target in place first
+    """
+    old = target.with_name(f"{target.name}.old-{os.getpid()}")
+    if target.exists():
+        try:
+            os.replace(target, old)
+        except FileNotFoundError:
+            pass
+    try:
+        os.replace(source, target)
+        return True
+    except OSError:
+        if not target.exists():
+            raise
+        return False
+    finally:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _cache_lookup(key, version, loader):
+    """Return the cached value for key if its version matches, else (re)load it."""
+    with _dataset_cache_lock:
+        entry = _dataset_cache.get(key)
+        if entry is not None and entry[0] == version:
+            cache_requests.inc(cache="dataset", result="hit")
+            return entry[1]
+    
+    cache_requests.inc(cache="dataset", result="miss")
+    value = loader()
+    with _dataset_cache_lock:
+        _dataset_cache[key] = (version, value)
+    return value
+
+
+def load_task_data(task_id, split="train", copy=True):
     """
     Load training or test data for a task.
     
+    Prefers the memory-mapped binary copy (taskN_split.cols) when it is at
+    least as new as the CSV. When it is missing or stale it is rebuilt from
+    the CSV first; if that fails, the CSV is parsed instead. Frames are
+    cached per process and reloaded automatically when the file's mtime or
+    size changes.
+    
     Args:
         task_id (int): Task ID (0-3)
         split (str): 'train' or 'test'
+        copy (bool): Return a private copy (set False for read-only use)
     
     Returns:
         pd.DataFrame: Loaded data
     """
-    data_dir = Path(__file__).parent / "data"
-    filepath = data_dir / f"task{task_id}_{split}.csv"
+    kind, filepath, version = _data_source(task_id, split)
+    if kind == "csv" and (task_id, split, version) not in _failed_binary_builds:
+        if build_binary_copy(task_id, split):
+            kind, filepath, version = _data_source(task_id, split)
+        else:
+            _failed_binary_builds.add((task_id, split, version))
+    loader = _read_binary_copy if kind == "binary" else pd.read_csv
+    
+    df = _cache_lookup(("frame", task_id, split), version, lambda: loader(filepath))
+    return df.copy() if copy else df
+
+
+def load_task_split(task_id, target="target"):
+    """
+    Load pre-split features and target for an ML task.
+    
+    The column arrays are cached per process and marked read-only, so every
+    caller shares the same memory. Each call wraps them in new frames:
+    in-place writes raise, and adding, dropping or renaming columns only
+    changes the caller's own frame.
+    
+    Args:
+        task_id (int): Task ID (1-3)
+        target (str): Target column name
+    
+    Returns:
+        tuple: (X_train, y_train, X_test, y_test)
+    """
+    version = (_data_source(task_id, "train")[2], _data_source(task_id, "test")[2])
     
-    if not filepath.exists():
-        raise FileNotFoundError(f"Data file not found: {filepath}")
+    def _columns():
+        return (
+            _read_only_columns(load_task_data(task_id, "train", copy=False)),
+            _read_only_columns(load_task_data(task_id, "test", copy=False)),
+        )
     
-    return pd.read_csv(filepath)
+    train, test = _cache_lookup(("split", task_id), version, _columns)
+    return (*_split_frame(train, target), *_split_frame(test, target))
+
+
+def _read_only_columns(df):
+    """Return read-only NumPy views of a frame's columns, without copying."""
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy().view()
+        values.flags.writeable = False
+        columns[column] = values
+    return columns
+
+
+def _split_frame(columns, target):
+    """Build new features and target objects over cached read-only columns."""
+    X = pd.DataFrame({c: values for c, values in columns.items() if c != target}, copy=False)
+    y = pd.Series(columns[target], name=target, copy=False)
+    return X, y
+
+
+PROFILE_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+PROFILE_HISTOGRAM_BINS = 20
+PROFILE_TOP_CATEGORIES = 10
+
+
+def _profile_numeric(values):
+    """Summary statistics of a numeric column; NaN counts as missing."""
+    values = np.asarray(values)
+    if values.dtype.kind == "b":
+        values = values.astype(np.int8)
+    if values.dtype.kind == "f":
+        present = values[~np.isnan(values)]
+        finite = present[np.isfinite(present)]
+    else:
+        present = finite = values
+
+    profile = {"null_count": int(len(values) - len(present))}
+    if not len(finite):
+        return {**profile, "min": None, "max": None, "mean": None, "std": None,
+                "quantiles": None, "histogram": None}
+
+    quantiles = np.quantile(finite, PROFILE_QUANTILES)
+    counts, edges = np.histogram(finite, bins=PROFILE_HISTOGRAM_BINS)
+    return {
+        **profile,
+        "min": finite.min().item(),
+        "max": finite.max().item(),
+        "mean": float(finite.mean(dtype=np.float64)),
+        # Sample standard deviation, as pandas' describe()
+        "std": float(finite.std(dtype=np.float64, ddof=1)) if len(finite) > 1 else None,
+        "quantiles": {f"p{round(q * 100):02d}": float(v) for q, v in zip(PROFILE_QUANTILES, quantiles)},
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+    }
+
+
+def _profile_categorical(series):
+    """Missing values, distinct values and most frequent categories of a column."""
+    codes, categories = pd.factorize(series, use_na_sentinel=True)
+    present = codes[codes >= 0]
+    counts = np.bincount(present, minlength=len(categories))
+    top = np.argsort(-counts, kind="stable")[:PROFILE_TOP_CATEGORIES]
+    return {
+        "null_count": int(len(codes) - len(present)),
+        "unique": int(len(categories)),
+        "top_categories": [{"value": str(categories[i]), "count": int(counts[i])} for i in top],
+    }
+
+
+def profile_frame(df):
+    """
+    Describe every column of a frame for exploratory analysis.
+
+    Returns:
+        list: One dict per column with name, dtype and null_count, plus
+        min/max/mean/std, quantiles and a histogram for numeric columns, or
+        unique and top_categories for the others
+    """
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        entry = {"name": str(name), "dtype": str(series.dtype)}
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf":
+            entry.update(_profile_numeric(series.to_numpy()))
+        else:
+            entry.update(_profile_categorical(series))
+        columns.append(entry)
+    return columns
+
+
+def get_data_profile(task_id, split="train"):
+    """
+    Return the column profile of a task split (see profile_frame).
+
+    Computed once per data file version and cached per process.
+    """
+    version = _data_source(task_id, split)[2]
+
+    def _profile():
+        df = load_task_data(task_id, split, copy=False)
+        return {"rows": int(len(df)), "columns": profile_frame(df)}
+
+    return _cache_lookup(("profile", task_id, split), version, _profile)
+
+
+def get_dataset_version(task_id):
+    """
+    Return a short version string for a task's data files.
+    
+    Changes whenever any split's file changes; used as a cache key.
+    """
+    markers = []
+    for split in ("train", "test"):
+        try:
+            markers.append(f"{split}:{_data_source(task_id, split)[2]}")
+        except FileNotFoundError:
+            continue
+    return hashlib.sha1("|".join(markers).encode()).hexdigest()[:12]
 
 
 def compute_metrics(task_id, y_true, y_pred):
@@ -143,24 +603,181 @@ def compute_metrics(task_id, y_true, y_pred):
         y_pred: Predicted labels/values
     
     Returns:
-        float: Computed metric score
-    """
-    from sklearn.metrics import r2_score, accuracy_score, f1_score
-    
-    if task_id == 1:
-        # Regression: R² score
-        return float(r2_score(y_true, y_pred))
-    elif task_id == 2:
-        # Binary classification: Accuracy
-        return float(accuracy_score(y_true, y_pred))
-    elif task_id == 3:
-        # Multi-class classification: F1 macro
-        return float(f1_score(y_true, y_pred, average='macro', zero_division=0))
-    else:
-        raise ValueError(f"Unknown task_id: {task_id}")
+        float: Computed metric score (R² for Task 1, accuracy for Task 2,
+        macro-F1 for Task 3)
+    """
+    return float(score_predictions(task_id, y_true, y_pred))
+
+
+# Rows validated at a time when validate_preprocessing is given a whole frame
+VALIDATION_CHUNK_ROWS = 1 << 20
+# Task 0 scaling check: |mean| below this and std below STANDARDIZED_MAX_STD
+STANDARDIZED_MAX_MEAN = 0.5
+STANDARDIZED_MAX_STD = 2
+
+
+def _is_number_dtype(dtype):
+    """True for the dtypes select_dtypes(include=np.number) picks (bool excluded)."""
+    if isinstance(dtype, np.dtype):
+        return dtype.kind in "iufc"
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+class _ColumnStats:
+    """Running null count, mean and sum of squared deviations of one column."""
+
+    __slots__ = ("dtype", "numeric", "nulls", "count", "total", "mean", "m2", "non_finite")
+
+    def __init__(self, dtype):
+        self.dtype = str(dtype)
+        self.numeric = _is_number_dtype(dtype)
+        self.nulls = 0
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.non_finite = False
+
+    def update(self, series):
+        if str(series.dtype) != self.dtype:
+            # Chunks disagree on the type (e.g. inferred per CSV chunk)
+            self.numeric = self.numeric and _is_number_dtype(series.dtype)
+        if not (self.numeric and _is_number_dtype(series.dtype)):
+            self.nulls += int(series.isna().to_numpy().sum())
+            return
 
+        if series.dtype.kind == "c":
+            self.non_finite = True  # complex values cannot be standardized
+            self.nulls += int(series.isna().to_numpy().sum())
+            return
+        if isinstance(series.dtype, np.dtype):
+            values = series.to_numpy()
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
 
-def validate_preprocessing(df_original, df_processed):
+        if values.dtype.kind == "f":
+            values = values.astype(np.float64, copy=False)
+            finite = np.isfinite(values)
+            n = int(np.count_nonzero(finite))
+            nan_count = int(np.count_nonzero(np.isnan(values))) if n < len(values) else 0
+            self.nulls += nan_count
+            if nan_count < len(values) - n:
+                self.non_finite = True  # +/-inf
+            if not n:
+                return
+            if n == len(values):
+                chunk_total = float(values.sum(dtype=np.float64))
+                deviations = values - chunk_total / n
+            else:
+                chunk_total = float(np.sum(values, where=finite, dtype=np.float64))
+                deviations = np.subtract(values, chunk_total / n, where=finite, out=np.zeros(len(values)))
+        else:
+            n = len(values)
+            if not n:
+                return
+            chunk_total = float(values.sum(dtype=np.float64))
+            deviations = values - chunk_total / n
+        chunk_mean = chunk_total / n
+        chunk_m2 = float(np.dot(deviations, deviations))
+
+        # Merge with the running totals (Chan et al. parallel variance); the
+        # mean itself comes from the plain sum, as pandas computes it
+        self.total += chunk_total
+        combined = self.count + n
+        delta = chunk_mean - self.mean
+        self.mean += delta * n / combined
+        self.m2 += chunk_m2 + delta * delta * self.count * n / combined
+        self.count = combined
+
+    def summary(self):
+        entry = {"dtype": self.dtype, "null_count": self.nulls, "numeric": self.numeric}
+        if not self.numeric:
+            return entry
+        mean = self.total / self.count if self.count and not self.non_finite else None
+        std = (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 and not self.non_finite else None
+        entry["mean"] = mean
+        entry["std"] = std
+        entry["standardized"] = (
+            mean is not None and std is not None
+            and abs(mean) < STANDARDIZED_MAX_MEAN and std < STANDARDIZED_MAX_STD
+        )
+        return entry
+
+
+class PreprocessingValidator:
+    """
+    Task 0 checks accumulated over row chunks of a processed frame.
+    
+    Each chunk is read once, column by column: null counts, dtype and the
+    running mean/variance all come from the same NumPy array, so frames
+    larger than memory can be validated chunk by chunk.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        # Per column position, so duplicate column names stay separate
+        self._names = []
+        self._columns = []
+
+    def update(self, chunk):
+        """Add a chunk (a DataFrame; every chunk should have the same columns)."""
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("preprocess_data must return a pandas DataFrame")
+        self.rows += len(chunk)
+        for position in range(chunk.shape[1]):
+            series = chunk.iloc[:, position]
+            if position == len(self._columns):
+                self._names.append(chunk.columns[position])
+                self._columns.append(_ColumnStats(series.dtype))
+            self._columns[position].update(series)
+
+    def result(self):
+        """
+        Score the accumulated data.
+        
+        Returns:
+            tuple: (score: int 0-30, details: dict)
+        """
+        columns = {}
+        for position, (name, stats) in enumerate(zip(self._names, self._columns)):
+            key = str(name)
+            if key in columns:
+                key = f"{name} (column {position})"
+            columns[key] = stats.summary()
+        failed = {
+            "nulls": [name for name, c in columns.items() if c["null_count"]],
+            "non_numeric": [name for name, c in columns.items() if not c["numeric"]],
+            "not_standardized": [name for name, c in columns.items() if c["numeric"] and not c["standardized"]],
+        }
+        
+        score = 30
+        details = {"checks_passed": []}
+        
+        # Check 1: No nulls (10 points)
+        if failed["nulls"]:
+            score -= 10
+        else:
+            details["checks_passed"].append("No null values")
+        
+        # Check 2: All columns are numeric (10 points)
+        if failed["non_numeric"]:
+            score -= 10
+        else:
+            details["checks_passed"].append("All columns are numeric")
+        
+        # Check 3: Numeric columns are standardized (10 points)
+        if failed["not_standardized"]:
+            score -= 5  # Partial credit
+        else:
+            details["checks_passed"].append("Numeric columns are standardized")
+        
+        details["rows"] = self.rows
+        details["failed_columns"] = failed
+        details["columns"] = columns
+        return max(0, score), details
+
+
+def validate_preprocessing(df_original, df_processed, chunk_rows=VALIDATION_CHUNK_ROWS):
     """
     Validate preprocessed data (Task 0).
     
@@ -171,33 +788,26 @@ def validate_preprocessing(df_original, df_processed):
     
     Args:
         df_original: Original dataframe
-        df_processed: Processed dataframe
+        df_processed: Processed dataframe, or an iterable of DataFrame
+            chunks (e.g. pd.read_csv(..., chunksize=...)) for data that does
+            not fit in memory
+        chunk_rows (int): Rows validated at a time for a whole dataframe
     
     Returns:
-        tuple: (score: int 0-30, details: dict)
+        tuple: (score: int 0-30, details: dict with checks_passed and the
+        per-column results: failed_columns and columns)
     """
-    score = 30
-    details = {"checks_passed": []}
-    
-    # Check 1: No nulls (10 points)
-    if df_processed.isnull().sum().sum() > 0:
-        score -= 10
+    validator = PreprocessingValidator()
+    if isinstance(df_processed, pd.DataFrame):
+        if not len(df_processed):
+            validator.update(df_processed)
+        for start in range(0, len(df_processed), chunk_rows):
+            validator.update(df_processed.iloc[start:start + chunk_rows])
     else:
-        details["checks_passed"].append("No null values")
-    
-    # Check 2: All columns are numeric (10 points)
-    non_numeric = df_processed.select_dtypes(exclude=[np.number]).shape[1]
-    if non_numeric > 0:
-        score -= 10
-    else:
-        details["checks_passed"].append("All columns are numeric")
-    
-    # Check 3: Numeric columns are standardized (10 points)
-    numeric_df = df_processed.select_dtypes(include=[np.number])
-    means_ok = all(abs(numeric_df.mean()) < 0.5) and all(numeric_df.std() < 2)
-    if not means_ok:
-        score -= 5  # Partial credit
-    else:
-        details["checks_passed"].append("Numeric columns are standardized")
-    
-    return max(0, score), details
+        try:
+            chunks = iter(df_processed)
+        except TypeError:
+            raise TypeError("preprocess_data must return a pandas DataFrame") from None
+        for chunk in chunks:
+            validator.update(chunk)
+    return validator.result()
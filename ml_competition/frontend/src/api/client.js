@@ -19,7 +19,7 @@ function getAuthHeaders() {
  * Fetch all tasks
  */
 export async function fetchTasks() {
-  const response = await fetch(`${API_BASE}/tasks?t=${Date.now()}`);
+  const response = await fetch(`${API_BASE}/tasks`);
   if (!response.ok) {
     throw new Error('Failed to fetch tasks');
   }
@@ -30,7 +30,7 @@ export async function fetchTasks() {
  * Fetch template code for a task
  */
 export async function fetchTemplate(taskId) {
-  const response = await fetch(`${API_BASE}/template/${taskId}?t=${Date.now()}`);
+  const response = await fetch(`${API_BASE}/template/${taskId}`);
   if (!response.ok) {
     throw new Error('Failed to fetch template');
   }
@@ -41,7 +41,7 @@ export async function fetchTemplate(taskId) {
  * Fetch sample data for a task
  */
 export async function fetchSampleData(taskId) {
-  const response = await fetch(`${API_BASE}/sample-data/${taskId}?t=${Date.now()}`);
+  const response = await fetch(`${API_BASE}/sample-data/${taskId}`);
   if (!response.ok) {
     throw new Error('Failed to fetch sample data');
   }
@@ -66,6 +66,24 @@ export async function fetchLeaderboard() {
   return response.json();
 }
 
+/**
+ * Subscribe to the live event stream
+ *
+ * Calls onEvent(kind, data) for each 'submission' or 'leaderboard' event,
+ * and onEvent('resync', {}) when missed events could not be replayed and
+ * the caller should reload its data.
+ * Returns a function that closes the stream.
+ */
+export function subscribeToEvents(onEvent, params = {}) {
+  const query = new URLSearchParams(params).toString();
+  const source = new EventSource(`${API_BASE}/events${query ? `?${query}` : ''}`);
+  const handler = (kind) => (e) => onEvent(kind, JSON.parse(e.data));
+  source.addEventListener('submission', handler('submission'));
+  source.addEventListener('leaderboard', handler('leaderboard'));
+  source.addEventListener('resync', handler('resync'));
+  return () => source.close();
+}
+
 /**
  * Upload a submission file
  */
@@ -96,8 +114,11 @@ export async function uploadSubmission(taskId, file) {
 
 /**
  * Evaluate a submission
+ *
+ * Evaluation runs in a background queue: the POST returns a job handle
+ * and this polls the status URL until the job finishes.
  */
-export async function evaluateSubmission(submissionId, taskId) {
+export async function evaluateSubmission(submissionId, taskId, pollIntervalMs = 1000) {
   const response = await fetch(`${API_BASE}/evaluate/${submissionId}?task_id=${taskId}`, {
     method: 'POST',
     headers: getAuthHeaders(),
@@ -115,7 +136,19 @@ export async function evaluateSubmission(submissionId, taskId) {
     throw new Error(detail || 'Evaluation failed');
   }
   
-  return response.json();
+  let job = await response.json();
+  while (job.status === 'queued' || job.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, pollIntervalMs));
+    const statusResponse = await fetch(`${API_BASE}/evaluate/${submissionId}?t=${Date.now()}`, {
+      headers: getAuthHeaders(),
+    });
+    if (!statusResponse.ok) {
+      throw new Error('Failed to fetch evaluation status');
+    }
+    job = await statusResponse.json();
+  }
+  
+  return job;
 }
 
 /**
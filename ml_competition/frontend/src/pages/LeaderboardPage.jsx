@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { fetchLeaderboard } from '../api/client';
+import { fetchLeaderboard, subscribeToEvents } from '../api/client';
 
 export default function LeaderboardPage() {
   const [leaderboardData, setLeaderboardData] = useState({ submissions: [], by_task: {} });
@@ -16,23 +16,16 @@ export default function LeaderboardPage() {
 
   useEffect(() => {
     loadLeaderboard();
-    // Refresh every 5 seconds
-    const interval = setInterval(loadLeaderboard, 5000);
-    return () => clearInterval(interval);
+    // Reload when the server pushes a leaderboard change
+    const unsubscribe = subscribeToEvents(() => loadLeaderboard(), { kind: 'leaderboard' });
+    // Slow fallback poll in case the stream drops
+    const interval = setInterval(loadLeaderboard, 30000);
+    return () => {
+      unsubscribe();
+      clearInterval(interval);
+    };
   }, []);
 
-  // Calculate submission counts
-  const participantSubmissionCount = {};
-  const perTaskSubmissionCount = {};
-  
-  leaderboardData.submissions.forEach(sub => {
-    const participantId = sub.submission_id.split('_')[0];
-    participantSubmissionCount[participantId] = (participantSubmissionCount[participantId] || 0) + 1;
-    
-    const key = `${participantId}-${sub.task_id}`;
-    perTaskSubmissionCount[key] = (perTaskSubmissionCount[key] || 0) + 1;
-  });
-
   // Filter submissions
   let displaySubmissions = leaderboardData.submissions;
   if (filter !== 'all') {
@@ -94,9 +87,8 @@ export default function LeaderboardPage() {
                   </tr>
                 ) : (
                   displaySubmissions.map((sub, idx) => {
-                    const participantId = sub.submission_id.split('_')[0];
-                    const totalSubmissions = participantSubmissionCount[participantId] || 0;
-                    const perTaskCount = perTaskSubmissionCount[`${participantId}-${sub.task_id}`] || 0;
+                    // One entry per team; submission counts come from the server
+                    const participantId = sub.team_name || sub.submission_id;
                     
                     return (
                       <tr key={sub.submission_id} className="border-b border-gray-200 hover:bg-gray-50">
@@ -104,8 +96,8 @@ export default function LeaderboardPage() {
                         <td className="px-4 py-3 font-bold">Q{sub.task_id}</td>
                         <td className="px-4 py-3">{participantId}</td>
                         <td className="px-4 py-3 font-bold">{sub.score?.toFixed(4)}</td>
-                        <td className="px-4 py-3">{perTaskCount}</td>
-                        <td className="px-4 py-3">{totalSubmissions}</td>
+                        <td className="px-4 py-3">{sub.task_submissions ?? 0}</td>
+                        <td className="px-4 py-3">{sub.total_submissions ?? 0}</td>
                         <td className="px-4 py-3">{new Date(sub.timestamp).toLocaleString()}</td>
                       </tr>
                     );
@@ -1,143 +1,236 @@
 """
 Generate synthetic datasets for F1-Score Grand Prix tasks
+
+Usage:
+    python sample_data_generation.py                       # default sizes (1k rows per task)
+    python sample_data_generation.py --size 1m --features 50
+    python sample_data_generation.py --size 10m --tasks 1 2 --chunk-size 250000
+
+Rows are generated and written in chunks, so memory stays bounded by
+--chunk-size whatever the dataset size. The same arguments always produce
+the same files.
 """
 
+import argparse
+import os
+import shutil
+import sys
+import time
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from sklearn.datasets import make_regression, make_classification
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-
-# Set random seed for reproducibility
-np.random.seed(42)
 
 # Output directory
-DATA_DIR = Path(__file__).parent / "backend" / "data"
-DATA_DIR.mkdir(exist_ok=True, parents=True)
+BACKEND_DIR = Path(__file__).parent / "ml_competition" / "backend"
+DATA_DIR = BACKEND_DIR / "data"
+
+# Binary columnar format shared with the backend's load_task_data
+sys.path.insert(0, str(BACKEND_DIR))
+from utils import BinaryCopyWriter, replace_directory
+from downloads import precompress
+
+# Rows per task (train + test) for each --size preset
+SIZE_PRESETS = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+DEPARTMENTS = ["HR", "Engineering", "Sales", "Marketing"]
+
+
+def save_split(name, rows, make_chunk, chunk_size, data_dir, categories=None):
+    """
+    Stream a dataset split to disk.
+
+    Writes the CSV (the participant download format) followed by a binary
+    columnar copy that the backend memory-maps for evaluation, plus the
+    compressed download variants of training splits. CSV and copy are
+    built next to the old files and swapped in at the end, so a running
+    server never reads a half-written split.
 
+    Args:
+        name (str): Split name (e.g. 'task1_train')
+        rows (int): Number of rows
+        make_chunk (callable): make_chunk(chunk_index, n) -> DataFrame of n rows
+        chunk_size (int): Rows generated per chunk
+        data_dir (Path): Output directory
+        categories (dict): Categories of the non-numeric columns
+    """
+    csv_path = data_dir / f"{name}.csv"
+    cols_path = data_dir / f"{name}.cols"
+    tmp_csv = data_dir / f"{name}.csv.tmp"
+    tmp_cols = data_dir / f"{name}.cols.tmp"
+    shutil.rmtree(tmp_cols, ignore_errors=True)
+
+    starts = range(0, rows, chunk_size)
+    writer = BinaryCopyWriter(tmp_cols, rows, categories)
+    with open(tmp_csv, "w", newline="") as f:
+        for index, start in enumerate(starts):
+            chunk = make_chunk(index, min(chunk_size, rows - start))
+            chunk.to_csv(f, index=False, header=index == 0)
+            writer.write(chunk)
+    writer.close()
+
+    os.replace(tmp_csv, csv_path)
+    replace_directory(tmp_cols, cols_path)
+    if name.endswith("_train"):
+        # Compressed download variants, so the first downloads do not wait for them
+        precompress(csv_path)
+    print(f"✓ Generated {name}.csv ({rows:,} rows)")
+
+
+def _chunk_rng(seed, task_id, split, index):
+    """Independent random stream per chunk, so chunks can be generated one at a time."""
+    return np.random.default_rng([seed, task_id, 0 if split == "train" else 1, index])
 
-def generate_task0_data():
+
+def _split_rows(rows, test_fraction):
+    test_rows = max(1, int(round(rows * test_fraction)))
+    return rows - test_rows, test_rows
+
+
+def generate_task0_data(rows, chunk_size, data_dir, seed):
     """
     Generate Task 0 (EDA/Preprocessing) dataset.
-    Small dataset with missing values, mixed data types, and non-normalized features.
+    Dataset with missing values, mixed data types, and non-normalized features.
     """
-    n_samples = 500
-    
-    # Create synthetic data with various issues
-    data = {
-        'age': np.random.randint(18, 80, n_samples),
-        'salary': np.random.randint(30000, 150000, n_samples),
-        'years_experience': np.random.randint(0, 40, n_samples),
-        'department': np.random.choice(['HR', 'Engineering', 'Sales', 'Marketing'], n_samples),
-        'is_manager': np.random.choice([0, 1], n_samples),
-    }
-    
-    df = pd.DataFrame(data)
-    
-    # Add some missing values
-    df.loc[np.random.choice(df.index, 20), 'salary'] = np.nan
-    df.loc[np.random.choice(df.index, 15), 'years_experience'] = np.nan
-    
-    # Save training data (with nulls)
-    df.to_csv(DATA_DIR / "task0_train.csv", index=False)
-    print(f"✓ Generated task0_train.csv ({len(df)} rows)")
-    
-    # Save test data (similar structure)
-    df_test = df.iloc[:50].copy()
-    df_test.to_csv(DATA_DIR / "task0_test.csv", index=False)
-    print(f"✓ Generated task0_test.csv ({len(df_test)} rows)")
-
-
-def generate_task1_data():
+    def make_chunk(rng, n):
+        df = pd.DataFrame({
+            'age': rng.integers(18, 80, n),
+            'salary': rng.integers(30000, 150000, n).astype(float),
+            'years_experience': rng.integers(0, 40, n).astype(float),
+            'department': rng.choice(DEPARTMENTS, n),
+            'is_manager': rng.integers(0, 2, n),
+        })
+        # Add some missing values
+        df.loc[rng.random(n) < 0.04, 'salary'] = np.nan
+        df.loc[rng.random(n) < 0.03, 'years_experience'] = np.nan
+        return df
+
+    train_rows, test_rows = _split_rows(rows, 0.1)
+    for split, n in (("train", train_rows), ("test", test_rows)):
+        save_split(
+            f"task0_{split}", n,
+            lambda index, size, split=split: make_chunk(_chunk_rng(seed, 0, split, index), size),
+            chunk_size, data_dir, categories={'department': DEPARTMENTS},
+        )
+
+
+def _feature_frame(X, y):
+    # Six decimals keep the CSV compact and identical to the binary copy once parsed
+    df = pd.DataFrame(np.round(X, 6), columns=[f"feature_{i}" for i in range(X.shape[1])])
+    df['target'] = y
+    return df
+
+
+def generate_task1_data(rows, features, chunk_size, data_dir, seed, test_fraction):
     """
     Generate Task 1 (Regression) dataset.
-    Predicting continuous values (house prices).
+    Predicting continuous values (house prices): a noisy linear function of the features.
+    """
+    params = np.random.default_rng([seed, 1])
+    coef = np.zeros(features)
+    informative = max(1, int(features * 0.8))
+    coef[params.permutation(features)[:informative]] = 100 * params.random(informative)
+
+    def make_chunk(rng, n):
+        X = rng.standard_normal((n, features))
+        y = X @ coef + rng.normal(scale=20, size=n)
+        return _feature_frame(X, np.round(y, 6))
+
+    for split, n in zip(("train", "test"), _split_rows(rows, test_fraction)):
+        save_split(
+            f"task1_{split}", n,
+            lambda index, size, split=split: make_chunk(_chunk_rng(seed, 1, split, index), size),
+            chunk_size, data_dir,
+        )
+
+
+def _classification_task(task_id, rows, features, classes, chunk_size, data_dir, seed, test_fraction):
     """
-    n_samples = 1000
-    n_features = 10
-    
-    # Generate regression dataset
-    X, y = make_regression(n_samples=n_samples, n_features=n_features, noise=20, random_state=42)
-    
-    # Create dataframe with feature names
-    df_X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(n_features)])
-    df_X['target'] = y
-    
-    # Split into train and test
-    df_train, df_test = train_test_split(df_X, test_size=0.3, random_state=42)
-    
-    df_train.to_csv(DATA_DIR / "task1_train.csv", index=False)
-    df_test.to_csv(DATA_DIR / "task1_test.csv", index=False)
-    
-    print(f"✓ Generated task1_train.csv ({len(df_train)} rows)")
-    print(f"✓ Generated task1_test.csv ({len(df_test)} rows)")
-
-
-def generate_task2_data():
+    Gaussian clusters around hypercube vertices, one per class, in the
+    informative features; the remaining features are linear combinations of
+    them (like sklearn's make_classification with n_redundant).
+    """
+    params = np.random.default_rng([seed, task_id])
+    informative = max(1, int(features * 0.8))
+    # Distinct vertices of the {-1, 1} hypercube (exact while 2^informative >= classes)
+    vertices = params.choice(2 ** min(informative, 30), size=classes, replace=2 ** min(informative, 30) < classes)
+    bits = (vertices[:, None] >> np.arange(informative)) & 1
+    centroids = 2.0 * bits - 1.0
+    redundant = params.uniform(-1, 1, (informative, features - informative))
+    order = params.permutation(features)
+
+    def make_chunk(rng, n):
+        y = rng.integers(0, classes, n)
+        X_informative = centroids[y] + rng.standard_normal((n, informative))
+        X = np.hstack([X_informative, X_informative @ redundant])[:, order]
+        # 1% label noise
+        flip = rng.random(n) < 0.01
+        y[flip] = rng.integers(0, classes, int(flip.sum()))
+        return _feature_frame(X, y)
+
+    for split, n in zip(("train", "test"), _split_rows(rows, test_fraction)):
+        save_split(
+            f"task{task_id}_{split}", n,
+            lambda index, size, split=split: make_chunk(_chunk_rng(seed, task_id, split, index), size),
+            chunk_size, data_dir,
+        )
+
+
+def generate_task2_data(rows, features, chunk_size, data_dir, seed, test_fraction):
     """
     Generate Task 2 (Binary Classification) dataset.
     Predicting binary labels (e.g., spam/not spam).
     """
-    n_samples = 1000
-    n_features = 10
-    
-    # Generate binary classification dataset
-    X, y = make_classification(n_samples=n_samples, n_features=n_features, n_classes=2, 
-                               n_informative=8, n_redundant=2, random_state=42)
-    
-    # Create dataframe
-    df_X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(n_features)])
-    df_X['target'] = y
-    
-    # Split into train and test
-    df_train, df_test = train_test_split(df_X, test_size=0.3, random_state=42)
-    
-    df_train.to_csv(DATA_DIR / "task2_train.csv", index=False)
-    df_test.to_csv(DATA_DIR / "task2_test.csv", index=False)
-    
-    print(f"✓ Generated task2_train.csv ({len(df_train)} rows)")
-    print(f"✓ Generated task2_test.csv ({len(df_test)} rows)")
-
-
-def generate_task3_data():
+    _classification_task(2, rows, features, 2, chunk_size, data_dir, seed, test_fraction)
+
+
+def generate_task3_data(rows, features, classes, chunk_size, data_dir, seed, test_fraction):
     """
     Generate Task 3 (Multi-class Classification) dataset.
     Predicting multiple class labels (e.g., iris species, digit recognition).
     """
-    n_samples = 1200
-    n_features = 10
-    n_classes = 4
-    
-    # Generate multi-class classification dataset
-    X, y = make_classification(n_samples=n_samples, n_features=n_features, n_classes=n_classes,
-                               n_informative=8, n_redundant=2, n_clusters_per_class=1, 
-                               random_state=42)
-    
-    # Create dataframe
-    df_X = pd.DataFrame(X, columns=[f"feature_{i}" for i in range(n_features)])
-    df_X['target'] = y
-    
-    # Split into train and test
-    df_train, df_test = train_test_split(df_X, test_size=0.3, random_state=42)
-    
-    df_train.to_csv(DATA_DIR / "task1_train.csv", index=False)
-    df_test.to_csv(DATA_DIR / "task3_test.csv", index=False)
-    
-    print(f"✓ Generated task3_train.csv ({len(df_train)} rows)")
-    print(f"✓ Generated task3_test.csv ({len(df_test)} rows)")
+    _classification_task(3, rows, features, classes, chunk_size, data_dir, seed, test_fraction)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic datasets for F1-Score Grand Prix.")
+    parser.add_argument("--size", choices=SIZE_PRESETS, default="1k", help="rows per task (train + test)")
+    parser.add_argument("--rows", type=int, help="exact rows per task (overrides --size)")
+    parser.add_argument("--features", type=int, default=10, help="feature columns for tasks 1-3")
+    parser.add_argument("--classes", type=int, default=4, help="classes for task 3")
+    parser.add_argument("--tasks", type=int, nargs="+", choices=range(4), default=[0, 1, 2, 3], help="tasks to generate")
+    parser.add_argument("--test-fraction", type=float, default=0.3, help="share of rows in the test split (tasks 1-3)")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="rows generated and written at a time")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR, help="output directory")
+    args = parser.parse_args(argv)
+
+    if args.features < 2 or args.classes < 2 or args.chunk_size < 1 or not 0 < args.test_fraction < 1:
+        parser.error("need --features >= 2, --classes >= 2, --chunk-size >= 1 and 0 < --test-fraction < 1")
+    rows = args.rows or SIZE_PRESETS[args.size]
+    args.data_dir.mkdir(exist_ok=True, parents=True)
+
+    print(f"Generating synthetic datasets for F1-Score Grand Prix ({rows:,} rows per task)...\n")
+    started = time.perf_counter()
+    for task_id in args.tasks:
+        if task_id == 0:
+            generate_task0_data(rows, args.chunk_size, args.data_dir, args.seed)
+        elif task_id == 1:
+            generate_task1_data(rows, args.features, args.chunk_size, args.data_dir, args.seed, args.test_fraction)
+        elif task_id == 2:
+            generate_task2_data(rows, args.features, args.chunk_size, args.data_dir, args.seed, args.test_fraction)
+        else:
+            generate_task3_data(rows, args.features, args.classes, args.chunk_size, args.data_dir, args.seed, args.test_fraction)
+        print()
+
+    print(f"✓ All datasets generated successfully in {time.perf_counter() - started:.1f}s!")
+    print(f"  Location: {args.data_dir}")
 
 
 if __name__ == "__main__":
-    print("Generating synthetic datasets for F1-Score Grand Prix...\n")
-    
-    generate_task0_data()
-    print()
-    generate_task1_data()
-    print()
-    generate_task2_data()
-    print()
-    generate_task3_data()
-    
-    print("\n✓ All datasets generated successfully!")
-    print(f"  Location: {DATA_DIR}")
+    main()